@@ -22,6 +22,7 @@
 # =============================================================================
 import os
 import re
+import zipfile
 
 from . import bass
 from .bolt import FName, deprint, os_name, popen_common
@@ -161,13 +162,57 @@ def _compressionSettings(fn_archive, blockSize, isSolid):
             solid += userArgs
     return fn_archive, archiveType, solid
 
-def list_archive(archive_path, parse_archive_line, __reList=reListArchive):
-    """Client is responsible for closing the file ! See uses for
-    _parse_archive_line examples."""
+def read_archive_listing(archive_path):
+    """Return the (key, value) pairs of the technical listing 7z outputs for
+    the specified archive. Zips are listed from their central directory,
+    without running 7z - see _list_zip. May be called from a worker thread,
+    see list_archive."""
+    if (zip_listing := _list_zip(archive_path)) is not None:
+        return zip_listing
+    return _list_with_7z(archive_path)
+
+def _list_with_7z(archive_path, __reList=reListArchive):
     command = [exe7z, 'l', '-slt', '-sccUTF-8', f'{archive_path}']
     proc = popen_common(command, encoding='utf-8')
     ins, _err = proc.communicate()
-    for line in ins.splitlines(True): # keepends=True
-        maList = __reList.match(line)
-        if maList:
-            parse_archive_line(*(maList.groups()))
+    return [maList.groups() for line in ins.splitlines(True) # keepends=True
+            if (maList := __reList.match(line))]
+
+def _list_zip(archive_path):
+    """Return the listing 7z would output for a zip archive, in the format of
+    read_archive_listing, or None if it is not a zip or we can't be sure we
+    would read it the same way as 7z - let 7z list (and report on) it."""
+    if os.path.splitext(f'{archive_path}')[1].lower() != '.zip':
+        return None
+    try:
+        with zipfile.ZipFile(archive_path) as zip_arch:
+            zip_infos = zip_arch.infolist()
+    except (OSError, zipfile.BadZipFile, zipfile.LargeZipFile):
+        return None
+    listing = []
+    for zinf in zip_infos:
+        zip_path = zinf.filename
+        # Names not flagged as UTF-8 are in a legacy code page, which 7z
+        # decodes per the system locale - and we extract by name with 7z
+        if not zinf.flag_bits & 0x800 and not zip_path.isascii() or \
+                '\\' in zip_path:
+            return None
+        is_dir = zinf.is_dir()
+        listing.append(('Path', zip_path.rstrip('/').replace('/', os.sep)))
+        listing.append(('Size', f'{zinf.file_size}'))
+        listing.append(('Attributes', 'D' if is_dir else 'A'))
+        listing.append(('CRC', '' if is_dir else f'{zinf.CRC:08X}'))
+        listing.append(('Method', 'Store' if zinf.compress_type ==
+                        zipfile.ZIP_STORED else 'Deflate'))
+    return listing
+
+def list_archive(archive_path, parse_archive_line, *, listing_future=None):
+    """Client is responsible for closing the file ! See uses for
+    _parse_archive_line examples. If listing_future is given, it is a future
+    that read_archive_listing(archive_path) was submitted to."""
+    if listing_future is None:
+        listing = read_archive_listing(archive_path)
+    else:
+        listing = listing_future.result()
+    for key, value in listing:
+        parse_archive_line(key, value)
@@ -79,7 +79,8 @@ def _init_settings_files(bak_name, mg_name, root_prefix, mods_folder):
         (dirs[u'saveBase'], jo(u'My Games', mg_name)): {
             u'BashProfiles.dat', u'BashSettings.dat', u'BashLoadOrders.dat'},
         # backup all files in Mopy\bash\l10n, Data\Bash Patches\,
-        # Data\BashTags\ and Data\INI Tweaks\
+        # Data\BashTags\, Data\INI Tweaks\ and the file lists of the
+        # installers Installers.dat refers to (see bosh.bain._FILE_LISTS_DIR)
         (dirs[u'l10n'], jo(bak_name, u'Mopy', u'bash', u'l10n')): {},
         (dirs[u'mods'].join(u'Bash Patches'),
          jo(bak_name, mods_folder, u'Bash Patches')): {},
@@ -87,6 +88,8 @@ def _init_settings_files(bak_name, mg_name, root_prefix, mods_folder):
          jo(bak_name, mods_folder, u'BashTags')): {},
         (dirs[u'mods'].join(u'INI Tweaks'),
          jo(bak_name, mods_folder, u'INI Tweaks')): {},
+        (dirs['bainData'].join('Installer Files'), jo(root_prefix + ' Mods',
+            'Bash Installers', 'Bash', 'Installer Files')): {},
     }
     for setting_files in settings_info.values():
         for settings_file in set(setting_files):
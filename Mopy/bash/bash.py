@@ -338,10 +338,13 @@ def _parse_bash_ini(bash_ini_path):
             'OblivionTexturesBSAName': 'Oblivion - Textures - Compressed.bsa',
             'Command7z': '7z', 'ScriptFileExt': '.txt',
             **dict.fromkeys(['AutoItemCheck', 'EnableSplashScreen',
-                'EnsurePatchExists', 'PromptActivateBashedPatch',
-                'ResetBSATimestamps', 'WarnTooManyFiles'], True),
-            **dict.fromkeys(['ShowDevTools', 'SkipHideConfirmation',
-                'SkipResetTimeNotifications', 'SkipWSDetection'], False),
+                'EnsurePatchExists', 'PrefetchPlugins',
+                'PromptActivateBashedPatch', 'ResetBSATimestamps',
+                'WarnTooManyFiles'], True),
+            **dict.fromkeys(['CacheParsedPlugins', 'LazyRecordUnpacking',
+                'ShowDevTools',
+                'SkipHideConfirmation', 'SkipResetTimeNotifications',
+                'SkipUnchangedDataDirs', 'SkipWSDetection'], False),
             **dict.fromkeys(['7zExtraCompressionArguments',
                 'SkippedBashInstallersDirs', 'SoundError', 'SoundSuccess',
                 'xEditCommandLineArguments'], '')
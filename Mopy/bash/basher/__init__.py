@@ -4192,6 +4192,13 @@ def SaveSettings(self, destroy=False):
             except:
                 deprint(f'An error occurred while saving settings of '
                         f'the {tab_name} panel:', traceback=True)
+        # The BSAs tab is disabled, save the BSA data (e.g. the cached BSA
+        # assets) here - saving is a no-op if nothing changed
+        try:
+            bosh.bsaInfos.save()
+        except:
+            deprint('An error occurred while saving BSA data:',
+                    traceback=True)
         settings.save()
 
     @staticmethod
@@ -171,14 +171,24 @@ def PatchExecute(self):
         try:
             patch_name = self.patchInfo.fn_key
             patch_size = self.patchInfo.fsize
-            progress = balt.Progress(patch_name, abort=True)
-            timer1 = time.time_ns()
             #--Save configs
             config = self.__config()
             self.patchInfo.set_table_prop(u'bash.patch.configs', config)
+            patchFile = self.bashed_patch
+            #--Skip the build if nothing it depends on changed
+            with balt.Progress(patch_name) as crc_progress:
+                build_inputs = patchFile.build_inputs(config, crc_progress)
+            if patchFile.is_up_to_date(build_inputs) and not askYes(self, _(
+                    'Nothing %(patch_name)s depends on has changed since it '
+                    'was last built, so rebuilding it would produce the same '
+                    'patch.') % {'patch_name': patch_name} + '\n\n' + _(
+                    'Rebuild it anyway?'), _('Bashed Patch Up To Date'),
+                    default_is_yes=False):
+                return
+            progress = balt.Progress(patch_name, abort=True)
+            timer1 = time.time_ns()
             #--Do it
             log = bolt.LogFile(io.StringIO())
-            patchFile = self.bashed_patch
             enabled_patchers = [p.get_patcher_instance(patchFile) for p in
                                 self._gui_patchers if p.isEnabled] ##: what happens if empty
             patchFile.init_patchers_data(enabled_patchers, SubProgress(progress, 0, 0.1)) #try to speed this up!
@@ -301,6 +311,9 @@ def PatchExecute(self):
                     # general problem with crc cache - API limits
                     info.calculate_crc(recalculate=True)
                 self._bps.append(bp_fname)
+            # Split patches span several files, always rebuild those
+            if len(bp_files_to_save) == 1:
+                PatchFile.store_build_inputs(build_inputs, info)
         except CancelError:
             pass
         except BPConfigError as e: # User configured BP incorrectly
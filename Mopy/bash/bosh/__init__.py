@@ -32,13 +32,15 @@
 import sys
 from collections import defaultdict, deque, OrderedDict
 from collections.abc import Iterable, Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from functools import wraps
 from itertools import chain
 
 # bosh-local imports - maybe work towards dropping (some of) these?
 from . import bsa_files, converters, cosaves
-from ._mergeability import is_esl_capable, isPBashMergeable, is_overlay_capable
+from ._mergeability import is_esl_capable, isPBashMergeable, \
+    is_overlay_capable, pbash_merge_reads_plugin
 from .converters import InstallerConverter
 from .cosaves import PluggyCosave, xSECosave
 from .mods_metadata import get_tags_from_dir, process_tags, read_dir_tags, \
@@ -49,7 +51,7 @@
 from ..bolt import AFile, DataDict, FName, FNDict, GPath, ListInfo, Path, \
     decoder, deprint, dict_sort, forward_compat_path_to_fn, \
     forward_compat_path_to_fn_list, os_name, struct_error, top_level_files, \
-    OrderedLowerDict, AFileInfo, attrgetter_cache
+    OrderedLowerDict, AFileInfo, attrgetter_cache, structs_cache
 from ..brec import FormIdReadContext, FormIdWriteContext, RecordHeader, \
     RemapWriteContext
 from ..exception import ArgumentError, BoltError, BSAError, CancelError, \
@@ -60,12 +62,15 @@
 from ..ini_files import AIniInfo, GameIni, IniFileInfo, OBSEIniFile, \
     get_ini_type_and_encoding, supported_ini_exts
 from ..load_order import LordDiff
-from ..mod_files import ModFile, ModHeaderReader
+from ..mod_files import ModFile, ModHeaderReader, iter_plugin_bytes
 from ..wbtemp import TempFile
 
 # Singletons, Constants -------------------------------------------------------
 empty_path = GPath(u'') # evaluates to False in boolean expressions
 _ListInf = AFile | ListInfo | None| FName
+# Number of threads reading plugin headers ahead when many plugins show up at
+# once (e.g. on boot) - this is IO bound, so not capped by the CPU count
+_HEADER_WORKERS = 8
 
 #--Singletons
 gameInis: tuple[GameIni | IniFileInfo] | None = None
@@ -389,20 +394,52 @@ def get_rename_paths(self, newName):
         return old_new_paths
 
 #------------------------------------------------------------------------------
+def _read_header_bytes(plugin_path, *, __unpack_size=structs_cache[
+        '=I'].unpack_from):
+    """Read the raw plugin header record of the plugin at plugin_path."""
+    with plugin_path.open('rb') as ins:
+        head_bytes = ins.read(RecordHeader.rec_header_size)
+        # The record data size follows the signature in all games
+        blob_size, = __unpack_size(head_bytes, 4)
+        return head_bytes + ins.read(blob_size)
+
+def _read_plugin_header(plugin_path, cached_entry=None):
+    """Stat the plugin at plugin_path and read its plugin header record,
+    unless cached_entry (see ModInfos.cached_header) is still valid - returns
+    None if that fails, in which case ModInfo will stat and read the plugin
+    itself, raising as usual."""
+    try:
+        stat_tuple = plugin_path.size_mtime_ctime()
+        if cached_entry is not None and cached_entry[:3] == stat_tuple:
+            return stat_tuple, cached_entry[3]
+        return stat_tuple, _read_header_bytes(plugin_path)
+    except (OSError, struct_error):
+        return None
+
 class ModInfo(FileInfo):
     """A plugin file. Currently, these are .esp, .esm, .esl and .esu files."""
     # Cached, since we need them so often
     _has_esm_flag = _is_esl = _is_overlay = False
+    # The stat tuple and plugin header bytes ModInfos.refresh read ahead
+    _prefetched = None
     _valid_exts_re = r'(\.(?:' + u'|'.join(
         x[1:] for x in bush.game.espm_extensions) + '))'
 
-    def __init__(self, fullpath, load_cache=False, itsa_ghost=None):
+    def __init__(self, fullpath, load_cache=False, itsa_ghost=None, *,
+                 prefetched=None):
         if itsa_ghost is None and (fullpath.cs[-6:] == '.ghost'):
             fullpath = fullpath.root
             self.is_ghost = True
         else:  # new_info() path
             self._refresh_ghost_state(itsa_ghost, regular_path=fullpath)
+        self._prefetched = prefetched
         super().__init__(fullpath, load_cache)
+        self._prefetched = None
+
+    def _stat_tuple(self):
+        if self._prefetched is not None:
+            return self._prefetched[0]
+        return super()._stat_tuple()
 
     def get_hide_dir(self):
         dest_dir = self.get_store().hidden_dir
@@ -569,6 +606,7 @@ def setmtime(self, set_time: int | float = 0.0, crc_changed=False):
             self.set_table_prop('crc_mtime', set_to)
         else:
             self.calculate_crc(recalculate=True)
+            modInfos.drop_cached_header(self.fn_key)
 
     def _get_masters(self):
         """Return the plugin masters, in the order listed in its header."""
@@ -728,12 +766,20 @@ def set_auto_tagged(self, auto_tagged):
 
     #--Header Editing ---------------------------------------------------------
     def readHeader(self):
-        """Read header from file and set self.header attribute."""
+        """Read header from file and set self.header attribute - the raw
+        header record is cached by ModInfos, so that unchanged plugins need
+        not be opened again in later sessions."""
         try:
-            with FormIdReadContext.from_info(self) as ins:
+            if self._prefetched is not None:
+                header_bytes = self._prefetched[1]
+            elif (header_bytes := modInfos.cached_header(self)) is None:
+                header_bytes = _read_header_bytes(self.abs_path)
+            with FormIdReadContext.from_header_bytes(self,
+                                                     header_bytes) as ins:
                 self.header = ins.plugin_header
         except struct_error as rex:
             raise ModError(self.fn_key, f'Struct.error: {rex}')
+        modInfos.cache_header(self, header_bytes)
         if bush.game.Esp.warn_older_form_versions:
             if self.header.header.form_version != RecordHeader.plugin_form_version:
                 modInfos.older_form_versions.add(self.fn_key)
@@ -899,6 +945,22 @@ def getStringsPaths(self, lang=u'English'):
     # patch BSA (which only exists in SSE) will always load after the interface
     # BSA and hence should win all conflicts (including strings).
     _bsa_heuristics = list(enumerate((u'main', u'patch', u'interface')))
+    @classmethod
+    def _bsa_heuristic(cls, binf):
+        """Sort key placing 'main', 'patch' and 'interface' BSAs first when
+        looking for strings files. This avoids parsing expensive BSAs at
+        startup for the game master (e.g. Skyrim.esm -> Skyrim -
+        Textures0.bsa)."""
+        b_lower = binf.fn_key.fn_body.lower()
+        for i, h in cls._bsa_heuristics:
+            if h in b_lower:
+                return i
+        return len(cls._bsa_heuristics) # last place to sort unwanted BSAs
+
+    def is_localized(self):
+        """Return True if this plugin stores its strings in strings files."""
+        return getattr(self.header.flags1, 'localized', False)
+
     def _find_string_bsas(self, cached_ini_info=(None, None, None)):
         """Return a list of BSAs to get strings files from. Note that this is
         *only* meant for strings files. It sorts the list in such a way as to
@@ -910,17 +972,8 @@ def _find_string_bsas(self, cached_ini_info=(None, None, None)):
             modInfos.get_bsa_lo(cached_ini_info=cached_ini_info,
                                 for_plugins=[self.fn_key])[0]))
         # First heuristic sorting pass: sort 'main', 'patch' and 'interface' to
-        # the front. This avoids parsing expensive BSAs at startup for the game
-        # master (e.g. Skyrim.esm -> Skyrim - Textures0.bsa).
-        heuristics = self._bsa_heuristics
-        last_index = len(heuristics) # last place to sort unwanted BSAs
-        def _bsa_heuristic(binf):
-            b_lower = binf.fn_key.fn_body.lower()
-            for i, h in heuristics:
-                if h in b_lower:
-                    return i
-            return last_index
-        ret_bsas.sort(key=_bsa_heuristic)
+        # the front
+        ret_bsas.sort(key=self._bsa_heuristic)
         # Second heuristic sorting pass: sort BSAs that begin with the body of
         # this plugin before others. This avoids parsing vanilla BSAs for third
         # party plugins, while being a noop for vanilla plugins (stable sort).
@@ -928,39 +981,24 @@ def _bsa_heuristic(binf):
         ret_bsas.sort(key=lambda b: not b.fn_key.lower().startswith(plugin_prefix))
         return ret_bsas
 
-    def isMissingStrings(self, cached_ini_info=(None, None, None),
-            ci_cached_strings_paths=None):
+    def isMissingStrings(self, ci_strings_index=None,
+                         cached_ini_info=(None, None, None)):
         """True if the mod says it has .STRINGS files, but the files are
         missing.
 
-        :param cached_ini_info: Passed to get_bsa_lo, see there for docs.
-        :param ci_cached_strings_paths: An optional set of lower-case versions
-            of the paths to all strings files. They must match the format
-            returned by _string_files_paths (i.e. starting with 'strings/'. If
-            specified, no stat calls will occur to determine if loose strings
-            files exist."""
-        if not getattr(self.header.flags1, 'localized', False): return False
+        :param ci_strings_index: An optional dict mapping lower-case versions
+            of the paths to the strings files that are present to where they
+            were found - see ModInfos.index_strings. If not specified, one is
+            built for this plugin alone.
+        :param cached_ini_info: Passed to get_bsa_lo when building the index
+            for this plugin, see there for docs."""
+        if not self.is_localized(): return False
+        if ci_strings_index is None:
+            ci_strings_index = modInfos.index_strings([self.fn_key],
+                                                      cached_ini_info)
         lang = oblivionIni.get_ini_language()
-        bsa_infos = self._find_string_bsas(cached_ini_info)
-        info_dir_join = self.info_dir.join
-        for assetPath in self._string_files_paths(lang):
-            # Check loose files first
-            if ci_cached_strings_paths is not None:
-                if assetPath.lower() in ci_cached_strings_paths:
-                    continue
-            elif info_dir_join(assetPath).is_file():
-                continue
-            # Check in BSA's next
-            for bsa_info in bsa_infos:
-                try:
-                    if bsa_info.has_assets((assetPath,)):
-                        break # found
-                except BSAError:
-                    deprint(f'Failed to parse {bsa_info}', traceback=True)
-                    continue
-            else: # not found
-                return True
-        return False
+        return any(a.lower() not in ci_strings_index for a in
+                   self._string_files_paths(lang))
 
     def hasResources(self):
         """Returns (hasBsa, has_blocking_resources) booleans according to
@@ -1586,6 +1624,8 @@ def refresh(self, refresh_infos=True, booting=False):
         rdata = self._rdata_type()
         if True: # refresh_infos
             new_or_present, del_infos = self._list_store_dir()
+            read_ahead = self._read_ahead({n: kws for n, (oldInfo, kws) in
+                new_or_present.items() if oldInfo is None})
             for new, (oldInfo, kws) in new_or_present.items():
                 try:
                     if oldInfo is not None:
@@ -1594,7 +1634,8 @@ def refresh(self, refresh_infos=True, booting=False):
                             rdata.redraw.add(new)
                     else: # new file or updated corrupted, get a new info
                         self.new_info(new, _in_refresh=True,
-                                      notify_bain=not booting, **kws)
+                                      notify_bain=not booting, **kws,
+                                      **read_ahead.get(new, {}))
                         rdata.to_add.add(new)
                 except (FileError, UnicodeError, BoltError,
                         NotImplementedError) as e:
@@ -1613,6 +1654,12 @@ def refresh(self, refresh_infos=True, booting=False):
             self._notify_bain(altered={self[n].abs_path for n in rdata.redraw})
         return rdata
 
+    def _read_ahead(self, new_kws: dict[FName, dict]) -> dict[FName, dict]:
+        """Return a dict mapping the names of the files refresh is about to
+        create infos for (along with their keyword arguments) to extra keyword
+        arguments for self.factory - by default, none."""
+        return {}
+
     def new_info(self, fileName, *, _in_refresh=False, owner=None,
                  notify_bain=False, **kwargs):
         """Create, add to self and return a new info using self.factory.
@@ -2132,6 +2179,10 @@ def __init__(self):
         self.plugin_inis = FNDict()
         # Set of plugins with form versions < RecordHeader.plugin_form_version
         self.older_form_versions = set()
+        # Lowercase plugin name -> (size, mtime, ctime, raw plugin header
+        # record), see cached_header - loaded on first use
+        self._header_cache: bolt.PickleDict | None = None
+        self._header_cache_changed = False
         # merged, imported, bashed_patches caches
         self.merged, self.imported, self.bashed_patches = set(), set(), set()
         #--Oblivion version
@@ -2315,6 +2366,71 @@ def _diff_dir(self, inodes):
             (x, {**kws, 'itsa_ghost': x in ghosts}) for x, kws in
             inodes.items()))
 
+    def _get_header_cache(self):
+        if self._header_cache is None:
+            self._header_cache = bolt.PickleDict(
+                self.bash_dir.join('Headers.dat'), load_pickle=True)
+        return self._header_cache.pickled_data
+
+    def cached_header(self, mod_inf) -> bytes | None:
+        """Return the raw plugin header record of mod_inf as cached on disk,
+        if its size, mtime and ctime did not change since we cached it -
+        else None. Only plugins in the Data folder are cached."""
+        if mod_inf.abs_path.head != self.store_dir:
+            return None
+        try:
+            *cached_stat, header_bytes = self._get_header_cache()[
+                mod_inf.fn_key.lower()]
+        except KeyError:
+            return None
+        if tuple(cached_stat) != (mod_inf.fsize, mod_inf.ftime,
+                                  mod_inf.ctime):
+            return None
+        return header_bytes
+
+    def cache_header(self, mod_inf, header_bytes: bytes):
+        """Cache the raw plugin header record of mod_inf - written to disk
+        on save."""
+        if mod_inf.abs_path.head != self.store_dir:
+            return
+        header_cache = self._get_header_cache()
+        cache_entry = (mod_inf.fsize, mod_inf.ftime, mod_inf.ctime,
+                       header_bytes)
+        if header_cache.get(ci_key := mod_inf.fn_key.lower()) != cache_entry:
+            header_cache[ci_key] = cache_entry
+            self._header_cache_changed = True
+
+    def drop_cached_header(self, mod_name: FName):
+        """Forget the cached plugin header of the specified plugin - use when
+        we changed the plugin in a way its size and times may not show."""
+        if self._get_header_cache().pop(mod_name.lower(), None) is not None:
+            self._header_cache_changed = True
+
+    def save(self):
+        super().save()
+        if self._header_cache_changed:
+            cached = self._header_cache.pickled_data
+            for del_key in cached.keys() - {k.lower() for k in self}:
+                del cached[del_key]
+            self._header_cache_changed = not self._header_cache.save()
+
+    def _read_ahead(self, new_kws):
+        """Stat the new plugins and read their plugin headers in a thread
+        pool, so that creating their infos does not wait on the disk one
+        plugin after the other."""
+        if len(new_kws) < _HEADER_WORKERS:
+            return {}
+        plugin_paths = [self.store_dir.join(
+            f'{n}.ghost' if kws.get('itsa_ghost') else n) for n, kws in
+            new_kws.items()]
+        header_cache = self._get_header_cache()
+        cached_entries = [header_cache.get(n.lower()) for n in new_kws]
+        with ThreadPoolExecutor(max_workers=_HEADER_WORKERS) as executor:
+            read_headers = dict(zip(new_kws, executor.map(
+                _read_plugin_header, plugin_paths, cached_entries)))
+        return {n: {'prefetched': p} for n, p in read_headers.items() if
+                p is not None}
+
     def refresh(self, refresh_infos=True, booting=False, unlock_lo=False):
         """Update file data for additions, removals and date changes.
         See usages for how to use the refresh_infos and unlock_lo params.
@@ -2392,19 +2508,16 @@ def _refresh_mod_inis_and_strings(self):
         oldBad = self.missing_strings
         # Determine BSA LO from INIs once, this gets expensive very quickly
         cached_ini_info = self.get_bsas_from_inis()
-        # Determine the present strings files once to avoid stat'ing
-        # non-existent strings files hundreds of times
-        try:
-            strings_files = os.listdir(bass.dirs['mods'].join('strings'))
-            ci_cached_strings_paths = {f'strings{os.path.sep}{s.lower()}'
-                                       for s in strings_files}
-        except FileNotFoundError:
-            # No loose strings folder -> all strings are in BSAs
-            ci_cached_strings_paths = set()
-        self.missing_strings = {
-            k for k, v in self.items() if v.isMissingStrings(
-                cached_ini_info=cached_ini_info,
-                ci_cached_strings_paths=ci_cached_strings_paths)}
+        # Index the strings files of the active plugins once, instead of
+        # searching the BSAs of each plugin one after the other. The game does
+        # not load the BSAs of inactive plugins, so check each of those
+        # against its own BSAs and the ones loaded from the INIs only
+        ci_strings_index = self.index_strings(
+            [k for k in self if load_order.cached_is_active(k)],
+            cached_ini_info)
+        self.missing_strings = {k for k, v in self.items() if
+            v.isMissingStrings(ci_strings_index if load_order.cached_is_active(
+                k) else None, cached_ini_info)}
         self.new_missing_strings = self.missing_strings - oldBad
         return self.new_missing_strings ^ oldBad
 
@@ -2508,20 +2621,37 @@ def rescanMergeable(self, names, progress=bolt.Progress(),
         required_checks = {m: c for m, c in all_known_checks.items()
                            if m in bush.game.mergeability_checks}
         mod_mergeInfo = self.table.getColumn('mergeInfo')
+        # Scan dependents before their masters, so that the MERGE check of
+        # each master sees the updated mergeability of its dependents
+        scan_order = load_order.get_ordered(names)[::-1]
+        # Read the plugins the MERGE check will load from disk ahead of the
+        # one being checked - the other checks stop at the first offending
+        # record. The checks themselves run on this thread, in scan order,
+        # since loading plugins is not thread-safe
+        to_load = {}
+        if (inisettings['PrefetchPlugins'] and
+                MergeabilityCheck.MERGE in required_checks):
+            to_load = {n: self[n] for n in scan_order if
+                       n.lower() not in bush.game.bethDataFiles and
+                       pbash_merge_reads_plugin(self[n], return_results)}
+        plugins_bytes = iter_plugin_bytes(to_load.values())
         with progress:
             progress.setFull(max(len(names),1))
-            result, tagged_no_merge = {}, set()
-            for i, fileName in enumerate(names):
+            # Report the results in the order the caller passed the plugins in
+            result, tagged_no_merge = dict.fromkeys(names), set()
+            for i, fileName in enumerate(scan_order):
                 all_reasons = (None if not return_results else
                                {m: [] for m in bush.game.mergeability_checks})
                 progress(i, fileName)
                 fileInfo = self[fileName]
-                cs_name = fileName.lower()
+                is_vanilla = fileName.lower() in bush.game.bethDataFiles
+                plugin_bytes = (next(plugins_bytes) if fileName in to_load
+                                else None)
                 check_results = {}
                 for merg_type, merg_check in required_checks.items():
                     reasons = (None if not return_results else
                                all_reasons[merg_type])
-                    if cs_name in bush.game.bethDataFiles:
+                    if is_vanilla:
                         # Fail all mergeability checks for vanilla plugins
                         if return_results:
                             reasons.append(_('Is Vanilla Plugin.'))
@@ -2529,7 +2659,7 @@ def rescanMergeable(self, names, progress=bolt.Progress(),
                     else:
                         try:
                             check_results[merg_type] = merg_check(
-                                fileInfo, self, reasons)
+                                fileInfo, self, reasons, plugin_bytes)
                         except Exception: # as e
                             # deprint(f'Error scanning mod {fileName} ({e})')
                             # # Assume it's not mergeable
@@ -2590,6 +2720,10 @@ def refresh_crcs(self, mods=None, progress=None):
     #--Refresh File
     def new_info(self, fileName, _in_refresh=False, owner=None,
                  notify_bain=False, **kwargs):
+        if not _in_refresh:
+            # We probably just wrote this plugin - e.g. a Bashed Patch keeps
+            # its mtime and may keep its size, so don't trust the cache
+            self.drop_cached_header(fileName)
         try:
             return super().new_info(fileName, _in_refresh=_in_refresh,
                 owner=owner, notify_bain=notify_bain, **kwargs)
@@ -3115,6 +3249,57 @@ def get_bsa_lo(self, for_plugins=None, cached_ini_info=(None, None, None)):
                 del available_bsas[binf.fn_key]
         return bsa_lo, bsa_cause
 
+    def index_strings(self, for_plugins, cached_ini_info=(None, None, None)):
+        """Return a dict mapping the lower-case paths of the strings files
+        the specified plugins need (in the current language) to the BSA they
+        were found in, or to None if they are loose files. Files that could
+        not be found are not included. Only the BSAs loaded from the INIs and
+        the ones attached to the localized plugins out of the specified ones
+        are searched. They are parsed only until all files have been found,
+        starting with the ones most likely to contain them.
+
+        :param cached_ini_info: Passed to get_bsa_lo, see there for docs. It is
+            not modified."""
+        lang = oblivionIni.get_ini_language()
+        localized_plugins = [p for p in for_plugins if self[p].is_localized()]
+        ci_wanted = {a.lower() for p in localized_plugins for a in
+                     self[p]._string_files_paths(lang)}
+        if not ci_wanted:
+            return {}
+        # Loose files win, list them once instead of stat'ing each of them
+        try:
+            ci_loose = {f'strings{os.path.sep}{s.lower()}' for s in
+                        os.listdir(bass.dirs['mods'].join('strings'))}
+        except FileNotFoundError:
+            ci_loose = set() # No loose strings folder
+        ci_strings_index = dict.fromkeys(ci_wanted & ci_loose)
+        ci_wanted -= ci_loose
+        if not ci_wanted:
+            return ci_strings_index
+        # get_bsa_lo adds the plugins' BSAs to the cached INI info, copy it so
+        # that they do not leak into the checks of other plugins
+        cached_ini_info = tuple(c if c is None else c.copy() for c in
+                                cached_ini_info)
+        bsa_lo, bsa_cause = self.get_bsa_lo(for_plugins=localized_plugins,
+                                            cached_ini_info=cached_ini_info)
+        # 'main', 'patch' and 'interface' BSAs first, then the ones attached
+        # to the plugins, with later loading BSAs first
+        plugins_set = set(localized_plugins)
+        string_bsas = sorted(reversed(bsa_lo), key=lambda b: (
+            ModInfo._bsa_heuristic(b), bsa_cause[b] not in plugins_set))
+        for bsa_info in string_bsas:
+            try:
+                found_assets = bsa_info.has_assets(ci_wanted)
+            except BSAError:
+                deprint(f'Failed to parse {bsa_info}', traceback=True)
+                continue
+            ci_strings_index.update(dict.fromkeys(found_assets,
+                                                  bsa_info.fn_key))
+            ci_wanted.difference_update(found_assets)
+            if not ci_wanted:
+                break
+        return ci_strings_index
+
     def get_active_bsas(self):
         """Returns the load order of all active BSAs. See get_bsa_lo for more
         information."""
@@ -3529,6 +3714,12 @@ def do_update(self, raise_on_error=False, **kwargs):
             def readHeader(self):  # just reset the cache
                 self._assets = self.__class__._assets
 
+            def _cached_assets(self):
+                return bsaInfos.cached_assets(self)
+
+            def _cache_assets(self, bsa_assets):
+                bsaInfos.cache_assets(self, bsa_assets)
+
             def _reset_bsa_mtime(self):
                 if bush.game.Bsa.allow_reset_timestamps and inisettings[
                     u'ResetBSATimestamps']:
@@ -3536,8 +3727,44 @@ def _reset_bsa_mtime(self):
                     if self.ftime != default_mtime:
                         self.setmtime(default_mtime)
 
+        # Lowercase bsa name -> (size, mtime, newline-separated assets), see
+        # cached_assets - loaded on first use
+        self._assets_cache: bolt.PickleDict | None = None
+        self._assets_cache_changed = False
         super().__init__(dirs['mods'], BSAInfo)
 
+    def _get_assets_cache(self):
+        if self._assets_cache is None:
+            self._assets_cache = bolt.PickleDict(
+                self.bash_dir.join('Assets.dat'), load_pickle=True)
+        return self._assets_cache.pickled_data
+
+    def cached_assets(self, bsa_inf) -> frozenset[str] | None:
+        """Return the assets of bsa_inf as cached on disk, if its size and
+        mtime did not change since we cached them - else None."""
+        try:
+            bsa_size, bsa_mtime, assets_str = self._get_assets_cache()[
+                bsa_inf.fn_key.lower()]
+        except KeyError:
+            return None
+        if (bsa_size, bsa_mtime) != (bsa_inf.fsize, bsa_inf.ftime):
+            return None
+        return frozenset(assets_str.split('\n')) if assets_str else frozenset()
+
+    def cache_assets(self, bsa_inf, bsa_assets: frozenset[str]):
+        """Cache the assets of bsa_inf - written to disk on save."""
+        self._get_assets_cache()[bsa_inf.fn_key.lower()] = (
+            bsa_inf.fsize, bsa_inf.ftime, '\n'.join(bsa_assets))
+        self._assets_cache_changed = True
+
+    def save(self):
+        super().save()
+        if self._assets_cache_changed:
+            cached = self._assets_cache.pickled_data
+            for del_key in cached.keys() - {k.lower() for k in self}:
+                del cached[del_key]
+            self._assets_cache_changed = not self._assets_cache.save()
+
     def new_info(self, fileName, _in_refresh=False, owner=None,
                  notify_bain=False, **kwargs):
         new_bsa = super().new_info(fileName, _in_refresh=_in_refresh,
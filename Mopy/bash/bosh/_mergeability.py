@@ -26,7 +26,7 @@
 from .. import bush
 from ..bolt import sig_to_str
 from ..exception import ModError
-from ..mod_files import LoadFactory, ModFile, ModHeaderReader
+from ..mod_files import LoadFactory, ModHeaderReader
 
 def _pbash_mergeable_no_load(modInfo, minfos, reasons):
     verbose = reasons is not None
@@ -66,8 +66,17 @@ def _pbash_mergeable_no_load(modInfo, minfos, reasons):
     # don't show up as mergeable.
     return False if reasons else True
 
-def isPBashMergeable(modInfo, minfos, reasons):
-    """Returns True or error message indicating whether specified mod is mergeable."""
+def pbash_merge_reads_plugin(modInfo, verbose):
+    """Return False if isPBashMergeable will not need to read the records of
+    the specified mod, based on cheap checks only - used to decide which
+    plugins are worth reading ahead."""
+    return bush.game.Esp.canBash and (verbose or not (
+        modInfo.has_esm_flag() or modInfo.isBP()))
+
+def isPBashMergeable(modInfo, minfos, reasons, plugin_bytes=None):
+    """Returns True or error message indicating whether specified mod is
+    mergeable. If plugin_bytes is specified, it must be the full contents of
+    the plugin - see RecordDirectory.from_info."""
     verbose = reasons is not None
     if not _pbash_mergeable_no_load(modInfo, minfos, reasons) and not verbose:
         return False  # non verbose mode
@@ -76,35 +85,33 @@ def isPBashMergeable(modInfo, minfos, reasons):
         _('Wrye Bash does not currently support loading plugins for '
           '%(game_name)s.') % {'game_name': bush.game.display_name}):
         return False
-    #--Load test: use generic MreRecord (without unpacking). ModFile.load will
-    # unpack the header which is enough for record.flags1|fid checks
+    #--Header scan: find out which top groups a load with generic MreRecord
+    # would skip and whether any loaded record is new, without loading
     merge_types_fact = LoadFactory(False, generic=bush.game.mergeable_sigs)
-    modFile = ModFile(modInfo, merge_types_fact)
+    loaded_tops = skipped_tops = new_rec_tops = ()
     try:
-        modFile.load_plugin(loadStrings=False, catch_errors=False)
+        loaded_tops, skipped_tops, new_rec_tops = \
+            ModHeaderReader.scan_top_groups(modInfo, merge_types_fact,
+                stop_at_new=not verbose, plugin_bytes=plugin_bytes)
     except ModError as error:
         if _exit(f'{error}.'): return False
     #--Skipped over types?
-    if modFile.topsSkipped and _exit(
+    if skipped_tops and _exit(
             _('Wrye Bash does not support the following record types: '
               '%(unsupported_rec_types)s.') % {
-                'unsupported_rec_types': _join_sigs(modFile.topsSkipped)}):
+                'unsupported_rec_types': _join_sigs(skipped_tops)}):
         return False
     #--Empty mod
-    elif not modFile.tops and _exit(_('This plugin is empty.')):
+    elif not loaded_tops and _exit(_('This plugin is empty.')):
         return False
-    #--New record
-    newblocks = []
+    #--New record - overlay plugins inject those into their first master
+    if new_rec_tops and not modInfo.is_overlay():
+        if not verbose: return False
+        reasons.append(
+            _('This plugin has new records in the following groups: '
+              '%(new_rec_groups)s.') % {
+                'new_rec_groups': _join_sigs(new_rec_tops)})
     self_name = modInfo.fn_key
-    for top_sig, block in modFile.tops.items():
-        for candidate_rec in block.iter_records(): # skip deleted/ignored
-            if candidate_rec.group_key().mod_fn == self_name:
-                if not verbose: return False
-                newblocks.append(top_sig)
-                break
-    if newblocks: reasons.append(
-        _('This plugin has new records in the following groups: '
-          '%(new_rec_groups)s.') % {'new_rec_groups': _join_sigs(newblocks)})
     dependent = _dependent(self_name, minfos)
     if dependent and _exit(_('This plugin is a master of the following non-mergeable '
               'plugins: %(non_mergeable_plugins)s.') % {
@@ -123,7 +130,7 @@ def _dependent(minfo_key, minfos):
                  minfos.mergeable_plugins]
     return dependent
 
-def is_esl_capable(modInfo, _minfos, reasons):
+def is_esl_capable(modInfo, _minfos, reasons, plugin_bytes=None):
     """Determine whether or not the specified mod can be converted to a light
     plugin. Optionally also return the reasons it can't be converted.
 
@@ -133,6 +140,8 @@ def is_esl_capable(modInfo, _minfos, reasons):
     :param reasons: A list of strings that should be filled with the reasons
                     why this mod can't be ESL flagged, or None if only the
                     return value of this method is of interest.
+    :param plugin_bytes: The full contents of the plugin, if they have
+                         already been read.
     :return: True if the specified mod could be flagged as ESL."""
     verbose = reasons is not None
     _exit = lambda x: not verbose or reasons.append(x) # append returns None
@@ -142,7 +151,8 @@ def is_esl_capable(modInfo, _minfos, reasons):
         return False
     formids_valid = True
     try:
-        formids_valid = ModHeaderReader.formids_in_esl_range(modInfo)
+        formids_valid = ModHeaderReader.formids_in_esl_range(modInfo,
+                                                             plugin_bytes)
     except ModError as e:
         if _exit(f'{e}.'): return False
     if not formids_valid and _exit(_('This plugin contains records with '
@@ -150,7 +160,7 @@ def is_esl_capable(modInfo, _minfos, reasons):
         return False
     return False if reasons else True
 
-def is_overlay_capable(modInfo, _minfos, reasons):
+def is_overlay_capable(modInfo, _minfos, reasons, plugin_bytes=None):
     """Determine whether or not the specified mod can be converted to an
     overlay plugin. Optionally also return the reasons it can't be converted.
 
@@ -160,6 +170,8 @@ def is_overlay_capable(modInfo, _minfos, reasons):
     :param reasons: A list of strings that should be filled with the reasons
         why this mod can't be Overlay-flagged, or None if only the return value
         of this method is of interest.
+    :param plugin_bytes: The full contents of the plugin, if they have already
+        been read.
     :return: True if the specified mod could be flagged as Overlay."""
     verbose = reasons is not None
     _exit = lambda x: not verbose or reasons.append(x) # append returns None
@@ -173,7 +185,7 @@ def is_overlay_capable(modInfo, _minfos, reasons):
         return False
     has_new_recs = False
     try:
-        has_new_recs = ModHeaderReader.has_new_records(modInfo)
+        has_new_recs = ModHeaderReader.has_new_records(modInfo, plugin_bytes)
     except ModError as e:
         if _exit(f'{e}.'): return False
     if has_new_recs and _exit(_('This plugin contains new records.')):
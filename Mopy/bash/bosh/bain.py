@@ -27,12 +27,14 @@
 import copy
 import io
 import os
+import pickle
 import re
 import shutil
 import sys
 import time
 from collections import defaultdict
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from itertools import chain, groupby
 from operator import attrgetter, itemgetter
@@ -42,7 +44,7 @@
     best_ini_files, data_tracking_stores, RefrData, Corrupted
 from .. import archives, bass, bolt, bush, env
 from ..archives import compress7z, defaultExt, extract7z, list_archive, \
-    readExts
+    read_archive_listing, readExts
 from ..bass import Store
 from ..bolt import AFile, CIstr, FName, GPath_no_norm, ListInfo, Path, \
     SubProgress, deprint, dict_sort, forward_compat_path_to_fn, \
@@ -57,6 +59,148 @@
 
 _fnames = Iterable[FName] | None
 
+# Number of files whose CRC we calculate in parallel and how many we keep in
+# flight - plus how often we update the progress dialog while doing so
+_CRC_WORKERS = min(8, os.cpu_count() or 1)
+_CRC_AHEAD = 4 * _CRC_WORKERS
+_CRC_PROGRESS_STEP = 32
+
+# Number of 7z processes listing archives in parallel and how many archives
+# we list ahead of the one being refreshed
+_LIST_WORKERS = min(4, os.cpu_count() or 1)
+_LIST_AHEAD = 2 * _LIST_WORKERS
+
+# Number of 7z processes extracting the archives we are about to install and
+# how many archives we extract ahead of the one being installed
+_UNPACK_WORKERS = min(2, os.cpu_count() or 1)
+_UNPACK_AHEAD = _UNPACK_WORKERS
+
+class _ArchiveLister:
+    """Lists the archives update_installers needs listings for (running 7z
+    for all but zips), in a bounded pool of threads and ahead of the
+    (sequential) refresh of those archives."""
+    def __init__(self, archive_paths: dict[FName, Path]):
+        self._to_submit = iter(archive_paths.items())
+        self._pending = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=_LIST_WORKERS) if archive_paths else None
+        self._submit_ahead()
+
+    def _submit_ahead(self):
+        while len(self._pending) < _LIST_AHEAD:
+            try:
+                fn_arch, arch_path = next(self._to_submit)
+            except StopIteration:
+                return
+            self._pending[fn_arch] = self._executor.submit(
+                read_archive_listing, arch_path)
+
+    def listing_future(self, fn_arch):
+        """Return the future of the listing of fn_arch or None if we were
+        not asked to list it. Must be called for the archives in order."""
+        try:
+            return self._pending.pop(fn_arch, None)
+        finally:
+            self._submit_ahead()
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+class _UnpackAhead:
+    """Extracts the archives bain_install and anneal are about to install in a
+    bounded pool of threads, so that extracting the next packages overlaps
+    with installing the current one. The package being installed is still
+    extracted by Installer.install itself, with progress - only the ones
+    after it are extracted ahead. The packages are installed one after the
+    other, in the order inst_dests yields them, so the Data dir ends up
+    exactly as if we had not extracted ahead.
+
+    :param inst_dests: (installer, destFiles) pairs, in install order. It may
+        be a generator - the installers are refreshed (via install_sources)
+        as they are pulled from it, as Installer.install would."""
+    def __init__(self, inst_dests: Iterable[tuple[Installer, set[CIstr]]]):
+        self._to_submit = iter(inst_dests)
+        self._pending = collections.deque()
+        self._executor = None
+
+    def _pull(self, extract_ahead):
+        """Pull the next package to install from inst_dests, extracting it in
+        a worker thread if extract_ahead is True - return False if there are
+        no packages left."""
+        try:
+            inst, dest_files = next(self._to_submit)
+        except StopIteration:
+            return False
+        dest_src = unpack_future = None
+        if dest_files:
+            dest_src = inst.install_sources(dest_files)
+            if extract_ahead and dest_src and inst.is_archive:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=_UNPACK_WORKERS)
+                # No progress, we must not touch the GUI from a thread
+                unpack_future = self._executor.submit(
+                    inst.unpackToTemp, list(dest_src.values()))
+        self._pending.append((inst, dest_files, dest_src, unpack_future))
+        return True
+
+    def __iter__(self):
+        """Yield (installer, destFiles, unpacked_ahead) tuples, where
+        unpacked_ahead should be passed to Installer.install."""
+        while self._pending or self._pull(extract_ahead=False):
+            inst, dest_files, dest_src, unpack_future = self._pending.popleft()
+            # Extract the next packages while this one is being installed
+            while len(self._pending) < _UNPACK_AHEAD and self._pull(
+                    extract_ahead=True):
+                pass
+            yield inst, dest_files, (dest_src, unpack_future)
+
+    def shutdown(self):
+        """Stop extracting and clean up the archives we extracted but were not
+        asked to install (e.g. the user cancelled). Extractions that are
+        still running are cleaned up once they finish, we don't wait for
+        them."""
+        for *_rest, unpack_future in self._pending:
+            if unpack_future:
+                unpack_future.add_done_callback(_cleanup_unpacked)
+        self._pending.clear()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+def _cleanup_unpacked(unpack_future):
+    """Remove the temp dir of an archive _UnpackAhead extracted in vain."""
+    if not unpack_future.cancelled() and unpack_future.exception() is None:
+        cleanup_temp_dir(unpack_future.result())
+
+def _calc_file_crc(asFile):
+    """Return the CRC of the file at asFile - 0 on error."""
+    final_crc = 0
+    try:
+        with open(asFile, 'rb') as ins:
+            while block := ins.read(2097152): # 2MB at a time
+                final_crc = crc32(block, final_crc)
+    except OSError:
+        deprint(f'Failed to calculate crc for {asFile} - please report this, '
+                f'and the following traceback:', traceback=True)
+        return 0
+    return final_crc
+
+def _pop_crc(pending, new_sizeCrcDate, progress, progress_msg):
+    """Wait for the oldest CRC in pending and store it in new_sizeCrcDate."""
+    i, rpFile, siz, date, crc_fut = pending.popleft()
+    new_sizeCrcDate[rpFile] = (siz, crc_fut.result(), date) # crc = 0 on error
+    if i % _CRC_PROGRESS_STEP == 0:
+        progress(i, progress_msg + rpFile)
+
+# The file lists of the installers (see _InstallerPackage._file_lists) are
+# stored in a file per installer in this folder of the bainData folder rather
+# than in Installers.dat, so that saving only rewrites the lists that changed
+_FILE_LISTS_DIR = 'Installer Files'
+
+def _file_lists_path(fn_inst):
+    return bass.dirs['bainData'].join(_FILE_LISTS_DIR, f'{fn_inst}.dat')
+
 # Walk Data and project dir helpers - we don't want to refactor the common walk
 # logic and pass a function to be called for each file - lots of overhead
 def _remove_empty_dirs(root_dir):
@@ -96,28 +240,46 @@ def _scandir_walk(apath, *, __root_len=None, __folders_times=None):
                 (st := dirent.stat()).st_size, dirent.path, st.st_mtime)
     return size_apath_date, __folders_times
 
+# Directories modified less than this many seconds before a Data dir scan are
+# not trusted on the next scan, as they may change again without their mtime
+# changing (coarse filesystem timestamps)
+_RACY_DIR_SECONDS = 2
+
 def _walk_data_dirs(apath, siz_apath_mtime, new_sizeCrcDate, root_len,
-                    oldGet, remove_empty):
+                    oldGet, remove_empty, *, dir_mtime, old_dirs_index,
+                    new_dirs_index, trust_before):
     """Recursively walk the top directories of the Data/ dir. See
     _scandir_walk for a similar pattern -  note complications like
-    empty dirs handling."""
+    empty dirs handling.
+
+    old_dirs_index maps the directories walked on the previous scan to their
+    mtime, file names and subdirectory names. If a directory's mtime did not
+    change since, no file was added, removed or renamed in it, so we reuse
+    the cached sizes, crcs and dates of its files without statting them -
+    we still need to check its subdirectories though. This misses files
+    overwritten in place, so old_dirs_index is empty unless the
+    SkipUnchangedDataDirs ini setting is enabled. The directories walked
+    now are recorded in new_dirs_index."""
     ##: add Subprogress for super accurate and slow progress bars
-    nodes = [*os.scandir(apath)]
-    if not nodes:
-        return 0, 0
-    has_files = 0
-    possible_empty = []
-    for dirent in nodes:
-        if dirent.is_dir():
-            subdir_files = _walk_data_dirs(dirent.path, siz_apath_mtime,
-                new_sizeCrcDate, root_len, oldGet, remove_empty)
-            if subdir_files:
-                has_files = True
-            elif remove_empty:
-                possible_empty.append(dirent.path)
-        else:
+    rel_dir = apath[root_len:]
+    if (cached := _cached_dir_entries(apath, rel_dir, dir_mtime, oldGet,
+                                      old_dirs_index)) is not None:
+        dir_files, dir_entries, subdirs = cached
+        new_dirs_index[rel_dir] = old_dirs_index[rel_dir]
+        if not dir_files and not subdirs:
+            return 0, 0
+        new_sizeCrcDate.update(dir_entries)
+        has_files = bool(dir_files)
+    else:
+        nodes = [*os.scandir(apath)]
+        dir_files = []
+        subdirs = []
+        for dirent in nodes:
+            if dirent.is_dir():
+                subdirs.append((dirent.name, dirent.stat().st_mtime))
+                continue
             # we don't delete folders that contain files (even 0-size ones)
-            has_files = True
+            dir_files.append(dirent.name)
             rpFile = dirent.path[root_len:]
             oSize, oCrc, oDate = oldGet(rpFile) or (0, 0, 0.0)
             lstat_size, date = (st := dirent.stat()).st_size, st.st_mtime
@@ -125,12 +287,53 @@ def _walk_data_dirs(apath, siz_apath_mtime, new_sizeCrcDate, root_len,
                 siz_apath_mtime[rpFile] = (lstat_size,  dirent.path, date)
             else:
                 new_sizeCrcDate[rpFile] = (oSize, oCrc, oDate)
+        # None never matches, so a racy directory will be walked next time
+        new_dirs_index[rel_dir] = (
+            dir_mtime if dir_mtime < trust_before else None,
+            tuple(dir_files), tuple(s for s, _m in subdirs))
+        if not nodes:
+            return 0, 0
+        has_files = bool(dir_files)
+    possible_empty = []
+    for sub_name, sub_mtime in subdirs:
+        sub_path = os.path.join(apath, sub_name)
+        subdir_files = _walk_data_dirs(sub_path, siz_apath_mtime,
+            new_sizeCrcDate, root_len, oldGet, remove_empty,
+            dir_mtime=sub_mtime, old_dirs_index=old_dirs_index,
+            new_dirs_index=new_dirs_index, trust_before=trust_before)
+        if subdir_files:
+            has_files = True
+        elif remove_empty:
+            possible_empty.append(sub_path)
     if possible_empty and has_files:
         for empty in possible_empty:
             GPath_no_norm(empty).removedirs(raise_error=False)
     # else let calling scope decide if we need to be removed
     return has_files
 
+def _cached_dir_entries(apath, rel_dir, dir_mtime, oldGet, old_dirs_index):
+    """Return the file names of the directory at apath, their cached
+    (size, crc, date) and the mtimes of its subdirectories if the directory
+    did not change since the last Data dir scan - else None."""
+    try:
+        cached_mtime, dir_files, subdir_names = old_dirs_index[rel_dir]
+    except KeyError:
+        return None
+    if cached_mtime != dir_mtime:
+        return None
+    dir_entries = []
+    for fname in dir_files:
+        rpFile = os.path.join(rel_dir, fname)
+        if (old_entry := oldGet(rpFile)) is None:
+            return None # dropped from the cache, we need to stat it
+        dir_entries.append((rpFile, tuple(old_entry)))
+    try:
+        subdirs = [(s, os.stat(os.path.join(apath, s)).st_mtime)
+                   for s in subdir_names]
+    except OSError:
+        return None # a subdirectory was removed behind our back
+    return dir_files, dir_entries, subdirs
+
 class Installer(ListInfo):
     """Object representing an installer archive, its user configuration, and
     its installation state."""
@@ -233,18 +436,23 @@ def calc_crcs(to_calc, rootName, new_sizeCrcDate, progress):
         progress_msg = f'{rootName}\n' + _('Calculating CRCs…') + '\n'
         progress(0, progress_msg)
         progress.setFull(len(to_calc))
-        for i, (rpFile, (siz, asFile, date)) in enumerate(dict_sort(to_calc)):
-            progress(i, progress_msg + rpFile)
-            final_crc = 0
-            try:
-                with open(asFile, u'rb') as ins:
-                    while block := ins.read(2097152): # 2MB at a time
-                        final_crc = crc32(block, final_crc)
-            except OSError:
-                deprint(
-                    f'Failed to calculate crc for {asFile} - please report '
-                    f'this, and the following traceback:', traceback=True)
-            new_sizeCrcDate[rpFile] = (siz, final_crc, date) # crc = 0 on error
+        pending = collections.deque()
+        executor = ThreadPoolExecutor(max_workers=_CRC_WORKERS)
+        try:
+            # crc32 releases the GIL, so hash files on a pool of threads -
+            # keep a bounded window of files in flight and collect the
+            # results in order
+            for i, (rpFile, (siz, asFile, date)) in enumerate(
+                    dict_sort(to_calc)):
+                pending.append((i, rpFile, siz, date,
+                                executor.submit(_calc_file_crc, asFile)))
+                if len(pending) > _CRC_AHEAD:
+                    _pop_crc(pending, new_sizeCrcDate, progress,
+                             progress_msg)
+            while pending:
+                _pop_crc(pending, new_sizeCrcDate, progress, progress_msg)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
     #--Initialization, etc ----------------------------------------------------
     def __init__(self, fn_key, **kwargs):
@@ -288,6 +496,9 @@ def initDefault(self):
         #--Volatiles (not pickled values)
         #--Volatiles: directory specific
         self.project_refreshed = False
+        # (fn_key, fileSizeCrcs, src_sizeCrcDate) as last stored in our file
+        # lists file - see _InstallerPackage.store_file_lists
+        self._stored_lists = None
         #--Volatile: set by refreshDataSizeCrc
         # LowerDict mapping destinations (relative to Data/ directory) of files
         # in this installer to their size and crc - built in refreshDataSizeCrc
@@ -413,6 +624,10 @@ def __reduce__(self):
         """Used by pickler to save object state."""
         raise NotImplementedError(f'{type(self)} must define __reduce__')
 
+    def _persistent_state(self):
+        """Return the state __reduce__ pickles and __setstate__ restores."""
+        return f'{self.fn_key}', *(getattr(self, a) for a in self.persistent)
+
     def __setstate__(self,values):
         """Used by unpickler to recreate object."""
         try:
@@ -455,6 +670,8 @@ def __setstate(self,values):
             value_type=lambda v: FName('%s' % v))  # Path -> FName
         if isinstance(self, _InstallerPackage):
             self._file_key = bass.dirs['installers'].join(self.fn_key)
+            if self.fileSizeCrcs is None: # stored in its own file
+                rescan |= not self._load_file_lists()
             if not isinstance(self.src_sizeCrcDate, bolt.LowerDict):
                 self.src_sizeCrcDate = bolt.LowerDict(
                     (u'%s' % x, y) for x, y in self.src_sizeCrcDate.items())
@@ -1175,11 +1392,57 @@ def packToArchive(self, project, fn_archive, isSolid, blockSize,
 class _InstallerPackage(Installer, AFileInfo):
     """Installer that corresponds to a file system node (archive or folder)."""
 
-    def __init__(self, fn_key, progress=None, load_cache=False):
+    # Persistent attributes pickled in a file of their own - they hold an
+    # entry for each file in the package
+    _file_lists = ('fileSizeCrcs', 'src_sizeCrcDate')
+
+    def __init__(self, fn_key, progress=None, load_cache=False, **kwargs):
         super().__init__(fn_key) # will call Installer -> ListInfo __init__
         self._file_key = bass.dirs['installers'].join(self.fn_key)
         if load_cache: # load from disc, useful when adding a new installer
-            AFile.__init__(self, self._file_key, progress=progress)
+            AFile.__init__(self, self._file_key, progress=progress, **kwargs)
+
+    def _persistent_state(self):
+        # None marks the file lists as stored in their own file
+        return f'{self.fn_key}', *(None if a in self._file_lists else
+            getattr(self, a) for a in self.persistent)
+
+    def _load_file_lists(self):
+        """Load our file lists from our file lists file - return False if
+        that failed, in which case we must be rescanned."""
+        try:
+            with _file_lists_path(self.fn_key).open('rb') as ins:
+                self.fileSizeCrcs, self.src_sizeCrcDate = pickle.load(ins)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError,
+                TypeError) as e:
+            deprint(f'Failed to load the file lists of {self}: {e!r}')
+            self.fileSizeCrcs, self.src_sizeCrcDate = [], bolt.LowerDict()
+            return False
+        self._stored_lists = (self.fn_key, self.fileSizeCrcs,
+                              self.src_sizeCrcDate)
+        return True
+
+    def store_file_lists(self):
+        """Write our file lists file if our file lists changed since we last
+        loaded or stored them. They are replaced, never modified in place,
+        when refreshed - but rescanning a package may produce equal lists."""
+        fsc, src_scd = self.fileSizeCrcs, self.src_sizeCrcDate
+        if not ((stored := self._stored_lists) and stored[0] == self.fn_key
+                and (stored[1] is fsc or stored[1] == fsc)
+                and (stored[2] is src_scd or stored[2] == src_scd)):
+            lists_path = _file_lists_path(self.fn_key)
+            try:
+                with TempFile() as tmp_lists:
+                    with open(tmp_lists, 'wb') as out:
+                        pickle.dump((fsc, src_scd), out,
+                                    pickle.HIGHEST_PROTOCOL)
+                    lists_path.replace_with_temp(tmp_lists)
+            except (OSError, pickle.PicklingError):
+                deprint(f'Failed to store the file lists of {self}',
+                        traceback=True)
+                lists_path.remove() # we will be rescanned on next load
+                return
+        self._stored_lists = (self.fn_key, fsc, src_scd)
 
     def _reset_cache(self, stat_tuple=None, *, __skips_start=tuple(
             s.replace(os_sep, '') for s in Installer._silentSkipsStart),
@@ -1259,16 +1522,27 @@ def _fs_refresh(self, progress, stat_tuple, **kwargs):
         raise NotImplementedError
 
     #--ABSTRACT ---------------------------------------------------------------
-    def install(self, destFiles: set[CIstr], progress=None):
-        """Install specified files to Data directory."""
+    def install(self, destFiles: set[CIstr], progress=None, *,
+                unpacked_ahead=None):
+        """Install specified files to Data directory. unpacked_ahead is the
+        (dest_src, unpack future) pair _UnpackAhead prepared for us, if
+        any."""
+        if unpacked_ahead:
+            dest_src, unpack_future = unpacked_ahead
+        else:
+            dest_src, unpack_future = self.install_sources(destFiles), None
+        if not dest_src: return bolt.LowerDict(), set(), set(), set()
+        progress = progress if progress else bolt.Progress()
+        return self._install(dest_src, progress, unpack_future)
+
+    def install_sources(self, destFiles: set[CIstr]):
+        """Return the dest_src map of the specified files."""
         dest_src = self.refreshDataSizeCrc(True)
         for k in list(dest_src):
             if k not in destFiles: del dest_src[k]
-        if not dest_src: return bolt.LowerDict(), set(), set(), set()
-        progress = progress if progress else bolt.Progress()
-        return self._install(dest_src, progress)
+        return dest_src
 
-    def _install(self, dest_src, progress):
+    def _install(self, dest_src, progress, unpack_future=None):
         raise NotImplementedError
 
     def _fs_install(self, dest_src, srcDirJoin, progress, subprogressPlus,
@@ -1431,8 +1705,7 @@ def initDefault(self):
 
     def __reduce__(self):
         from . import InstallerMarker as boshInstallerMarker
-        return boshInstallerMarker, (self.fn_key,), ('%s' % self.fn_key,
-            *(getattr(self, a) for a in self.persistent))
+        return boshInstallerMarker, (self.fn_key,), self._persistent_state()
 
     @property
     def num_of_files(self): return -1
@@ -1498,12 +1771,16 @@ def validate_filename_str(cls, name_str, allowed_exts=archives.writeExts,
 
     def __reduce__(self):
         from . import InstallerArchive as boshInstallerArchive
-        return boshInstallerArchive, (self.fn_key,), (f'{self.fn_key}',
-                *(getattr(self, a) for a in self.persistent))
+        return boshInstallerArchive, (self.fn_key,), \
+            self._persistent_state()
 
     #--File Operations --------------------------------------------------------
-    def _fs_refresh(self, progress, stat_tuple, **kwargs):
-        """Refresh fileSizeCrcs, fsize, ftime, crc, isSolid from archive."""
+    def _fs_refresh(self, progress, stat_tuple, *, listing_future=None,
+                    **kwargs):
+        """Refresh fileSizeCrcs, fsize, ftime, crc, isSolid from archive. If
+        listing_future is given, the archive is already being listed in a
+        worker thread (from its central directory for zips, by 7z otherwise),
+        see InstallersData.update_installers and read_archive_listing."""
         #--Basic file info
         super(Installer, self)._reset_cache(stat_tuple)
         #--Get fileSizeCrcs
@@ -1524,7 +1801,8 @@ def _parse_archive_line(key, value):
                     cumCRC += listed_crc
                 filepath = listed_size = listed_crc = isdir_ = 0
         try:
-            list_archive(self.abs_path, _parse_archive_line)
+            list_archive(self.abs_path, _parse_archive_line,
+                         listing_future=listing_future)
             self.crc = cumCRC & 0xFFFFFFFF
         except:
             archive_msg = f"Unable to read archive '{self.abs_path}'."
@@ -1556,11 +1834,14 @@ def unpackToTemp(self, fileNames, progress=None, recurse=False):
                 bolt.clearReadOnly(unpack_dir)
         return GPath_no_norm(unpack_dir)
 
-    def _install(self, dest_src, progress):
+    def _install(self, dest_src, progress, unpack_future=None):
         #--Extract
         progress(0, ('%s\n' % self) + _('Extracting files…'))
-        unpackDir = self.unpackToTemp(list(dest_src.values()),
-                                      SubProgress(progress, 0, 0.9))
+        if unpack_future is None:
+            unpackDir = self.unpackToTemp(list(dest_src.values()),
+                                          SubProgress(progress, 0, 0.9))
+        else: # extracted in the background, wait for it to finish
+            unpackDir = unpack_future.result()
         #--Rearrange files
         progress(0.9, ('%s\n' % self) + _('Organizing files…'))
         srcDirJoin = unpackDir.join
@@ -1672,8 +1953,8 @@ def _new_name(base_name, count):
 
     def __reduce__(self):
         from . import InstallerProject as boshInstallerProject
-        return boshInstallerProject, (self.fn_key,), ('%s' % self.fn_key,
-            *(getattr(self, a) for a in self.persistent))
+        return boshInstallerProject, (self.fn_key,), \
+            self._persistent_state()
 
     # AFile API - InstallerProject is a folder not a file, special handling
     def do_update(self, raise_on_error=False, force_update=False, **kwargs):
@@ -1751,7 +2032,7 @@ def _fs_refresh(self, progress, stat_tuple,
         self.project_refreshed = True
 
     # Installer API -----------------------------------------------------------
-    def _install(self, dest_src, progress):
+    def _install(self, dest_src, progress, unpack_future=None):
         progress.setFull(len(dest_src))
         progress(0, f'{self}\n' + _('Moving files…'))
         progressPlus = progress.plus
@@ -1812,12 +2093,26 @@ def __init__(self):
         #--Persistent data
         self.dictFile = bolt.PickleDict(self.bash_dir.join(u'Installers.dat'))
         self.data_sizeCrcDate = bolt.LowerDict()
+        # Data subdirectories -> (mtime, file names, subdirectory names)
+        self.data_dirs_index = bolt.LowerDict()
         from . import converters
         self.converters_data = converters.ConvertersData(bass.dirs['bainData'],
             bass.dirs[u'converters'], bass.dirs[u'dupeBCFs'],
             bass.dirs[u'corruptBCFs'], bass.dirs[u'installers'])
         #--Volatile
         self.ci_underrides_sizeCrc = bolt.LowerDict() # underridden files
+        # Inverted index of installers' ci_dest_sizeCrc: maps each destination
+        # file to the keys of the installers that install it - see
+        # _sync_dest_index
+        self._dest_index = bolt.LowerDict()
+        # installer key -> (ci_dest_sizeCrc, its keys) when last indexed
+        self._indexed_dests = {}
+        # Data files whose size/crc changed since ci_underrides_sizeCrc was
+        # last refreshed - None if unknown, forcing a full recalculation
+        self._dirty_data_paths = None
+        # installer key -> its (ci_dest_sizeCrc, its keys, order, is_active)
+        # when ci_underrides_sizeCrc was last refreshed
+        self._norm_states = {}
         self.hasChanged = False
         self.loaded = False
         self.lastKey = FName(u'==Last==')
@@ -1833,7 +2128,8 @@ def bash_dir(self): return bass.dirs[u'bainData']
     def hidden_dir(self): return bass.dirs[u'modsBash'].join(u'Hidden')
 
     def new_info(self, fileName, progress=None, *, is_proj=True, is_mark=False,
-            install_order=None, do_refresh=True, _index=None, load_cache=True):
+            install_order=None, do_refresh=True, _index=None, load_cache=True,
+            **kwargs):
         """Create, add to self and return a new _InstallerPackage.
         :param fileName: the filename of the package to create
         :param is_proj: create a project if True otherwise an archive
@@ -1843,12 +2139,13 @@ def new_info(self, fileName, progress=None, *, is_proj=True, is_mark=False,
         :param do_refresh: if False client should refresh Norm and status
         :param _index: if given create a subprogress
         :param load_cache: if True load call _reset_cache in __init__
+        :param kwargs: passed to _reset_cache if load_cache is True
         """
         if not is_mark:
             progress = progress if _index is None else SubProgress(
                 progress, _index, _index + 1)
             info = self[fileName] = self._inst_types[is_proj](
-                fileName, progress=progress, load_cache=load_cache)
+                fileName, progress=progress, load_cache=load_cache, **kwargs)
         else:
             info = self[fileName] = self._inst_types[2](fileName)
             if install_order is None:
@@ -1914,24 +2211,18 @@ def irefresh(self, progress=None, what=u'DIONSC', fullRefresh=False,
             reordered = self.refreshOrder()
             refresh_info.redraw.update(reordered)
             changes |= bool(reordered)
+        status_keys = None # refresh the status of all installers
         if 'N' in what or changes:
-            #--dict mapping all should-be-installed files to their attributes
-            norm_sizeCrc = bolt.LowerDict()
-            for package in (x for x in self.sorted_values() if x.is_active):
-                norm_sizeCrc.update(package.ci_dest_sizeCrc)
-            # Populate self.ci_underrides_sizeCrc with all underridden files -
-            # files installed in data dir, but from a lower loading installer
-            # (or manually)
-            ci_underrides_sizeCrc = bolt.LowerDict()
-            for path, sizeCrc in norm_sizeCrc.items():
-                try:
-                    if sizeCrc != (data_sc := self.data_sizeCrcDate[path][:2]):
-                        ci_underrides_sizeCrc[path] = data_sc
-                except KeyError: pass # file is not installed in data dir
-            changes |= self.ci_underrides_sizeCrc != ci_underrides_sizeCrc
-            self.ci_underrides_sizeCrc = ci_underrides_sizeCrc
+            if self._dirty_data_paths is None:
+                underrides_changed = self._refresh_underrides()
+            else:
+                underrides_changed, status_keys = \
+                    self._refresh_underrides_delta()
+            changes |= underrides_changed
         if 'S' in what or changes:
-            st_changed = {k for k, v in self.items() if v.refreshStatus(self)}
+            st_changed = {k for k, v in (self.items() if status_keys is None
+                else ((k, self[k]) for k in status_keys))
+                if v.refreshStatus(self)}
             refresh_info.redraw.update(st_changed)
             changes |= bool(st_changed)
         if 'C' in what or changes:
@@ -1946,6 +2237,95 @@ def refresh_ns(self, *args, **kwargs):
     def refresh_n(self, *args, **kwargs):
         self.irefresh(*args, **kwargs, what='N')
 
+    def _refresh_underrides(self):
+        """Recalculate self.ci_underrides_sizeCrc from scratch - return True
+        if it changed."""
+        #--dict mapping all should-be-installed files to their attributes
+        norm_sizeCrc = bolt.LowerDict()
+        for package in (x for x in self.sorted_values() if x.is_active):
+            norm_sizeCrc.update(package.ci_dest_sizeCrc)
+        # Populate self.ci_underrides_sizeCrc with all underridden files -
+        # files installed in data dir, but from a lower loading installer
+        # (or manually)
+        ci_underrides_sizeCrc = bolt.LowerDict()
+        for path, sizeCrc in norm_sizeCrc.items():
+            try:
+                if sizeCrc != (data_sc := self.data_sizeCrcDate[path][:2]):
+                    ci_underrides_sizeCrc[path] = data_sc
+            except KeyError: pass # file is not installed in data dir
+        changed = self.ci_underrides_sizeCrc != ci_underrides_sizeCrc
+        self.ci_underrides_sizeCrc = ci_underrides_sizeCrc
+        self._dirty_data_paths = set()
+        self._norm_states = self._snapshot_norm_states()
+        return changed
+
+    def _snapshot_norm_states(self):
+        """Return the state of each installer that its norm_sizeCrc
+        contributions depend on."""
+        self._sync_dest_index()
+        return {k: (*self._indexed_dests[k], v.order, v.is_active) for k, v in
+                self.items()}
+
+    def _refresh_underrides_delta(self):
+        """Update self.ci_underrides_sizeCrc only for the Data files whose
+        size/crc changed or that are installed by installers that changed
+        (were refreshed, (de)activated, reordered, added or removed) since the
+        last call - return True if it changed and the keys of the installers
+        whose status needs refreshing."""
+        old_states = self._norm_states
+        new_states = self._snapshot_norm_states()
+        paths = self._dirty_data_paths
+        status_keys = set()
+        for inst_key, (dest_sc, dests, order, active) in new_states.items():
+            try:
+                old_sc, old_dests, old_order, old_active = old_states.pop(
+                    inst_key)
+            except KeyError: # new installer
+                paths.update(dests)
+                status_keys.add(inst_key)
+                continue
+            if old_sc is not dest_sc or old_dests is not dests:
+                paths.update(old_dests)
+                paths.update(dests)
+                status_keys.add(inst_key)
+            elif old_active != active or (active and old_order != order):
+                paths.update(dests)
+        for _sc, gone_dests, _order, _active in old_states.values():
+            paths.update(gone_dests)
+        # Recalculate which installer wins each of those paths
+        dest_index_get = self._dest_index.get
+        data_get = self.data_sizeCrcDate.get
+        underrides = self.ci_underrides_sizeCrc
+        changed = False
+        for path in paths:
+            norm_order, norm_sc = -1, None
+            for inst_key in (path_keys := dest_index_get(path, ())):
+                installer = self[inst_key]
+                if installer.is_active and installer.order > norm_order:
+                    norm_order = installer.order
+                    norm_sc = installer.ci_dest_sizeCrc[path]
+            status_keys.update(path_keys)
+            if norm_sc is not None and (data_scd := data_get(path)) and \
+                    norm_sc != (data_sc := data_scd[:2]):
+                if underrides.get(path) != data_sc:
+                    underrides[path] = data_sc
+                    changed = True
+            elif underrides.pop(path, None) is not None:
+                changed = True
+        # Installers with dirty files among those paths need refreshing too
+        if paths:
+            status_keys.update(k for k, v in self.items() if v.dirty_sizeCrc
+                               and not paths.isdisjoint(v.dirty_sizeCrc))
+        self._dirty_data_paths = set()
+        self._norm_states = new_states
+        return changed, status_keys
+
+    def _mark_data_dirty(self, data_paths):
+        """Note that the entries of data_paths in self.data_sizeCrcDate
+        changed, for the next (incremental) underrides refresh."""
+        if self._dirty_data_paths is not None:
+            self._dirty_data_paths.update(map(CIstr, data_paths))
+
     def __load(self, progress):
         progress = progress or bolt.Progress()
         progress(0, _('Loading Data…'))
@@ -1959,6 +2339,9 @@ def __load(self, progress):
         pickle = pickl_data.get(u'sizeCrcDate', {})
         self.data_sizeCrcDate = bolt.LowerDict(pickle) if not isinstance(
             pickle, bolt.LowerDict) else pickle
+        self._dirty_data_paths = None
+        self.data_dirs_index = pickl_data.get('data_dirs_index',
+                                              bolt.LowerDict())
         # fixup: all markers had their fn_key attribute set to '===='
         for fn_inst, inst in list(self.items()):
             if inst.is_marker:
@@ -1971,13 +2354,31 @@ def __load(self, progress):
     def save(self):
         """Saves to pickle file."""
         if self.hasChanged:
+            # Write the file lists first, Installers.dat refers to them
+            self._store_file_lists()
             self.dictFile.pickled_data[u'installers'] = self._data
             self.dictFile.pickled_data[u'sizeCrcDate'] = self.data_sizeCrcDate
-            self.dictFile.vdata[u'version'] = 2
+            self.dictFile.pickled_data['data_dirs_index'] = \
+                self.data_dirs_index
+            self.dictFile.vdata['version'] = 3 # file lists in own files
             self.dictFile.save()
             self.converters_data.save()
             self.hasChanged = False
 
+    def _store_file_lists(self):
+        """Store the file lists of the packages whose lists changed and
+        remove the files of packages that are gone."""
+        lists_dir = self.bash_dir.join(_FILE_LISTS_DIR)
+        lists_dir.makedirs()
+        lists_files = set()
+        for inst in self.values():
+            if inst.is_marker: continue
+            inst.store_file_lists()
+            lists_files.add(f'{inst.fn_key}.dat'.lower())
+        for lists_file in lists_dir.ilist():
+            if lists_file.lower() not in lists_files:
+                lists_dir.join(lists_file).remove()
+
     def rename_operation(self, member_info, name_new):
         """Rename installer and return a three tuple specifying if a refresh in
         mods and ini lists is needed. name_new must be tested (via unique name)
@@ -2120,6 +2521,36 @@ def sorted_values(self, package_keys: Iterable[FName] | None = None,
         else: values = [self[k] for k in package_keys]
         return sorted(values, key=attrgetter('order'), reverse=reverse)
 
+    def _sync_dest_index(self):
+        """Update self._dest_index for the installers whose ci_dest_sizeCrc
+        changed (refreshDataSizeCrc replaces or clears it) or that were
+        added, removed or renamed since the last call - only the files of
+        those installers are (re)indexed. Install order is not stored in the
+        index, so reordering installers does not invalidate it."""
+        dest_index = self._dest_index
+        indexed = self._indexed_dests
+        def _unindex(k, dests):
+            for d in dests:
+                (inst_keys := dest_index[d]).remove(k)
+                if not inst_keys: del dest_index[d]
+        for gone_key in [k for k in indexed if k not in self]:
+            _unindex(gone_key, indexed.pop(gone_key)[1])
+        for inst_key, installer in self.items():
+            dest_sc = installer.ci_dest_sizeCrc
+            try:
+                old_sc, old_dests = indexed[inst_key]
+                if old_sc is dest_sc and len(old_dests) == len(dest_sc):
+                    continue
+                _unindex(inst_key, old_dests)
+            except KeyError:
+                pass # new installer
+            indexed[inst_key] = (dest_sc, (dests := tuple(dest_sc)))
+            for d in dests:
+                try:
+                    dest_index[d].append(inst_key)
+                except KeyError:
+                    dest_index[d] = [inst_key]
+
     #--Refresh Functions ------------------------------------------------------
     def applyEmbeddedBCFs(self, installers=None, destArchives=None,
                           progress=bolt.Progress()):
@@ -2207,32 +2638,61 @@ def update_installers(self, folders, files, fullRefresh, progress, *,
                 return refresh_info
         progress.setFull(len(files) + len(folders))
         index = 0
-        for items, is_proj in ((files, False), (folders, True)):
-            for item in items:
-                progress(index, _('Scanning Packages…') + f'\n{item}')
-                index += 1
-                inst = self.get(item)
-                if inst is None or inst.fn_key != item:
-                    if inst: # some rename bug - corrupted
+        # Run 7z on the archives that need listing ahead, in parallel
+        lister = _ArchiveLister(self._archives_to_list(files, fullRefresh,
+                                                       fresh_load))
+        try:
+            for items, is_proj in ((files, False), (folders, True)):
+                for item in items:
+                    progress(index, _('Scanning Packages…') + f'\n{item}')
+                    index += 1
+                    kwargs = {} if is_proj else {
+                        'listing_future': lister.listing_future(item)}
+                    inst = self.get(item)
+                    if inst is None or inst.fn_key != item:
+                        if inst: # some rename bug - corrupted
+                            refresh_info.redraw.add(item)
+                            deprint(f'{item} invalid idata key: '
+                                    f'{inst.fn_key}')
+                            del self[item]  # delete the stored installer
+                        else: refresh_info.to_add.add(item)
+                        # refresh_info will notify callers to call
+                        # irefresh('N')
+                        self.new_info(item, progress, is_proj=is_proj,
+                                      _index=index - 1, do_refresh=False,
+                                      **kwargs)
+                        continue
+                    # if we just loaded __setstate just updated existing
+                    # Installers
+                    if not fresh_load and inst.do_update(
+                            force_update=fullRefresh,
+                            progress=SubProgress(progress, index - 1, index),
+                            recalculate_project_crc=fullRefresh, **kwargs):
                         refresh_info.redraw.add(item)
-                        deprint(f'{item} invalid idata key: {inst.fn_key}')
-                        del self[item]  # delete the stored installer
-                    else: refresh_info.to_add.add(item)
-                    # refresh_info will notify callers to call irefresh('N')
-                    self.new_info(item, progress, is_proj=is_proj,
-                                  _index=index - 1, do_refresh=False)
-                    continue
-                # if we just loaded __setstate just updated existing Installers
-                if not fresh_load and inst.do_update(force_update=fullRefresh,
-                        progress=SubProgress(progress, index - 1, index),
-                        recalculate_project_crc=fullRefresh):
-                    refresh_info.redraw.add(item)
-                else: installers.add(item)
+                    else: installers.add(item)
+        finally:
+            lister.shutdown()
         if scanning:
             exist = installers | refresh_info.to_add | refresh_info.redraw
             refresh_info.to_del = set(self.ipackages(self)) - exist
         return refresh_info
 
+    def _archives_to_list(self, archive_keys, fullRefresh, fresh_load):
+        """Return a dict mapping the keys of the archives among archive_keys
+        that update_installers will (re)list to their paths, in order."""
+        to_list = {}
+        for fn_arch in archive_keys:
+            inst = self.get(fn_arch)
+            if inst is None or inst.fn_key != fn_arch: # new_info will list it
+                to_list[fn_arch] = bass.dirs['installers'].join(fn_arch)
+            elif not fresh_load:
+                try:
+                    if fullRefresh or inst.needs_update():
+                        to_list[fn_arch] = inst.abs_path
+                except OSError:
+                    pass # deleted - do_update will take care of it
+        return to_list
+
     def refreshOrder(self):
         """Refresh installer status."""
         inOrder, ordering = [], []
@@ -2263,7 +2723,9 @@ def _refresh_from_data_dir(self, progress, recalculate_all_crcs):
         Recalculates crcs for all plugins in Data/ directory and all other
         files whose cached date or size has changed. Will skip directories
         (but not files) specified in Installer global skips and remove empty
-        dirs if the setting is on."""
+        dirs if the setting is on. Unless recalculating all crcs, files in
+        directories whose mtime did not change since the last scan are not
+        statted again - see _walk_data_dirs."""
         progress = progress if progress else bolt.Progress()
         mods_dir = bass.dirs['mods']
         # Scan top level files and folders in the Data dir - for plugins use
@@ -2312,10 +2774,20 @@ def _refresh_from_data_dir(self, progress, recalculate_all_crcs):
         progress.setFull(1 + len(dirs_paths))
         #--Remove empty dirs?
         remove_empty = bass.settings['bash.installers.removeEmptyDirs']
+        # Reuse the directories index if the user opted in to trusting
+        # directory mtimes, unless we recalculate all crcs anyway - files
+        # edited in place do not change their directory's mtime
+        old_dirs_index = self.data_dirs_index if (not recalculate_all_crcs
+            and bass.inisettings['SkipUnchangedDataDirs']) else {}
+        new_dirs_index = bolt.LowerDict()
+        trust_before = time.time() - _RACY_DIR_SECONDS
         for dex, (top_dir, dir_path) in enumerate(dict_sort(dirs_paths)):
             progress(dex, f'{progress_msg}{top_dir}')
             has_files = _walk_data_dirs(dir_path, siz_apath_mtime,
-                new_sizeCrcDate, root_len, oldGet, remove_empty)
+                new_sizeCrcDate, root_len, oldGet, remove_empty,
+                dir_mtime=os.stat(dir_path).st_mtime,
+                old_dirs_index=old_dirs_index, new_dirs_index=new_dirs_index,
+                trust_before=trust_before)
             if remove_empty and not has_files:
                 GPath_no_norm(dir_path).removedirs(raise_error=False)
         #--Force update?
@@ -2329,10 +2801,15 @@ def _refresh_from_data_dir(self, progress, recalculate_all_crcs):
             new_sizeCrcDate.update(plugins_scd)
         change = bool(siz_apath_mtime) or (
                     len(new_sizeCrcDate) != len(self.data_sizeCrcDate))
+        if change or any(oldGet(k) != v for k, v in plugins_scd.items()):
+            self._dirty_data_paths = None # recalculate all underrides
         #--Update crcs?
         Installer.calc_crcs(siz_apath_mtime, dirname, new_sizeCrcDate,
                             progress)
         self.data_sizeCrcDate = new_sizeCrcDate
+        if new_dirs_index != self.data_dirs_index:
+            self.data_dirs_index = new_dirs_index
+            self.hasChanged = True # save it even if no file changed
         self.update_for_overridden_skips(progress=progress) #after final_update
         #--Done
         return change
@@ -2428,6 +2905,7 @@ def update_data_SizeCrcDate(self, dest_paths: set[str], progress=None):
                     new_sizeCrcDate[rpFile] = (oSize, oCrc, oDate)
         deleted_or_pending = set(dest_paths) - set(new_sizeCrcDate)
         for d in deleted_or_pending: self.data_sizeCrcDate.pop(d, None)
+        self._mark_data_dirty(dest_paths)
         Installer.calc_crcs(siz_apath_mtime, bass.dirs['mods'].stail,
             new_sizeCrcDate, progress)
         self.data_sizeCrcDate.update(new_sizeCrcDate)
@@ -2493,10 +2971,14 @@ def _path_key():
             # ghosts...
             return relpath.root.s if relpath.cs[-6:] == '.ghost' else relpath.s
         for apath in del_paths:
-            do_refresh |= bool(self.data_sizeCrcDate.pop(_path_key(), None))
+            if self.data_sizeCrcDate.pop(rel_path := _path_key(), None):
+                self._mark_data_dirty([rel_path])
+                do_refresh = True
         for apath, siz_tim in altered.items():
             s, m = siz_tim or apath.size_mtime()
-            self.data_sizeCrcDate[_path_key()] = (s, apath.crc, m)
+            self.data_sizeCrcDate[rel_path := _path_key()] = (
+                s, apath.crc, m)
+            self._mark_data_dirty([rel_path])
             do_refresh = True
         return do_refresh #Some tracked files changed, update installers status
 
@@ -2602,15 +3084,17 @@ def _editTweaks(tweaksCreated):
             iniInfos.new_info(tweakPath.stail, notify_bain=True)
         tweaksCreated -= removed
 
-    def _installer_install(self, installer, destFiles, index, progress):
+    def _installer_install(self, installer, destFiles, index, progress, *,
+                           unpacked_ahead=None):
         """Wrap installer.install to update data_sizeCrcDate."""
         sub_progress = SubProgress(progress, index, index + 1)
         data_sizeCrcDate_update, refresh_ui_ = installer.install(
-            destFiles, sub_progress)
+            destFiles, sub_progress, unpacked_ahead=unpacked_ahead)
         # update mtime for the rest of the files
         for dest, (s, c, d) in data_sizeCrcDate_update.items():
             self.data_sizeCrcDate[dest] = (
                 s, c, bass.dirs['mods'].join(dest).mtime if d == -1 else d)
+        self._mark_data_dirty(data_sizeCrcDate_update)
         return refresh_ui_
 
     def bain_install(self, packages, refresh_ui, progress=None, last=False,
@@ -2626,25 +3110,34 @@ def bain_install(self, packages, refresh_ui, progress=None, last=False,
                 self.moveArchives(packages, len(self))
             to_install = {self[x] for x in packages}
             min_order = min(x.order for x in to_install)
+            def _inst_dests():
+                for inst in self.sorted_values(reverse=True):
+                    if inst in to_install:
+                        destFiles = inst.ci_dest_sizeCrc.keys() - mask
+                        if not override:
+                            destFiles &= inst.missingFiles
+                        yield inst, destFiles
+                        if inst.order == min_order:
+                            return  # we are done
+                    # prevent lower packages from installing any files of
+                    # this installer - inst will be active once installed
+                    if inst.is_active or inst in to_install:
+                        mask.update(inst.ci_dest_sizeCrc)
             #--Install packages in turn
             progress.setFull(len(packages))
-            index = 0
-            for inst in self.sorted_values(reverse=True):
-                if inst in to_install:
+            unpack_ahead = _UnpackAhead(_inst_dests())
+            try:
+                for index, (inst, destFiles, unpacked) in enumerate(
+                        unpack_ahead):
                     progress(index, inst.fn_key)
-                    destFiles = inst.ci_dest_sizeCrc.keys() - mask
-                    if not override:
-                        destFiles &= inst.missingFiles
                     if destFiles:
                         self._createTweaks(destFiles, inst, tweaksCreated)
                         refresh_ui.update(self._installer_install(
-                            inst, destFiles, index, progress))
-                    index += 1 # increment after it's used in _installer_install
+                            inst, destFiles, index, progress,
+                            unpacked_ahead=unpacked))
                     inst.is_active = True
-                    if inst.order == min_order:
-                        break  # we are done
-                #prevent lower packages from installing any files of this installer
-                if inst.is_active: mask |= set(inst.ci_dest_sizeCrc)
+            finally:
+                unpack_ahead.shutdown()
             if tweaksCreated:
                 self._editTweaks(tweaksCreated)
                 refresh_ui |= Store.INIS.IF(tweaksCreated)
@@ -2822,11 +3315,17 @@ def _restoreFiles(self, restores, refresh_ui, progress):
         progress.setFull(len(installer_destinations))
         installer_destinations = dict_sort(installer_destinations,
                                            key_f=lambda k: self[k].order)
-        for index, (fn_inst, destFiles) in enumerate(installer_destinations):
-            progress(index, fn_inst)
-            if destFiles:
-                refresh_ui.update(self._installer_install(
-                    self[fn_inst], destFiles, index, progress))
+        unpack_ahead = _UnpackAhead((self[fn_inst], destFiles) for
+            fn_inst, destFiles in installer_destinations)
+        try:
+            for index, (inst, destFiles, unpacked) in enumerate(unpack_ahead):
+                progress(index, inst.fn_key)
+                if destFiles:
+                    refresh_ui.update(self._installer_install(
+                        inst, destFiles, index, progress,
+                        unpacked_ahead=unpacked))
+        finally:
+            unpack_ahead.shutdown()
 
     def bain_anneal(self, anPackages, refresh_ui, progress=None):
         """Anneal selected packages. If no packages are selected, anneal all.
@@ -2905,6 +3404,7 @@ def clean_data_dir(self, ci_removes, refresh_ui):
                     if store is not None:
                         store_del[store].add(store_inf.fn_key)
                     self.data_sizeCrcDate.pop(ci_rel_path, None)
+                    self._mark_data_dirty([ci_rel_path])
                     emptyDirs.add(full_path.head)
                 except (StateError, OSError):
                     #It's not imperative that files get moved, so ignore errors
@@ -3015,21 +3515,28 @@ def _sort_bsa_conflicts(bsa_conflict):
                 return active_bsas[bsa_conflict[1]]
             lower_bsa.sort(key=_sort_bsa_conflicts)
             higher_bsa.sort(key=_sort_bsa_conflicts)
-        # Calculate loose conflicts
-        lower_loose, higher_loose = [], []
-        for package, installer in self.sorted_pairs():
-            if installer.order == srcOrder or not (
+        # Calculate loose conflicts - only look at the installers that
+        # install the files in question
+        self._sync_dest_index()
+        dest_index_get = self._dest_index.get
+        inst_conflicts = defaultdict(list)
+        for x in mismatched:
+            src_sc = src_sizeCrc[x]
+            for inst_key in dest_index_get(x, ()):
+                installer = self[inst_key]
+                if installer.order == srcOrder or not (
                         showInactive or installer.is_active): continue
-            if not showLower and installer.order < srcOrder: continue
-            curConflicts = bolt.sortFiles(
-                [x for x, y in installer.ci_dest_sizeCrc.items()
-                if x in mismatched and y != src_sizeCrc[x]])
-            if curConflicts:
-                if installer.order < srcOrder:
-                    conflict_type = lower_loose
-                else:
-                    conflict_type = higher_loose
-                conflict_type.append((installer, package, curConflicts))
+                if not showLower and installer.order < srcOrder: continue
+                if installer.ci_dest_sizeCrc[x] != src_sc:
+                    inst_conflicts[inst_key].append(x)
+        lower_loose, higher_loose = [], []
+        for package, installer in self.sorted_pairs(inst_conflicts):
+            curConflicts = bolt.sortFiles(inst_conflicts[package])
+            if installer.order < srcOrder:
+                conflict_type = lower_loose
+            else:
+                conflict_type = higher_loose
+            conflict_type.append((installer, package, curConflicts))
         return lower_loose, higher_loose, lower_bsa, higher_bsa
 
     def find_src_assets(self, src_installer, active_bsas):
@@ -31,13 +31,17 @@
 
 __author__ = 'Utumno'
 
+import collections
+import mmap
 import os
 import typing
 import zlib
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
-from itertools import chain, groupby
+from itertools import accumulate, chain, groupby
 from operator import itemgetter
+from struct import iter_unpack as _iter_unpack
 from struct import unpack_from as _unpack_from
 
 import lz4.block
@@ -53,6 +57,11 @@
 _bsa_encoding = 'cp1252' # rumor has it that's the files/folders names encoding
 path_sep = u'\\'
 
+# Number of threads reading and decompressing the records we extract and how
+# many records we keep in flight ahead of the one being written out
+_EXTRACT_WORKERS = min(4, os.cpu_count() or 1)
+_EXTRACT_AHEAD = 4 * _EXTRACT_WORKERS
+
 # Utilities -------------------------------------------------------------------
 def _decode_path(byte_path: bytes, bsa_name: str):
     try:
@@ -192,6 +201,31 @@ def decompress_rec(compressed_data, decompressed_size, bsa_name):
 ]
 assert len(_BA2_CRC_TABLE) == 256
 
+# A dictionary mapping file extensions to hash components. Used when hashing
+# file names for BSAs.
+_bsa_ext_lookup = defaultdict(int, [('.kf', 0x80), ('.nif', 0x8000),
+                                    ('.dds', 0x8080), ('.wav', 0x80000000)])
+
+def _hash_bsa_string(root, ext=''):
+    """Calculates the hash used by BSAs (Oblivion up to Skyrim SE) for the
+    specified lowercase root and extension of a file name - or for a folder
+    path, which is hashed as a root without an extension.
+    Based on Timeslips code with cleanup and pythonization.
+
+    See here for more information:
+    https://en.uesp.net/wiki/Tes4Mod:Hash_Calculation"""
+    chars = [ord(x) for x in root]
+    hash_part_1 = chars[-1] | ((len(chars) > 2 and chars[-2]) or 0) << 8 \
+                  | len(chars) << 16 | chars[0] << 24
+    hash_part_1 |= _bsa_ext_lookup[ext]
+    uint_mask, hash_part_2, hash_part_3 = 0xFFFFFFFF, 0, 0
+    for char in chars[1:-2]:
+        hash_part_2 = ((hash_part_2 * 0x1003F) + char) & uint_mask
+    for char in (ord(x) for x in ext):
+        hash_part_3 = ((hash_part_3 * 0x1003F) + char) & uint_mask
+    hash_part_2 = (hash_part_2 + hash_part_3) & uint_mask
+    return (hash_part_2 << 32) + hash_part_1
+
 def _hash_ba2_string(ba2_string):
     """Calculates Bethesda's nonstandard CRC hash for the given string."""
     normalized_string = ba2_string.encode(u'ascii', u'ignore').lower()
@@ -549,52 +583,56 @@ def extract_assets(self, asset_paths, dest_folder, progress=None):
         :param progress: The progress callback to use. None if unwanted."""
         folder_files_dict = self._map_files_to_folders(asset_paths)
         del asset_paths # forget about this
-        # load the bsa - this should be reworked to load only needed records
-        self._load_bsa()
-        folder_to_assets = self._map_assets_to_folders(folder_files_dict)
-        # unload the bsa
-        self.bsa_folders.clear()
-        # get the data from the file
-        global_compression = self.bsa_header.is_compressed()
+        try:
+            folder_to_assets = self._find_assets(folder_files_dict)
+        except struct_error as e:
+            raise BSAError(self.bsa_name, f'Error while unpacking: {e!r}')
+        if folder_to_assets is None:
+            # Could not look the folders up, load the whole bsa
+            self._load_bsa()
+            folder_to_assets = self._map_assets_to_folders(folder_files_dict)
+            # unload the bsa
+            self.bsa_folders.clear()
+        self._extract_records(folder_to_assets, dest_folder, progress)
+
+    def _extract_records(self, folder_to_assets, dest_folder, progress):
+        """Write out the (filename, record) pairs of each folder in
+        folder_to_assets. The records are read from a memory-mapped view of
+        the file and decompressed in a pool of threads, while the results are
+        written in order."""
         if progress:
             progress.setFull(len(folder_to_assets))
-        with open(self.abs_path, u'rb') as bsa_file:
-            for i, (folder, file_records) in enumerate(folder_to_assets.items()):
-                if progress:
-                    progress(i, f"{_('Extracting %(target_bsa)s…')}"
-                                f"\n{folder}" % {'target_bsa': self.bsa_name})
-                # BSA paths always have backslashes, so we need to convert them
-                # to the platform's path separators before we extract
-                target_dir = os.path.join(dest_folder, *folder.split(path_sep))
-                os.makedirs(target_dir, exist_ok=True)
-                for filename, record in file_records:
-                    data_size = record.raw_data_size()
-                    bsa_file.seek(record.raw_file_data_offset)
-                    if self.bsa_header.embed_filenames(): # use len(filename) ?
-                        filename_len = unpack_byte(bsa_file)
-                        bsa_file.seek(filename_len, 1) # discard filename
-                        data_size -= filename_len + 1
-                    if global_compression ^ record.compression_toggle():
-                        # This is a compressed record, so decompress it
-                        uncompressed_size = unpack_int(bsa_file)
-                        data_size -= 4
-                        try:
-                            raw_data = self._compression_type.decompress_rec(
-                                bsa_file.read(data_size), uncompressed_size,
-                                self.bsa_name)
-                        except BSAError:
-                            # Ignore errors for Fallout - Misc.bsa - Bethesda
-                            # probably used an old buggy zlib version when
-                            # packing it (taken from BSArch sources)
-                            if self.bsa_name == u'Fallout - Misc.bsa':
-                                continue
-                            else:
-                                raise
-                    else:
-                        # This is an uncompressed record, just read it
-                        raw_data = bsa_file.read(data_size)
-                    with open(os.path.join(target_dir, filename), 'wb') as out:
+        pending = collections.deque()
+        def _write_out(max_pending):
+            while len(pending) > max_pending:
+                out_path, rec_future = pending.popleft()
+                if (raw_data := rec_future.result()) is not None:
+                    with open(out_path, 'wb') as out:
                         out.write(raw_data)
+        with open(self.abs_path, 'rb') as bsa_file, mmap.mmap(
+                bsa_file.fileno(), 0, access=mmap.ACCESS_READ) as bsa_view:
+            executor = ThreadPoolExecutor(max_workers=_EXTRACT_WORKERS)
+            try:
+                for i, (folder, file_records) in enumerate(
+                        folder_to_assets.items()):
+                    if progress:
+                        progress(i, f"{_('Extracting %(target_bsa)s…')}"
+                                    f"\n{folder}" % {
+                            'target_bsa': self.bsa_name})
+                    # BSA paths always have backslashes, so we need to
+                    # convert them to the platform's path separators before
+                    # we extract
+                    target_dir = os.path.join(dest_folder,
+                                              *folder.split(path_sep))
+                    os.makedirs(target_dir, exist_ok=True)
+                    for filename, record in file_records:
+                        pending.append((os.path.join(target_dir, filename),
+                            executor.submit(self._read_record, bsa_view,
+                                            record)))
+                        _write_out(_EXTRACT_AHEAD)
+                _write_out(0)
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
 
     def _map_assets_to_folders(self, folder_files_dict):
         folder_to_assets = {}
@@ -612,9 +650,21 @@ def _map_assets_to_folders(self, folder_files_dict):
                 file_records.append((filename, filerecord))
         return folder_to_assets
 
+    def _find_assets(self, folder_files_dict):
+        """Return the (filename, record) pairs of each folder in
+        folder_files_dict, like _map_assets_to_folders does, by looking up
+        only the requested folders. Returns None if the bsa has to be loaded
+        in full instead."""
+        return None
+
     # Abstract
     def _load_bsa(self): raise NotImplementedError
     def _load_bsa_light(self): raise NotImplementedError
+    def _read_record(self, bsa_view, record):
+        """Return the (decompressed) data of the specified record, read from
+        the specified memory-mapped view of this bsa, or None to skip it.
+        Runs in a worker thread."""
+        raise NotImplementedError
 
     # API - delegates to abstract methods above
     def has_assets(self, asset_paths):
@@ -638,12 +688,25 @@ def assets(self) -> frozenset[str]:
         separator."""
         wanted_assets = self._assets
         if wanted_assets is None:
-            self.__load(names_only=True)
-            self._assets = wanted_assets = frozenset(
-                convert_separators(f.lower()) for f in self._filenames)
-            del self._filenames[:]
+            wanted_assets = self._cached_assets()
+            if wanted_assets is None:
+                self.__load(names_only=True)
+                wanted_assets = frozenset(
+                    convert_separators(f.lower()) for f in self._filenames)
+                del self._filenames[:]
+                self._cache_assets(wanted_assets)
+            self._assets = wanted_assets
         return wanted_assets
 
+    def _cached_assets(self) -> frozenset[str] | None:
+        """Return the assets of this bsa if they were cached (e.g. on disk by
+        a previous run) and are still valid, None otherwise."""
+        return None
+
+    def _cache_assets(self, bsa_assets: frozenset[str]):
+        """Cache the freshly parsed assets of this bsa - see
+        _cached_assets."""
+
 class BSA(ABsa):
     """Bsa file. Notes:
     - We require that include_directory_names and include_file_names are True.
@@ -743,87 +806,214 @@ def _read_bsa_file(self, folder_records, read_file_records) -> list[bytes]:
             # close the file
         return file_names
 
+    def _find_assets(self, folder_files_dict):
+        # The folder records are keyed by the hash of the folder path (with
+        # BSA separators) - we can't hash the root folder or non-ASCII paths
+        wanted_hashes = {}
+        for ffd_key in folder_files_dict:
+            if not ffd_key or not ffd_key.isascii(): return None
+            wanted_hashes[_hash_bsa_string(
+                ffd_key.replace(os.sep, path_sep))] = ffd_key
+        my_header = self.bsa_header
+        my_bsa_name = self.bsa_name
+        file_rec_type = self.__class__.file_record_type
+        file_rec_size = file_rec_type.total_record_size()
+        folder_rec_fmt = '=' + ''.join(f for f, _f_size in (
+            _HashedRecord.formats + self.__class__.folder_record_type.formats))
+        with open(self.abs_path, 'rb') as bsa_file:
+            my_header.load_header(bsa_file, my_bsa_name)
+            # (hash, files_count, ..., file_records_offset) tuples
+            folder_recs = [*_iter_unpack(folder_rec_fmt, bsa_file.read(
+                struct_calcsize(folder_rec_fmt) * my_header.folder_count))]
+            folder_index = {f_rec[0]: i for i, f_rec in enumerate(folder_recs)}
+            try:
+                wanted_folders = sorted( # keep the order of the bsa
+                    (folder_index[h], ffd_key) for h, ffd_key in
+                    wanted_hashes.items())
+            except KeyError:
+                return None # hashed differently - e.g. by a buggy tool
+            if not wanted_folders: return {}
+            # The file names are stored after all the file record blocks, in
+            # the same order - so we need to know where each folder starts
+            first_file = [0, *accumulate(f_rec[1] for f_rec in folder_recs)]
+            def _seek_block(f_rec): # offsets include the file names length
+                bsa_file.seek(f_rec[-1] - my_header.total_file_name_length)
+                return unpack_byte(bsa_file) # folder name size
+            last_rec = folder_recs[-1]
+            bsa_file.seek(_seek_block(last_rec) + file_rec_size * last_rec[1],
+                          1)
+            file_names = bsa_file.read( # has an empty string at the end
+                my_header.total_file_name_length).split(b'\00')
+            folder_to_assets = {}
+            for f_index, ffd_key in wanted_folders:
+                f_rec = folder_recs[f_index]
+                folder_path = _decode_path(
+                    bsa_file.read(_seek_block(f_rec))[:-1], my_bsa_name)
+                if folder_path.lower().replace(path_sep, os.sep) != ffd_key:
+                    return None # hash collision
+                recs_block = memoryview(bsa_file.read(
+                    file_rec_size * f_rec[1]))
+                filenames = folder_files_dict[ffd_key]
+                folder_to_assets[folder_path] = file_records = []
+                for i, fname in enumerate(file_names[
+                        first_file[f_index]:first_file[f_index + 1]]):
+                    filename = _decode_path(fname, my_bsa_name)
+                    if filename.lower() not in filenames: continue
+                    rec = file_rec_type()
+                    rec.load_record_from_buffer(recs_block, file_rec_size * i)
+                    file_records.append((filename, rec))
+        return folder_to_assets
+
+    def _read_record(self, bsa_view, record):
+        data_offset = record.raw_file_data_offset
+        data_size = record.raw_data_size()
+        if self.bsa_header.embed_filenames(): # use len(filename) ?
+            filename_len = bsa_view[data_offset]
+            data_offset += filename_len + 1 # discard filename
+            data_size -= filename_len + 1
+        if self.bsa_header.is_compressed() != bool(
+                record.compression_toggle()):
+            # This is a compressed record, so decompress it
+            uncompressed_size, = _unpack_from('I', bsa_view, data_offset)
+            data_offset += 4
+            data_size -= 4
+            try:
+                return self._compression_type.decompress_rec(
+                    bsa_view[data_offset:data_offset + data_size],
+                    uncompressed_size, self.bsa_name)
+            except BSAError:
+                # Ignore errors for Fallout - Misc.bsa - Bethesda probably
+                # used an old buggy zlib version when packing it (taken from
+                # BSArch sources)
+                if self.bsa_name == 'Fallout - Misc.bsa':
+                    return None
+                raise
+        # This is an uncompressed record, just read it
+        return bsa_view[data_offset:data_offset + data_size]
+
 class BA2(ABsa):
     bsa_header: Ba2Header
     _folder_type = Ba2Folder
     bsa_folders: defaultdict[str, _folder_type] # we need to repeat this
 
-    def extract_assets(self, asset_paths, dest_folder, progress=None):
-        # map files to folders
-        folder_files_dict = self._map_files_to_folders(asset_paths)
-        del asset_paths # forget about this
-        # load the bsa - this should be reworked to load only needed records
-        self._load_bsa()
+    def _find_assets(self, folder_files_dict):
+        # There are no folder records, but each file record is tagged with
+        # the hash of its folder path (with BSA separators)
+        wanted_hashes = set()
+        for ffd_key in folder_files_dict:
+            if not ffd_key.isascii(): return None
+            wanted_hashes.add(_hash_ba2_string(
+                ffd_key.replace(os.sep, path_sep)))
         my_header = self.bsa_header
-        is_dx10 = my_header.ba2_files_type == b'DX10'
-        folder_to_assets = self._map_assets_to_folders(folder_files_dict)
-        # unload the bsa
-        self.bsa_folders.clear()
-        # get the data from the file
-        if progress:
-            progress.setFull(len(folder_to_assets))
-        with open(self.abs_path, u'rb') as bsa_file:
-            def _read_rec_or_chunk(record):
-                """Helper method, handles reading both compressed and
-                uncompressed records (or texture chunks)."""
-                bsa_file.seek(record.offset)
-                if record.packed_size:
-                    # This is a compressed record, so decompress it
-                    return self._compression_type.decompress_rec(
-                        bsa_file.read(record.packed_size),
-                        record.unpacked_size, self.bsa_name)
-                else:
-                    # This is an uncompressed record, just read it
-                    return bsa_file.read(record.unpacked_size)
-            def _build_dds_header(dds_file, record):
-                """Helper method, sets up a functional DDS header for the
-                specified DDS file based on the specified record."""
-                dds_file.dds_header.dw_height = record.height
-                dds_file.dds_header.dw_width = record.width
-                dds_file.dds_header.dw_mip_map_count = record.num_mips
-                dds_file.dds_header.dw_depth = 1
-                # 3 == DDS_DIMENSION_TEXTURE2D - PY3: enum!
-                dds_file.dds_dxt10.resource_dimension = 3
-                dds_file.dds_dxt10.array_size = 1
-                if record.cube_maps == 2049:
-                    dds_file.dds_header.dw_caps.DDSCAPS_COMPLEX = True
-                    # All but DDSCAPS2_VOLUME or'd together
-                    # Archive.exe sticks these into dwCaps, which is 100%
-                    # wrong, but that's DDS for you...
-                    dds_file.dds_header.dw_caps2 = 0xFE00
-                    # 0x4 == DDS_RESOURCE_MISC_TEXTURECUBE
-                    dds_file.dds_dxt10.misc_flag = 0x4
-                # This needs to be last, it uses the header's width and height
-                record.dxgi_format.setup_file(
-                    dds_file, use_legacy_formats=True)
-            for i, (folder, file_records) in enumerate(
-                    folder_to_assets.items()):
-                if progress:
-                    progress(i, f"{_('Extracting %(target_bsa)s…')}"
-                                f"\n{folder}" % {'target_bsa': self.bsa_name})
-                # BSA paths always have backslashes, so we need to convert them
-                # to the platform's path separators before we extract
-                target_dir = os.path.join(dest_folder, *folder.split(path_sep))
-                os.makedirs(target_dir, exist_ok=True)
-                for filename, f_record in file_records:
-                    if is_dx10:
-                        # We're dealing with a DX10 BA2, need to combine all
-                        # the texture chunks in the record first
-                        dds_data = b''
-                        for tex_chunk in f_record.tex_chunks:
-                            dds_data += _read_rec_or_chunk(tex_chunk)
-                        # Add a DDS header based on the data in the record,
-                        # then dump the resulting DDS file - cf. BSArch
-                        new_dds_file = DDSFile('')
-                        _build_dds_header(new_dds_file, f_record)
-                        new_dds_file.dds_contents = dds_data
-                        raw_data = new_dds_file.dump_file()
-                    else:
-                        # Otherwise, we're dealing with a GNRL BA2, just
-                        # read/decompress/write the record directly
-                        raw_data = _read_rec_or_chunk(f_record)
-                    with open(os.path.join(target_dir, filename), 'wb') as out:
-                        out.write(raw_data)
+        matched_recs = {} # file index -> file record
+        with open(self.abs_path, 'rb') as bsa_file:
+            my_header.load_header(bsa_file, self.bsa_name)
+            if my_header.ba2_files_type == b'GNRL':
+                file_record_type = Ba2FileRecordGeneral
+            else:
+                file_record_type = Ba2FileRecordTexture
+            # (hash, file_extension, dir_hash, ...) - see the record types
+            rec_fmt = '=' + ''.join(f for f, _f_size in (
+                _HashedRecord.formats + file_record_type.formats))
+            rec_size = struct_calcsize(rec_fmt)
+            if file_record_type is Ba2FileRecordGeneral:
+                # Fixed size records, read them all in one go
+                recs_block = memoryview(bsa_file.read(
+                    rec_size * my_header.ba2_num_files))
+                for index, rec_vals in enumerate(_iter_unpack(rec_fmt,
+                                                              recs_block)):
+                    if rec_vals[2] in wanted_hashes:
+                        rec = Ba2FileRecordGeneral()
+                        rec.load_record_from_buffer(recs_block,
+                                                    rec_size * index)
+                        matched_recs[index] = rec
+            else:
+                # Each texture record is followed by its chunks
+                chunk_size = sum(f_size for _f, f_size in Ba2TexChunk.formats)
+                for index in range(my_header.ba2_num_files):
+                    rec_vals = _unpack_from(rec_fmt, bsa_file.read(rec_size))
+                    if rec_vals[2] in wanted_hashes:
+                        bsa_file.seek(-rec_size, 1)
+                        rec = Ba2FileRecordTexture()
+                        rec.load_record(bsa_file)
+                        matched_recs[index] = rec
+                    else: # skip the chunks
+                        bsa_file.seek(chunk_size * rec_vals[4], 1)
+            if wanted_hashes - {r.dir_hash for r in matched_recs.values()}:
+                return None # hashed differently - e.g. by a buggy tool
+            # load the file names block
+            bsa_file.seek(my_header.ba2_name_table_offset)
+            file_names_block = memoryview(bsa_file.read())
+        folder_to_assets = {}
+        name_offset = 0
+        for index in range(max(matched_recs, default=-1) + 1):
+            name_size = _unpack_from('H', file_names_block, name_offset)[0]
+            name_offset += 2
+            if (rec := matched_recs.get(index)) is not None:
+                filename = _decode_path(file_names_block[
+                    name_offset:name_offset + name_size].tobytes(),
+                    self.bsa_name)
+                folder_dex = filename.rfind(path_sep)
+                folder_name = '' if folder_dex == -1 else filename[:folder_dex]
+                ffd_key = folder_name.lower().replace(path_sep, os.sep)
+                if ffd_key in folder_files_dict: # else a hash collision
+                    file_records = folder_to_assets.setdefault(folder_name, [])
+                    filename = filename[folder_dex + 1:]
+                    if filename.lower() in folder_files_dict[ffd_key]:
+                        file_records.append((filename, rec))
+            name_offset += name_size
+        return folder_to_assets
+
+    def _read_record(self, bsa_view, record):
+        if self.bsa_header.ba2_files_type == b'DX10':
+            # We're dealing with a DX10 BA2, need to combine all the texture
+            # chunks in the record first
+            dds_data = b''.join([self._read_rec_or_chunk(bsa_view, tex_chunk)
+                                 for tex_chunk in record.tex_chunks])
+            # Add a DDS header based on the data in the record, then dump the
+            # resulting DDS file - cf. BSArch
+            new_dds_file = DDSFile('')
+            self._build_dds_header(new_dds_file, record)
+            new_dds_file.dds_contents = dds_data
+            return new_dds_file.dump_file()
+        # Otherwise, we're dealing with a GNRL BA2, just read/decompress the
+        # record directly
+        return self._read_rec_or_chunk(bsa_view, record)
+
+    def _read_rec_or_chunk(self, bsa_view, record):
+        """Helper method, handles reading both compressed and uncompressed
+        records (or texture chunks)."""
+        rec_offset = record.offset
+        if record.packed_size:
+            # This is a compressed record, so decompress it
+            return self._compression_type.decompress_rec(
+                bsa_view[rec_offset:rec_offset + record.packed_size],
+                record.unpacked_size, self.bsa_name)
+        else:
+            # This is an uncompressed record, just read it
+            return bsa_view[rec_offset:rec_offset + record.unpacked_size]
+
+    @staticmethod
+    def _build_dds_header(dds_file, record):
+        """Helper method, sets up a functional DDS header for the specified
+        DDS file based on the specified record."""
+        dds_file.dds_header.dw_height = record.height
+        dds_file.dds_header.dw_width = record.width
+        dds_file.dds_header.dw_mip_map_count = record.num_mips
+        dds_file.dds_header.dw_depth = 1
+        # 3 == DDS_DIMENSION_TEXTURE2D - PY3: enum!
+        dds_file.dds_dxt10.resource_dimension = 3
+        dds_file.dds_dxt10.array_size = 1
+        if record.cube_maps == 2049:
+            dds_file.dds_header.dw_caps.DDSCAPS_COMPLEX = True
+            # All but DDSCAPS2_VOLUME or'd together
+            # Archive.exe sticks these into dwCaps, which is 100% wrong, but
+            # that's DDS for you...
+            dds_file.dds_header.dw_caps2 = 0xFE00
+            # 0x4 == DDS_RESOURCE_MISC_TEXTURECUBE
+            dds_file.dds_dxt10.misc_flag = 0x4
+        # This needs to be last, it uses the header's width and height
+        record.dxgi_format.setup_file(dds_file, use_legacy_formats=True)
 
     def _load_bsa(self):
         with open(self.abs_path, u'rb') as bsa_file:
@@ -964,32 +1154,13 @@ class OblivionBsa(BSA):
     file_record_type = BSAOblivionFileRecord
     _folder_type = BSAOblivionFolder
     bsa_folders: defaultdict[str, _folder_type] # for proper typing
-    # A dictionary mapping file extensions to hash components. Used by Oblivion
-    # when hashing file names for its BSAs.
-    _bsa_ext_lookup = defaultdict(int, [('.kf', 0x80),
-        ('.nif', 0x8000), ('.dds', 0x8080), ('.wav', 0x80000000)])
 
     @staticmethod
     def calculate_hash(filename):
         """Calculates the hash used by Oblivion BSAs for the provided file
-        name.
-        Based on Timeslips code with cleanup and pythonization.
-
-        See here for more information:
-        https://en.uesp.net/wiki/Tes4Mod:Hash_Calculation"""
+        name."""
         #--NOTE: fileName is NOT a Path object!
-        root, ext = os.path.splitext(filename.lower())
-        chars = [ord(x) for x in root]
-        hash_part_1 = chars[-1] | ((len(chars) > 2 and chars[-2]) or 0) << 8 \
-                      | len(chars) << 16 | chars[0] << 24
-        hash_part_1 |= OblivionBsa._bsa_ext_lookup[ext]
-        uint_mask, hash_part_2, hash_part_3 = 0xFFFFFFFF, 0, 0
-        for char in chars[1:-2]:
-            hash_part_2 = ((hash_part_2 * 0x1003F) + char) & uint_mask
-        for char in (ord(x) for x in ext):
-            hash_part_3 = ((hash_part_3 * 0x1003F) + char) & uint_mask
-        hash_part_2 = (hash_part_2 + hash_part_3) & uint_mask
-        return (hash_part_2 << 32) + hash_part_1
+        return _hash_bsa_string(*os.path.splitext(filename.lower()))
 
     def undo_alterations(self, progress=Progress()):
         """Undoes any alterations that previously applied BSA Alteration may
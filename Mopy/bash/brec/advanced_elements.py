@@ -332,6 +332,7 @@ def __init__(self, array_attr: str, element: MelBase,
         # Underscore means internal usage only - e.g. distributor state
         self.array_element_attrs = [s for s in element.getSlotsUsed() if
                                     not s.startswith(u'_')]
+        self._entry_type = MelObject.slotted_type(element.getSlotsUsed())
         # Validate that the prelude is valid if it's present (i.e. it must have
         # only one signature and it must match the element's signature)
         if prelude:
@@ -391,13 +392,12 @@ def load_mel(self, record, ins, sub_type, size_, *debug_strs):
 
     def _load_array(self, record, ins, sub_type, size_, debug_strs):
         append_entry = getattr(record, self.attr).append
-        entry_slots = self.array_element_attrs
+        new_entry = self._entry_type
         entry_size = self._element_size
         load_entry = self._element.load_mel
         for x in range(size_ // entry_size):
-            arr_entry = MelObject()
+            arr_entry = new_entry()
             append_entry(arr_entry)
-            arr_entry.__slots__ = entry_slots
             load_entry(arr_entry, ins, sub_type, entry_size, *debug_strs)
 
     def pack_subrecord_data(self, record):
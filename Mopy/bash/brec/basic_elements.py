@@ -36,7 +36,22 @@
 
 #------------------------------------------------------------------------------
 class MelObject(object):
-    """An empty class used by group and structure elements for data storage."""
+    """An empty class used by group and structure elements for data storage.
+    The elements actually store their data in instances of slotted_type
+    subclasses - see _SlottedMelObject."""
+    @staticmethod
+    def slotted_type(obj_slots) -> type[_SlottedMelObject]:
+        """Return the MelObject subclass that stores the specified attributes
+        in slots. Types are shared between all elements with the same
+        attributes."""
+        obj_slots = tuple(sorted(set(obj_slots)))
+        try:
+            return _slotted_types[obj_slots]
+        except KeyError:
+            slotted = _slotted_types[obj_slots] = type(
+                'MelObject', (_SlottedMelObject,), {'__slots__': obj_slots})
+            return slotted
+
     def __eq__(self,other):
         """Operator: =="""
         return isinstance(other,MelObject) and self.__dict__ == other.__dict__
@@ -68,6 +83,43 @@ def __repr__(self):
                         to_show.append(u'%s: %r' % (obj_attr, obj_val))
         return u'<%s>' % u', '.join(sorted(to_show)) # is sorted() needed here?
 
+class _SlottedMelObject(MelObject):
+    """Base class of the MelObject.slotted_type types. Storing the attributes
+    in slots instead of an instance dict roughly halves the memory each
+    object takes, which adds up for the MelGroup(s) and MelArray entries of
+    all the records held in memory during a patch build. Attributes outside
+    the slots (e.g. distributor state) still end up in the instance dict."""
+    __slots__ = ()
+    __hash__ = MelObject.__hash__
+
+    def _obj_state(self):
+        """Return a dict of all the attributes set on this object."""
+        obj_state = {a: v for a in self.__slots__ if
+                     (v := getattr(self, a, _unset)) is not _unset}
+        obj_state.update(self.__dict__)
+        return obj_state
+
+    def __eq__(self, other):
+        return isinstance(other, _SlottedMelObject) and \
+            self._obj_state() == other._obj_state()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        # The types are created on the fly, so pickle (and copy) by slots
+        return _new_slotted_object, (self.__slots__, self._obj_state())
+
+_slotted_types: dict[tuple[str, ...], type[_SlottedMelObject]] = {}
+_unset = object()
+
+def _new_slotted_object(obj_slots, obj_state):
+    """Recreate a _SlottedMelObject - see _SlottedMelObject.__reduce__."""
+    new_obj = MelObject.slotted_type(obj_slots)()
+    for obj_attr, obj_val in obj_state.items():
+        setattr(new_obj, obj_attr, obj_val)
+    return new_obj
+
 class Subrecord(object):
     """A subrecord. Base class defines the subrecord format and packing."""
     # TODO(ut): WIP! mel_sig does not make sense for all subclasses
@@ -378,6 +430,8 @@ class MelGroup(MelSequential):
     def __init__(self, attr: str, *elements):
         super(MelGroup, self).__init__(*elements)
         self.attr, self.loaders = attr, {}
+        self._group_type = MelObject.slotted_type(
+            s for element in self.elements for s in element.getSlotsUsed())
 
     def getDefaulters(self,defaulters,base):
         defaulters[base+self.attr] = self
@@ -395,9 +449,7 @@ def setDefault(self,record):
         setattr(record, self.attr, None)
 
     def getDefault(self):
-        target = MelObject()
-        target.__slots__ = [s for element in self.elements for s in
-                            element.getSlotsUsed()]
+        target = self._group_type()
         for element in self.elements:
             element.setDefault(target)
         return target
@@ -110,8 +110,9 @@ class AMreFlst(MelRecord):
     __slots__ = ('mergeOverLast', 'mergeSources', 'items', 'de_records',
                  're_records')
 
-    def __init__(self, header, ins=None, do_unpack=True):
-        super().__init__(header, ins, do_unpack=do_unpack)
+    def __init__(self, header, ins=None, do_unpack=True, lazy_unpack=False):
+        super().__init__(header, ins, do_unpack=do_unpack,
+                         lazy_unpack=lazy_unpack)
         self.mergeOverLast = False #--Merge overrides last mod merged
         self.mergeSources = None #--Set to list by other functions
         self.items = None #--Set of items included in list
@@ -456,8 +457,9 @@ class AMreLeveledList(MelRecord):
                  're_records')
                 # + ['flags', 'entries'] # define those in the subclasses
 
-    def __init__(self, header, ins=None, do_unpack=True):
-        super().__init__(header, ins, do_unpack=do_unpack)
+    def __init__(self, header, ins=None, do_unpack=True, lazy_unpack=False):
+        super().__init__(header, ins, do_unpack=do_unpack,
+                         lazy_unpack=lazy_unpack)
         self.mergeOverLast = False #--Merge overrides last mod merged
         self.mergeSources = None #--Set to list by other functions
         self.items = None #--Set of items included in list
@@ -22,8 +22,13 @@
 # =============================================================================
 """Houses very low-level classes for reading and writing bytes in plugin
 files."""
+import mmap
 import os
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from itertools import islice
 
 # no local imports beyond this, imported everywhere in brec
 from . import utils_constants
@@ -231,6 +236,96 @@ def unpack_header(ins, *, __rh=RecordHeader, _entering_context=False,
 
 #------------------------------------------------------------------------------
 # Low-level reading/writing ---------------------------------------------------
+# Compressed records are decompressed ahead in batches of about this many
+# compressed bytes - submitting each (usually small) record on its own to the
+# thread pool costs more than decompressing it
+_DECOMPRESS_BATCH_SIZE = 128 * 1024
+_DECOMPRESS_WORKERS = min(8, os.cpu_count() or 1)
+# Number of batches decompressed ahead of the record being loaded
+_DECOMPRESS_AHEAD = 2 * _DECOMPRESS_WORKERS
+
+def _decompress_batch(comp_batch):
+    """Decompress a batch of (data offset, compressed bytes) - leave it to
+    MreRecord.getDecompressed to raise for corrupt records."""
+    decomp_batch = {}
+    for data_pos, comp_blob in comp_batch:
+        try:
+            decomp_batch[data_pos] = zlib.decompress(comp_blob)
+        except zlib.error:
+            pass
+    return decomp_batch
+
+class _AheadDecompressor(object):
+    """Decompresses the compressed records of a plugin in a thread pool, in
+    file order and a bounded number of records ahead of the record being
+    loaded. zlib releases the GIL while decompressing, so this runs in
+    parallel with the unpacking of the records on the main thread."""
+
+    def __init__(self, plugin_buf, start_pos, top_sigs, rec_sigs):
+        self._batches = self._iter_batches(self._iter_compressed(
+            plugin_buf, start_pos, top_sigs, rec_sigs))
+        # (offset of last record in batch, future) in file order
+        self._pending = deque()
+        self._executor = ThreadPoolExecutor(max_workers=_DECOMPRESS_WORKERS)
+
+    @staticmethod
+    def _iter_compressed(plugin_buf, pos, top_sigs, rec_sigs, *,
+                         __rh=RecordHeader, __compressed_flag=1 << 18):
+        """Walk the headers in plugin_buf starting at pos and yield the data
+        offset and compressed bytes of each compressed record with one of
+        rec_sigs, skipping top groups whose signature is not in top_sigs."""
+        head_size = __rh.rec_header_size
+        head_unpack = structs_cache[__rh.rec_pack_format_str].unpack_from
+        top_grup_sigs = __rh.top_grup_sigs
+        buf_size = len(plugin_buf)
+        while pos + head_size <= buf_size:
+            head_sig, blob_size, arg1, arg2, *_rest = head_unpack(plugin_buf,
+                                                                  pos)
+            if head_sig == b'GRUP': # blob_size is the full size of the group
+                if arg2 == 0 and top_grup_sigs.get(arg1) not in top_sigs:
+                    pos += max(blob_size, head_size)
+                else: # walk the records and groups nested in this one
+                    pos += head_size
+                continue
+            data_pos = pos + head_size
+            pos = data_pos + blob_size
+            if arg1 & __compressed_flag and head_sig in rec_sigs:
+                # The first 4 bytes hold the decompressed size
+                yield data_pos, plugin_buf[data_pos + 4:pos]
+
+    @staticmethod
+    def _iter_batches(compressed_blobs):
+        comp_batch = []
+        batch_size = 0
+        for data_pos, comp_blob in compressed_blobs:
+            comp_batch.append((data_pos, comp_blob))
+            batch_size += len(comp_blob)
+            if batch_size >= _DECOMPRESS_BATCH_SIZE:
+                yield comp_batch
+                comp_batch = []
+                batch_size = 0
+        if comp_batch:
+            yield comp_batch
+
+    def take(self, data_pos):
+        """Return the decompressed data of the record whose data starts at
+        data_pos, or None if that record was not decompressed ahead."""
+        pending = self._pending
+        # Drop batches the loader is done with - it reads in file order too
+        while pending and pending[0][0] < data_pos:
+            pending.popleft()[1].cancel()
+        for comp_batch in islice(self._batches,
+                                 _DECOMPRESS_AHEAD - len(pending)):
+            pending.append((comp_batch[-1][0], self._executor.submit(
+                _decompress_batch, comp_batch)))
+        if pending:
+            return pending[0][1].result().get(data_pos)
+        return None
+
+    def close(self):
+        self._pending.clear()
+        self._executor.shutdown(cancel_futures=True)
+
 class ModReader(object):
     """Wrapper around a TES4 file in read mode.
     Will throw a ModReaderror if read operation fails to return correct size.
@@ -249,6 +344,9 @@ def __init__(self, inName, ins, ins_size=None):
         self.strings = {}
         self.hasStrings = False
         self.debug_offset = 0
+        # The whole plugin, if it is in memory - see decompress_ahead
+        self._plugin_buf = ins if isinstance(ins, mmap.mmap) else None
+        self._decompressor = None
 
     # with statement
     def __enter__(self):
@@ -258,7 +356,7 @@ def __enter__(self):
         return self
     def __exit__(self, exc_type, exc_value, exc_traceback):
         utils_constants.FORM_ID = self.form_id_type
-        self.ins.close()
+        self.close()
 
     def load_tes4(self, do_unpack_tes4=True):
         """Load the plugin file "header" record - generally has 'TES4'
@@ -275,10 +373,55 @@ def load_tes4(self, do_unpack_tes4=True):
         self.plugin_header.fid = tes4_rec_header.fid = ZERO_FID
 
     @classmethod
-    def from_info(cls, mod_info):
-        """Boilerplate for creating a ModReader wrapping a mod_info."""
+    def from_info(cls, mod_info, plugin_bytes=None, *, map_file=False):
+        """Boilerplate for creating a ModReader wrapping a mod_info. If
+        plugin_bytes is specified, it must hold the full contents of the
+        plugin (e.g. read ahead of time) and is wrapped instead of opening the
+        file again. If map_file is True, read the plugin through a read-only
+        memory map instead of a buffered file object - this is faster when
+        reading a whole plugin, since the many small header reads become
+        memory copies out of the page cache instead of calls into the OS."""
+        if plugin_bytes is not None:
+            reader = cls(mod_info.fn_key, BytesIO(plugin_bytes),
+                         len(plugin_bytes))
+            reader._plugin_buf = plugin_bytes
+            return reader
+        if map_file:
+            # mmap dups the file handle, so we can close ours right away
+            with mod_info.abs_path.open('rb') as plugin_ins:
+                try:
+                    mapped = mmap.mmap(plugin_ins.fileno(), 0,
+                                       access=mmap.ACCESS_READ)
+                except ValueError: # empty files can't be mapped
+                    mapped = None
+            if mapped is not None:
+                return cls(mod_info.fn_key, mapped, len(mapped))
         return cls(mod_info.fn_key, mod_info.abs_path.open('rb'))
 
+    @classmethod
+    def from_header_bytes(cls, mod_info, header_bytes):
+        """Create a ModReader wrapping only the raw plugin header record of
+        mod_info (e.g. cached from an earlier read) - enough to read the
+        plugin header, but note that size is then the size of the header
+        record, not of the plugin."""
+        return cls(mod_info.fn_key, BytesIO(header_bytes), len(header_bytes))
+
+    def decompress_ahead(self, top_sigs, rec_sigs):
+        """Start decompressing the compressed records with one of rec_sigs
+        that follow the current position, in a thread pool and ahead of them
+        being loaded - see MreRecord.getDecompressed. Skips top groups whose
+        signature is not in top_sigs. Does nothing unless the whole plugin is
+        in memory, i.e. it was passed in or mapped (see from_info)."""
+        if self._plugin_buf is not None and self._decompressor is None:
+            self._decompressor = _AheadDecompressor(self._plugin_buf,
+                self.tell(), top_sigs, rec_sigs)
+
+    def take_decompressed(self, data_pos):
+        """Return the data of the compressed record whose data starts at
+        data_pos, if it was decompressed ahead - else None."""
+        if self._decompressor is None: return None
+        return self._decompressor.take(data_pos)
+
     def setStringTable(self, string_table):
         self.hasStrings = bool(string_table)
         self.strings = string_table or {} # table may be None
@@ -308,6 +451,9 @@ def tell_debug(self):
 
     def close(self):
         """Close file."""
+        if self._decompressor is not None:
+            self._decompressor.close()
+            self._decompressor = None
         self.ins.close()
 
     def atEnd(self, endPos=-1, *debug_strs):
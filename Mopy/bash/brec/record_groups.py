@@ -34,9 +34,20 @@
 from .mod_io import ChildrenGrupHeader, ExteriorGrupHeader, FastModReader, \
     GrupHeader, RecordHeader, TopGrupHeader, unpack_header
 from .utils_constants import DUMMY_FID, FormId, group_types
-from ..bolt import MasterSet, attrgetter_cache, deprint, dict_sort, sig_to_str
+from ..bolt import MasterSet, attrgetter_cache, deprint, dict_sort, \
+    sig_to_str, structs_cache
 from ..exception import ModError
 
+def _patch_grup_size(out, head_pos, *,
+                     __pack_size=structs_cache['=I'].pack_into):
+    """Set the size of the GRUP whose header was written at head_pos in out to
+    cover everything written to out since - out must be a BytesIO. Returns
+    the size."""
+    grup_size = out.tell() - head_pos
+    with out.getbuffer() as out_buf:
+        __pack_size(out_buf, head_pos + 4, grup_size) # skip the b'GRUP'
+    return grup_size
+
 class _AMobBase:
     """Group of records and/or subgroups."""
     def __init__(self, load_f, ins, endPos):
@@ -64,7 +75,9 @@ def get_num_headers(self):
         raise NotImplementedError
 
     def dump(self, out):
-        """Dumps record header and data into output file stream."""
+        """Dumps record header and data into output file stream. Group sizes
+        are patched in after dumping the group contents, so out must be a
+        BytesIO."""
         raise NotImplementedError
 
     def __bool__(self): raise NotImplementedError
@@ -75,7 +88,8 @@ class _RecordsGrup(_AMobBase):
     def _group_element(self, header, ins,
                        end_pos) -> 'MreRecord | _ComplexRec | None':
         rec_class = self._load_f.sig_to_type[header.recType]
-        return None if rec_class is None else rec_class(header, ins)
+        return None if rec_class is None else rec_class(header, ins,
+            lazy_unpack=self._load_f.lazy_unpack)
 
     def iter_records(self, *, skip_flagged=True):
         """Flattens the structure of this record block into a linear sequence
@@ -172,16 +186,22 @@ def __init__(self, grup_head, load_f, ins):
         super().__init__(load_f, ins, self._end_pos)
 
     def _write_header(self, out):
-        """getSize not only gets the size - essentially prepares the whole
-        grup for dumping - WIP"""
-        # for non headed groups we still need to call getSize to populate the
-        # block data structures - see _ExteriorCells
-        group_size = self.getSize()
+        """Write our header to out with a zero size - the size is only known
+        once our contents are dumped, see _patch_header. Returns the position
+        of the header in out."""
+        head_pos = out.tell()
         if self._grup_header_type:
-            if self._grup_head: # only update size, keep the rest of the header
-                self._grup_head.group_size = group_size
+            if self._grup_head: # keep the rest of the header
+                self._grup_head.group_size = 0
                 out.write(self._grup_head.pack_head())
             else: raise self._load_err(f'Missing header in {self!r}')
+        return head_pos
+
+    def _patch_header(self, out, head_pos):
+        """Patch the size of the header _write_header wrote at head_pos, now
+        that our contents have been dumped after it."""
+        if self._grup_header_type: # _ExteriorCells have no header
+            self._grup_head.group_size = _patch_grup_size(out, head_pos)
 
     @classmethod
     def empty_mob(cls, load_f, head_label, *head_arg):
@@ -238,8 +258,9 @@ def dump(self, out):
         if self.grup_blob is None:
             raise NotImplementedError(f'{self!r} was not loaded')
         if self.grup_blob:
-            self._write_header(out)
+            head_pos = self._write_header(out)
             out.write(self.grup_blob)
+            self._patch_header(out, head_pos)
 
 #------------------------------------------------------------------------------
 class MobObjects(_RecordsGrup, _HeadedGrup):
@@ -284,6 +305,7 @@ def _sort_group(self):
 
     def _dump_group(self, out):
         for record in self.id_records.values():
+            record.getSize() # pack the record if it changed
             record.dump(out)
 
     # _AMobBase API -----------------------------------------------------------
@@ -304,9 +326,10 @@ def getSize(self):
     def dump(self,out):
         """Dumps group header and then records."""
         if self.id_records:
-            self._write_header(out)
+            head_pos = self._write_header(out)
             self._sort_group()
             self._dump_group(out)
+            self._patch_header(out, head_pos)
 
     def keepRecords(self, p_keep_ids):
         """Keeps records with fid in set p_keep_ids. Discards the rest."""
@@ -491,7 +514,10 @@ def _load_mobs(self, gt, header, ins, **kwargs):
 
     def dump(self, out): # No _sort_group
         for r in self._stray_recs.values():
-            if r: r.dump(out)
+            if r:
+                # pack records if they changed, _PersistentCell packs itself
+                if not isinstance(r, _AMobBase): r.getSize()
+                r.dump(out)
         for v in self._mob_objects.values(): # dump _mob_objects in order
             v.dump(out) # won't dump if empty
 
@@ -570,7 +596,8 @@ def _load_rec_group(self, ins, end_pos, master_rec=None):
                 return
             self._load_err(f'{self}: Missing {self._top_type} master record')
         recClass = self._load_f.sig_to_type[hsig]
-        self.master_record = recClass(header, ins)
+        self.master_record = recClass(header, ins,
+                                      lazy_unpack=self._load_f.lazy_unpack)
         if _loaded_world_records is not None:
             _loaded_world_records[self.master_record.group_key()] = self
         super()._load_rec_group(ins, end_pos, self.master_record)
@@ -668,6 +695,10 @@ def iter_records(self, *, skip_flagged=True):
         return chain(*(d.iter_records(skip_flagged=skip_flagged) for d in
                        self.id_records.values()))
 
+    def _dump_group(self, out):
+        for complex_rec in self.id_records.values(): # pack their own records
+            complex_rec.dump(out)
+
     def iter_present_records(self, rec_sig=None):
         """Iterate over the top blocks if rec_sig is None else filter super
         to only keep specified record type."""
@@ -754,7 +785,7 @@ class _DialChildren(_ChildrenGrup):
         def _write_header(self, out):
             # TODO(ut) why? what about other children grups?
             self._grup_head.extra = self._stamp2
-            super()._write_header(out)
+            return super()._write_header(out)
 
         def _sort_group(self):
             """Sorts the INFOs of this DIAL record by their (PNAM) Previous
@@ -831,12 +862,12 @@ class MobDials(TopComplexGrup):
     """DIAL top block of mod file."""
     _top_rec_class = MobDial
 
-    def getSize(self):
+    def dump(self, out):
         """Patch _mob_objects (INFO) headers are created with 0 stamp - I
         repeated here what the old code did, but we should check."""
         for dialog in self.id_records.values():
             dialog.set_stamp(self._grup_head.stamp)
-        return super().getSize()
+        super().dump(out)
 
 #------------------------------------------------------------------------------
 class CellRefs(_ChildrenGrup):
@@ -931,8 +962,9 @@ def get_num_headers(self):
 
     def dump(self, out):
         if any(self.iter_records(skip_flagged=False)):
-            self._write_header(out)
+            head_pos = self._write_header(out)
             super().dump(out)
+            self._patch_header(out, head_pos)
 
     def __repr__(self):
         s = []
@@ -986,28 +1018,17 @@ def get_num_headers(self, *, __get_cell=attrgetter_cache['master_record']):
             count += len(blocks_bsbs) + len({x1[0] for x1 in blocks_bsbs})
         return count
 
-    def getSize(self):
-        """Return the total size of the block, but also compute dictionaries
-        containing the sizes of the individual blocks/subblocks and the cell
-        ids every block contains."""
-        cell_blocks_size = 0
-        self._block_subblock_cells = defaultdict(lambda: defaultdict(list))
-        hsize = RecordHeader.rec_header_size
-        # Every subblock has one record header
-        self._block_subblock_sizes = defaultdict(
-            lambda: defaultdict(lambda: hsize))
-        for cell_rid, mob_cell in self.id_records.items():
-            block, subblock = mob_cell.master_record.getBsb()
-            self._block_subblock_sizes[block][subblock] += mob_cell.getSize()
-            self._block_subblock_cells[block][subblock].append(cell_rid)
-        # Every block has one record header
-        self._block_sizes = defaultdict(lambda: hsize)
-        # Sum sublock sizes to get the block size
-        for block, subs_sizes in self._block_subblock_cells.items():
-            bsize = sum(self._block_subblock_sizes[block].values())
-            self._block_sizes[block] += bsize # includes the sizes of headers
-            cell_blocks_size += self._block_sizes[block]
-        return cell_blocks_size
+    def getSize(self, *, __get_cell=attrgetter_cache['master_record']):
+        """Return the total size of the cell blocks, including their block and
+        subblock GRUP headers."""
+        cells_size = sum(r.getSize() for r in self.id_records.values())
+        if cells_size:
+            blocks_bsbs = {__get_cell(cell_block).getBsb() for cell_block in
+                           self.id_records.values()}
+            # 1 GRUP header for each separate subblock and one for every block
+            cells_size += RecordHeader.rec_header_size * (len(blocks_bsbs) +
+                len({x1[0] for x1 in blocks_bsbs}))
+        return cells_size
 
     def _load_rec_group(self, ins, end_pos):
         """Loads data from input stream. Called by load()."""
@@ -1038,28 +1059,36 @@ def _load_rec_group(self, ins, end_pos):
                                f'{self} group.')
 
     def _sort_group(self):
-        """First sort by the block they belong to, then by the CELL FormID."""
+        """Group the cell ids by the block and subblock they belong to, then
+        sort by block, subblock and CELL FormID."""
+        block_subblock_cells = defaultdict(lambda: defaultdict(list))
+        for cell_rid, mob_cell in self.id_records.items():
+            block, subblock = mob_cell.master_record.getBsb()
+            block_subblock_cells[block][subblock].append(cell_rid)
         self._block_subblock_cells = {
             block: {k: sorted(v) for k, v in dict_sort(subblock_dict)} for
-            (block, subblock_dict) in dict_sort(self._block_subblock_cells)}
+            (block, subblock_dict) in dict_sort(block_subblock_cells)}
 
     def _dump_group(self, out):
         """Dumps the cell blocks and their block and sub-block groups to
-        out."""
-        bsb_size = self._block_sizes
+        out, patching in the size of each group once it has been dumped."""
         # _ExteriorCells have no grup header - so what is stamp here?
         head_st = self._grup_head.stamp if self._grup_header_type else 0
         outWrite = out.write
-        for block, subs_sizes in self._block_subblock_cells.items():
+        outTell = out.tell
+        for block, subs_cells in self._block_subblock_cells.items():
             # Write the block header
-            outWrite(self._block_header_type(bsb_size[block], block,
-                self._block_type, head_st).pack_head())
-            subs_size = self._block_subblock_sizes[block]
-            for sub, mob_cells in subs_sizes.items():
-                outWrite(self._block_header_type(subs_size[sub], sub,
-                    self._subblock_type, head_st).pack_head())
+            block_pos = outTell()
+            outWrite(self._block_header_type(0, block, self._block_type,
+                                             head_st).pack_head())
+            for sub, mob_cells in subs_cells.items():
+                sub_pos = outTell()
+                outWrite(self._block_header_type(0, sub, self._subblock_type,
+                                                 head_st).pack_head())
                 for cfid in mob_cells:
                     self.id_records[cfid].dump(out)
+                _patch_grup_size(out, sub_pos)
+            _patch_grup_size(out, block_pos)
 
 #------------------------------------------------------------------------------
 class MobICells(MobCells):
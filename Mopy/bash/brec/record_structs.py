@@ -305,7 +305,10 @@ class HeaderFlags(bolt.Flags):
         # should_skip et al
         partial_form = False
 
-    def __init__(self, header, ins=None, *, do_unpack=True):
+    def __init__(self, header, ins=None, *, do_unpack=True,
+                 lazy_unpack=False):
+        """Read the record from ins, if specified. If do_unpack is False, only
+        read the data. lazy_unpack is only meaningful for MelRecord."""
         self.header = header # type: RecHeader
         self._rec_sig: bytes = header.recType
         self.fid: utils_constants.FormId = header.fid
@@ -324,7 +327,7 @@ def __init__(self, header, ins=None, *, do_unpack=True):
             ins_ins, ins_size = ins.ins, ins.size
             ins_debug_offset = ins.debug_offset
             try: # swap the wrapped io stream with our (decompressed) data
-                ins.ins, ins.size = self.getDecompressed()
+                ins.ins, ins.size = self.getDecompressed(ins, file_offset)
                 ins.debug_offset = ins_debug_offset + file_offset
                 self.loadData(ins, ins.size, file_offset=file_offset)
             finally: # restore the wrapped stream to read next record
@@ -379,13 +382,19 @@ def keep_fids(self, keep_plugins):
         element, items coming from mods not in keep_plugins will be removed
         from the list."""
 
-    def getDecompressed(self, *, __unpacker=int_unpacker):
+    def getDecompressed(self, ins=None, file_offset=None, *,
+                        __unpacker=int_unpacker):
         """Return (decompressed if necessary) record data wrapped in BytesIO.
-        Return also the length of the data."""
+        Return also the length of the data. If we are being loaded from ins,
+        file_offset is the offset of our data in it - use the data ins
+        decompressed ahead of time, if any (see ModReader.decompress_ahead)."""
         if not self.flags1.compressed:
             return io.BytesIO(self.data), len(self.data)
         decompressed_size, = __unpacker(self.data[:4])
-        decomp = zlib.decompress(self.data[4:])
+        if ins is None or (decomp := ins.take_decompressed(
+                file_offset)) is None:
+            # Slice a memoryview to avoid copying the compressed data first
+            decomp = zlib.decompress(memoryview(self.data)[4:])
         if len(decomp) != decompressed_size:
             raise exception.ModError(self.inName,
                 f'Mis-sized compressed data. Expected {decompressed_size}, '
@@ -513,15 +522,72 @@ class MelRecord(MreRecord):
     # The record attribute and flag name needed to find out if a piece of armor
     # is non-playable. Locations differ in TES4, FO3/FNV and TES5.
     not_playable_flag = ('flags1', 'not_playable')
+    # If not None, the record was read but not unpacked yet - see __getattr__
+    __slots__ = ('_lazy_ctx',)
 
-    def __init__(self, header, ins=None, *, do_unpack=True):
+    def __init__(self, header, ins=None, *, do_unpack=True,
+                 lazy_unpack=False):
         if self.__class__.rec_sig != header.recType:
             raise ValueError(f'Initialize {type(self)} with header.recType '
                              f'{header.recType}')
+        self._lazy_ctx = None
+        if ins and do_unpack and lazy_unpack:
+            # Read the data, but postpone setting defaults and unpacking it
+            # until one of our attributes is first accessed. We need to stash
+            # the FormId type and string table of the plugin we are read from
+            file_offset = ins.tell()
+            MreRecord.__init__(self, header, ins, do_unpack=False)
+            self._lazy_ctx = (utils_constants.FORM_ID,
+                              ins.strings if ins.hasStrings else None,
+                              file_offset)
+            return
         for element in self.__class__.melSet.elements:
             element.setDefault(self)
         MreRecord.__init__(self, header, ins, do_unpack=do_unpack)
 
+    def __getattr__(self, attr_name):
+        """Only called if attr_name was not found - if we were read lazily,
+        unpack our data and try again."""
+        if attr_name != '_lazy_ctx' and self._lazy_ctx is not None:
+            self._unpack_lazy()
+            return getattr(self, attr_name)
+        raise AttributeError(f'{type(self).__name__!r} object has no '
+                             f'attribute {attr_name!r}')
+
+    def __getstate__(self):
+        # copy.deepcopy (see getTypeCopy) must not copy a lazy record as is
+        if self._lazy_ctx is not None:
+            self._unpack_lazy()
+        return super().__getstate__()
+
+    def _unpack_lazy(self):
+        """Set defaults and unpack the data of a lazily read record, as
+        MreRecord.__init__ would have done. Attributes that were assigned to
+        before this point keep their assigned values."""
+        form_id_type, string_table, file_offset = self._lazy_ctx
+        self._lazy_ctx = None
+        already_set = {}
+        for attr_name in type(self).__slots__:
+            try:
+                already_set[attr_name] = object.__getattribute__(self,
+                                                                 attr_name)
+            except AttributeError:
+                pass
+        for element in self.__class__.melSet.elements:
+            element.setDefault(self)
+        # The reader context of our plugin is long gone, so set its FormId
+        # type for the duration of the unpacking
+        prev_form_id_type = utils_constants.FORM_ID
+        utils_constants.FORM_ID = form_id_type
+        try:
+            ins = ModReader(self.inName, *self.getDecompressed())
+            ins.setStringTable(string_table)
+            self.loadData(ins, ins.size, file_offset=file_offset)
+        finally:
+            utils_constants.FORM_ID = prev_form_id_type
+        for attr_name, attr_val in already_set.items():
+            setattr(self, attr_name, attr_val)
+
     def getTypeCopy(self):
         """Return a copy of self - we must be loaded, data will be discarded"""
         myCopy = copy.deepcopy(self)
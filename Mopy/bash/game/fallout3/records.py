@@ -42,7 +42,7 @@
     MelIpctSounds, MelIpctTextureSets, MelLandShared, MelLighFade, MelLists, \
     MelLLChanceNone, MelLLFlags, MelLLGlobal, MelLscrLocations, MelNoteType, \
     MelLtexGrasses, MelLtexSnam, MelMapMarker, MelMODS, MelNodeIndex, \
-    MelNull, MelObject, MelOwnership, MelPartialCounter, MelMesgSharedFo3, \
+    MelNull, MelOwnership, MelPartialCounter, MelMesgSharedFo3, \
     MelPerkData, MelPerkParamsGroups, MelRace, MelRaceData, MelRaceParts, \
     MelRaceVoices, MelReadOnly, MelRef3D, MelReferences, MelMgefEsce, \
     MelReflectedRefractedBy, MelRefScale, MelRegions, MelRegnEntrySubrecord, \
@@ -3319,13 +3319,12 @@ def load_mel(self, record, ins, sub_type, size_, *debug_strs):
             # Copied and adjusted from MelArray. Yuck. See comment below
             # docstring for some ideas for getting rid of this
             append_entry = getattr(record, self.attr).append
-            entry_slots = self._element_old.attrs
+            new_entry = self._entry_type # same attrs as _element_old
             entry_size = struct_calcsize(u'3Bs3Bs3Bs3Bs')
             load_entry = self._element_old.load_mel
             for x in range(size_ // entry_size):
-                arr_entry = MelObject()
+                arr_entry = new_entry()
                 append_entry(arr_entry)
-                arr_entry.__slots__ = entry_slots
                 load_entry(arr_entry, ins, sub_type, entry_size, *debug_strs)
         else:
             _expected_sizes = (self._new_sizes[sub_type],
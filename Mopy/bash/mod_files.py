@@ -23,14 +23,20 @@
 """This module houses the entry point for reading and writing plugin files
 through PBash (LoadFactory + ModFile) as well as some related classes."""
 
-from collections import defaultdict
+import io
+import os
+import pickle
+from array import array
+from collections import defaultdict, deque
 from collections.abc import Iterable
+from weakref import WeakKeyDictionary
+from concurrent.futures import ThreadPoolExecutor
 from zlib import decompress as zlib_decompress
 from zlib import error as zlib_error
 
 from . import bolt, bush, env
 from .bolt import MasterSet, SubProgress, decoder, deprint, sig_to_str, \
-    struct_error, GPath_no_norm, FName, unpack_int
+    struct_error, GPath_no_norm, FName, unpack_int, structs_cache
 # first import of brec for games with patchers - _dynamic_import_modules
 from .brec import ZERO_FID, FastModReader, FormIdReadContext, \
     FormIdWriteContext, MobBase, ModReader, MreRecord, RecHeader, \
@@ -39,6 +45,14 @@
 from .exception import MasterMapError, ModError, ModReadError, StateError
 from .wbtemp import TempFile
 
+# Number of plugins whose bytes we read ahead of the one being processed
+_PREFETCH_WORKERS = 4
+# Maximum total size of the plugins we read ahead, so that a few big masters
+# do not all sit in memory at once
+_PREFETCH_MAX_BYTES = 256 * 1024 * 1024
+# Default maximum total size of the entries of a ParsedPluginCache
+_PLUGIN_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
 class MasterMap(object):
     """Serves as a map between two sets of masters. Only returns FormId
     classes, but accepts both FormIds and short FormIDs (ints) -
@@ -76,15 +90,21 @@ class LoadFactory:
     """Encapsulate info on which record type we use to load which record
     signature."""
     grup_class = {} # map top record group signatures to class loading them
-    __slots__ = ('keepAll', 'topTypes', 'sig_to_type', 'all_sigs')
+    __slots__ = ('keepAll', 'topTypes', 'sig_to_type', 'all_sigs',
+                 'lazy_unpack')
 
     def __init__(self, keepAll, *, by_sig: Iterable[bytes] = (),
-                 generic: Iterable[bytes] = ()):
+                 generic: Iterable[bytes] = (), lazy_unpack=False):
         """Pass a collection of signatures to load - either by their
         respective type or using generic MreRecord.
         :param by_sig: pass an iterable of top group signatures to unpack
-        :param generic: top group signatures to load as generic MreRecord"""
+        :param generic: top group signatures to load as generic MreRecord
+        :param lazy_unpack: if True, records are only unpacked when one of
+            their attributes is first accessed - note that this means errors
+            in the record data will be raised at that point and not while
+            loading the plugin"""
         self.keepAll = keepAll
+        self.lazy_unpack = lazy_unpack
         self.topTypes = set()
         self.sig_to_type = defaultdict(lambda: MreRecord if keepAll else None)
         self.all_sigs = set()
@@ -146,6 +166,41 @@ def __missing__(self, top_grup_sig):
                                                 top_grup_sig)
         return self[top_grup_sig]
 
+def _read_plugin_bytes(mod_info):
+    """Read the whole plugin into memory - returns None if that fails, in
+    which case the consumer will retry and raise as usual."""
+    try:
+        with mod_info.abs_path.open('rb') as ins:
+            return ins.read()
+    except OSError:
+        return None
+
+def iter_plugin_bytes(mod_infos):
+    """Yield the contents of each of the specified plugins, in order. A
+    thread pool reads the next few plugins from disk while the current one is
+    being processed on the main thread - if reading a plugin fails, yield
+    None, letting the consumer read the file itself."""
+    pending = deque()
+    pending_size = 0
+    executor = ThreadPoolExecutor(max_workers=_PREFETCH_WORKERS)
+    try:
+        # Keep a bounded window of reads in flight to cap memory use, both in
+        # number of plugins and in bytes - a plugin bigger than the byte cap
+        # is read on its own
+        for minf in mod_infos:
+            while pending and (len(pending) > _PREFETCH_WORKERS or
+                               pending_size + minf.fsize > _PREFETCH_MAX_BYTES):
+                read_future, read_size = pending.popleft()
+                pending_size -= read_size
+                yield read_future.result()
+            pending.append((executor.submit(_read_plugin_bytes, minf),
+                            minf.fsize))
+            pending_size += minf.fsize
+        while pending:
+            yield pending.popleft()[0].result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
 class ModFile(object):
     """Plugin file representation. Will load only the top record types
     specified in its LoadFactory."""
@@ -162,18 +217,28 @@ def __init__(self, fileInfo,loadFactory=None):
         self.topsSkipped = set() #--Types skipped
 
     def load_plugin(self, progress=None, loadStrings=True, catch_errors=True,
-                    do_map_fids=True):
+                    do_map_fids=True, *, plugin_bytes=None,
+                    decompress_ahead=True):
         ##: track uses and decide on exception handling
-        """Load file."""
+        """Load file. If plugin_bytes is specified, it must be the full
+        contents of the plugin - see ModReader.from_info. If decompress_ahead
+        is True, compressed records are decompressed in a thread pool ahead
+        of being unpacked - see ModReader.decompress_ahead."""
         progress = progress or bolt.Progress()
         progress.setFull(1.0)
         cont = FormIdReadContext if do_map_fids else ModReader
-        with cont.from_info(self.fileInfo) as ins:
+        with cont.from_info(self.fileInfo, plugin_bytes,
+                            map_file=True) as ins:
             if not do_map_fids: # hacky - only used for Mod_RecalcRecordCounts
                 ins.load_tes4(do_unpack_tes4=False)
             self.tes4 = ins.plugin_header
             if do_map_fids:
                 progress = self.__load_strs(ins, loadStrings, progress)
+                # Lazily unpacked records only decompress on first access
+                if decompress_ahead and not self.loadFactory.lazy_unpack:
+                    ins.decompress_ahead(self.loadFactory.topTypes, {
+                        s for s, t in self.loadFactory.sig_to_type.items()
+                        if t is not None and t is not MreRecord})
             #--Raw data read
             progress.setFull(ins.size)
             insAtEnd = ins.atEnd
@@ -274,11 +339,14 @@ def save(self,outPath=None):
                                        for block in self.tops.values())
             self.tes4.getSize()
             self.tes4.dump(out)
-            #--Blocks
+            #--Blocks - each is dumped to memory first, so that the sizes of
+            # its groups can be patched in after their contents were written
             selfTops = self.tops
             for rsig in bush.game.top_groups:
                 if rsig in selfTops:
-                    selfTops[rsig].dump(out)
+                    top_out = io.BytesIO()
+                    selfTops[rsig].dump(top_out)
+                    out.write(top_out.getbuffer())
 
     def augmented_masters(self):
         """List of plugin masters with the plugin's own name appended."""
@@ -379,45 +447,400 @@ def create_record(self, new_rec_sig: bytes, new_rec_fid: FormId = None, *,
         self.tops[new_rec_sig].setRecord(new_rec, do_copy=False)
         return new_rec
 
+#------------------------------------------------------------------------------
+class ParsedPluginCache:
+    """Stores what ModFile.load_plugin needs of each plugin on disk, one file
+    per plugin: the raw bytes of its header record and of the top groups its
+    LoadFactory loads, which are parsed again on load - skipping the rest of
+    the plugin. Entries are thus at most as big as their plugin and, with
+    LazyRecordUnpacking enabled, records are only decoded when a patcher
+    needs them. Each entry is keyed by the size, modification time and CRC
+    of the plugin, the record types its LoadFactory loaded and whatever
+    key_extra the caller specifies (e.g. the Wrye Bash version) - any
+    difference means the entry is stale and the plugin is read (and the
+    entry replaced). The least recently used entries are dropped once the
+    cache grows past max_bytes, see prune."""
+    _cache_ext = '.tops'
+
+    def __init__(self, cache_dir, key_extra=(), *,
+                 max_bytes=_PLUGIN_CACHE_MAX_BYTES):
+        self._cache_dir = cache_dir
+        self._key_extra = tuple(key_extra)
+        self._max_bytes = max_bytes
+
+    def _plugin_key(self, mod_info):
+        return (*self._key_extra, mod_info.fsize, mod_info.ftime,
+                mod_info.calculate_crc()[0])
+
+    def _cache_key(self, mod_info, load_factory):
+        loaded_types = sorted((s, t.__name__) for s, t in
+                              load_factory.sig_to_type.items() if t)
+        return self._plugin_key(mod_info), (load_factory.keepAll,
+                                            tuple(loaded_types))
+
+    def _cache_path(self, mod_info):
+        return self._cache_dir.join(mod_info.fn_key + self._cache_ext)
+
+    def has_entry(self, mod_info):
+        """Return True if there is an entry for the current version of
+        mod_info, reading only its key. Loading it will still fail if the
+        LoadFactory loads other record types than when it was stored."""
+        try:
+            with self._cache_path(mod_info).open('rb') as ins:
+                return pickle.load(ins)[0] == self._plugin_key(mod_info)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                ImportError, TypeError, ValueError, IndexError):
+            return False
+
+    def load(self, mod_info, load_factory, progress=None):
+        """Return a ModFile for mod_info loaded from the cache, or None if
+        there is no up-to-date entry for it."""
+        cache_path = self._cache_path(mod_info)
+        try:
+            with cache_path.open('rb') as ins:
+                if pickle.load(ins) != self._cache_key(mod_info,
+                                                       load_factory):
+                    return None
+                tops_skipped = pickle.load(ins)
+                entry_bytes = ins.read()
+            os.utime(cache_path.s) # mark it as recently used, see prune
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                ImportError, TypeError, ValueError):
+            deprint(f'Failed to read cached data for {mod_info}',
+                    traceback=True)
+            return None
+        mod_file = ModFile(mod_info, load_factory)
+        mod_file.load_plugin(progress, plugin_bytes=entry_bytes)
+        mod_file.topsSkipped = tops_skipped
+        return mod_file
+
+    def prune(self, keep_plugins):
+        """Delete the entries of all plugins that are not in keep_plugins,
+        then the least recently used entries until the cache fits in
+        max_bytes."""
+        cache_ext = self._cache_ext
+        entries = []
+        for cache_fname in self._cache_dir.ilist():
+            if cache_fname.fn_ext != cache_ext: continue
+            cache_path = self._cache_dir.join(cache_fname)
+            if cache_fname.fn_body not in keep_plugins:
+                cache_path.remove()
+                continue
+            try:
+                entry_size, entry_mtime = cache_path.size_mtime()
+            except OSError:
+                continue
+            entries.append((entry_mtime, entry_size, cache_path))
+        cache_size = sum(e[1] for e in entries)
+        for _mtime, entry_size, cache_path in sorted(entries,
+                                                     key=lambda e: e[0]):
+            if cache_size <= self._max_bytes: break
+            cache_path.remove()
+            cache_size -= entry_size
+
+    def store(self, mod_file, plugin_bytes=None):
+        """Cache the parts of the plugin the specified freshly loaded ModFile
+        was loaded from. If the caller has already read the plugin, it may
+        pass its contents as plugin_bytes. Plugins bigger than the whole
+        cache are not cached."""
+        mod_info = mod_file.fileInfo
+        if mod_info.fsize > self._max_bytes: return
+        cache_path = self._cache_path(mod_info)
+        try:
+            if plugin_bytes is None:
+                with mod_info.abs_path.open('rb') as ins:
+                    plugin_bytes = ins.read()
+            self._cache_dir.makedirs()
+            with TempFile() as tmp_cache:
+                with open(tmp_cache, 'wb') as out:
+                    pickle.dump(self._cache_key(mod_info,
+                        mod_file.loadFactory), out, pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(mod_file.topsSkipped, out,
+                                pickle.HIGHEST_PROTOCOL)
+                    plugin_view = memoryview(plugin_bytes)
+                    for start, end in self._loaded_ranges(plugin_bytes,
+                                                          mod_file.tops):
+                        out.write(plugin_view[start:end])
+                cache_path.replace_with_temp(tmp_cache)
+        except (OSError, pickle.PicklingError, struct_error):
+            deprint(f'Failed to cache data for {mod_info}', traceback=True)
+            cache_path.remove()
+
+    @staticmethod
+    def _loaded_ranges(plugin_bytes, loaded_sigs, *, __rh=RecordHeader):
+        """Yield the start and end offsets of the plugin header record and
+        of the top groups with a label in loaded_sigs in plugin_bytes."""
+        unpack_from = structs_cache[__rh.rec_pack_format_str].unpack_from
+        hsize = __rh.rec_header_size
+        _tes4_sig, tes4_size, *_rest = unpack_from(plugin_bytes)
+        yield 0, (pos := hsize + tes4_size)
+        plugin_size = len(plugin_bytes)
+        while pos < plugin_size:
+            # The size of a group includes its header
+            _grup_sig, grup_size, *_rest = unpack_from(plugin_bytes, pos)
+            if plugin_bytes[pos + 8:pos + 12] in loaded_sigs:
+                yield pos, pos + grup_size
+            pos += grup_size
+
+class RecordDirectory:
+    """An index of all the records in a plugin, built by a single pass over
+    its headers. For every record it holds the signature, short FormID,
+    flags, position of the record header in the file and size of the record
+    data, along with the label of the top group and the type of the innermost
+    group the record sits in (None for the plugin header record), plus the
+    labels of the top groups in the order they appear in. The columns are
+    stored in arrays to keep the directories of big masters small.
+    Directories are cached for as long as the file info of their plugin is
+    alive and only rebuilt if the size, modification or creation time of the
+    plugin changes."""
+    _dir_cache: WeakKeyDictionary = WeakKeyDictionary()
+
+    def __init__(self):
+        # All signatures (record and top group) we met, the sig columns hold
+        # indices into this list - None stands for 'no top group' (TES4)
+        self._sigs = [None]
+        self.rec_sigs = array('H')
+        self.short_fids = array('I')
+        self.flags1 = array('I')
+        self.rec_positions = array('Q')
+        self.blob_sizes = array('I')
+        self.top_sigs = array('H')
+        self.group_types = array('b')
+        self.top_grup_labels = []
+
+    @classmethod
+    def from_info(cls, mod_info, plugin_bytes=None):
+        """Return the directory of the plugin mod_info points to, building it
+        if it is not cached or the plugin changed. If the caller has already
+        read the plugin, it may pass its contents as plugin_bytes."""
+        if (rec_dir := cls.cached(mod_info)) is not None:
+            return rec_dir
+        rec_dir = cls()
+        try:
+            if plugin_bytes is None:
+                with mod_info.abs_path.open('rb') as ins:
+                    plugin_bytes = ins.read()
+        except OSError as e:
+            raise ModError(mod_info.fn_key, f'Error scanning {mod_info}\n'
+                                            f'Caused by: {e!r}') from e
+        rec_dir._scan(mod_info, plugin_bytes)
+        cls._dir_cache[mod_info] = cls._dir_stamp(mod_info), rec_dir
+        return rec_dir
+
+    @classmethod
+    def cached(cls, mod_info):
+        """Return the cached directory of the plugin mod_info points to, or
+        None if it is not cached or the plugin changed."""
+        try:
+            cached_stamp, rec_dir = cls._dir_cache[mod_info]
+        except KeyError:
+            return None
+        return rec_dir if cached_stamp == cls._dir_stamp(mod_info) else None
+
+    @staticmethod
+    def _dir_stamp(mod_info):
+        # Same as what FileInfo._file_changed checks
+        return mod_info.fsize, mod_info.ftime, mod_info.ctime
+
+    @staticmethod
+    def iter_short_fids(mod_info, plugin_bytes=None, *, __rh=RecordHeader):
+        """Yield the short FormIDs of the records in the specified plugin, in
+        file order, reading only their headers. Unlike from_info, this does
+        not read the whole plugin, so it is cheap to stop early."""
+        unpack = structs_cache[__rh.rec_pack_format_str].unpack
+        hsize = __rh.rec_header_size
+        try:
+            with (mod_info.abs_path.open('rb') if plugin_bytes is None else
+                  io.BytesIO(plugin_bytes)) as ins:
+                ins_read = ins.read
+                ins_seek = ins.seek
+                while header_bytes := ins_read(hsize):
+                    rec_sig, blob_size, _flags, short_fid, *_rest = unpack(
+                        header_bytes)
+                    # Skip GRUPs themselves, only process their records
+                    if rec_sig != b'GRUP':
+                        yield short_fid
+                        ins_seek(blob_size, 1)
+        except (OSError, struct_error) as e:
+            raise ModError(mod_info.fn_key, f'Error scanning {mod_info}\n'
+                                            f'Caused by: {e!r}') from e
+
+    def _scan(self, mod_info, plugin_bytes, *, __rh=RecordHeader):
+        unpack_from = structs_cache[__rh.rec_pack_format_str].unpack_from
+        valid_sigs = __rh.valid_record_sigs
+        top_grup_sigs = __rh.top_grup_sigs
+        hsize = __rh.rec_header_size
+        sig_dexes = {}
+        def _sig_dex(rec_sig):
+            try:
+                return sig_dexes[rec_sig]
+            except KeyError:
+                sig_dexes[rec_sig] = dex = len(self._sigs)
+                self._sigs.append(rec_sig)
+                return dex
+        # Columns, avoid the dot lookups in the loop
+        add_sig = self.rec_sigs.append
+        add_fid = self.short_fids.append
+        add_flags = self.flags1.append
+        add_pos = self.rec_positions.append
+        add_size = self.blob_sizes.append
+        add_top = self.top_sigs.append
+        add_group_type = self.group_types.append
+        add_top_label = self.top_grup_labels.append
+        # Stack of (end position, group type) of the groups we are in
+        open_groups = []
+        top_dex = 0
+        buf_end = len(plugin_bytes)
+        rec_pos = 0
+        try:
+            while rec_pos != buf_end:
+                while open_groups and rec_pos >= open_groups[-1][0]:
+                    open_groups.pop()
+                if rec_pos + hsize > buf_end:
+                    raise ModReadError(mod_info.fn_key, 'REC_HEADER',
+                                       rec_pos + hsize, buf_end)
+                rec_sig, blob_size, uint0, uint1, *_rest = unpack_from(
+                    plugin_bytes, rec_pos)
+                if rec_sig == b'GRUP':
+                    if uint1 == 0: # top group, uint0 is its label
+                        try:
+                            top_label = top_grup_sigs[uint0]
+                        except KeyError:
+                            raise ModError(mod_info.fn_key,
+                                f'Bad Top GRUP type: {sig_to_str(uint0)}')
+                        top_dex = _sig_dex(top_label)
+                        add_top_label(top_label)
+                    # blob_size is the group size, including this header
+                    open_groups.append((rec_pos + blob_size, uint1))
+                    rec_pos += hsize
+                    continue
+                if rec_sig not in valid_sigs:
+                    raise ModError(mod_info.fn_key,
+                                   f'Bad header signature: '
+                                   f'{sig_to_str(rec_sig)}')
+                next_pos = rec_pos + hsize + blob_size
+                if next_pos > buf_end:
+                    raise ModReadError(mod_info.fn_key, rec_sig, next_pos,
+                                       buf_end)
+                add_sig(_sig_dex(rec_sig))
+                add_fid(uint1)
+                add_flags(uint0)
+                add_pos(rec_pos)
+                add_size(blob_size)
+                add_top(top_dex)
+                add_group_type(open_groups[-1][1] if open_groups else -1)
+                rec_pos = next_pos
+        except struct_error as e:
+            raise ModError(mod_info.fn_key, f'Error scanning {mod_info}, '
+                f'file read pos: {rec_pos:d}\nCaused by: {e!r}') from e
+
+    def __len__(self):
+        return len(self.short_fids)
+
+    def iter_records(self):
+        """Yield a (record signature, short FormID, flags, record position,
+        record data size, top group signature, innermost group type) tuple
+        for every record in the plugin, in file order. The group type is
+        None for the plugin header record."""
+        sigs = self._sigs
+        for sig_dex, short_fid, rec_flags, rec_pos, blob_size, top_dex, \
+                group_type in zip(self.rec_sigs, self.short_fids, self.flags1,
+                                  self.rec_positions, self.blob_sizes,
+                                  self.top_sigs, self.group_types):
+            yield (sigs[sig_dex], short_fid, rec_flags, rec_pos, blob_size,
+                   sigs[top_dex], None if group_type < 0 else group_type)
+
+    @staticmethod
+    def read_headers(mod_info, rec_positions, ins=None):
+        """Seek to each of the specified record positions and read the
+        record header there. If ins is specified, leaves it positioned at
+        the start of the record data after each header is yielded."""
+        if ins is None:
+            with FormIdReadContext.from_info(mod_info) as ins:
+                yield from RecordDirectory.read_headers(mod_info,
+                                                        rec_positions, ins)
+            return
+        ins_seek = ins.seek
+        for rec_pos in rec_positions:
+            ins_seek(rec_pos)
+            yield unpack_header(ins)
+
 # Typing for ModHeaderReader below
 _ModDataDict = defaultdict[bytes, list[tuple[RecHeader, str]]]
 
 # TODO(inf) Use this for a bunch of stuff in mods_metadata.py (e.g. UDRs)
 class ModHeaderReader(object):
     """Allows very fast reading of a plugin's headers, skipping reading and
-    decoding of anything but the headers."""
+    decoding of anything but the headers. All of these go through the
+    plugin's RecordDirectory, so the plugin's headers are only scanned once
+    for as long as it does not change."""
     @staticmethod
-    def _scan_fids(mod_info, fid_cond):
-        with ModReader.from_info(mod_info) as ins:
-            try:
-                while not ins.atEnd():
-                    next_header = unpack_header(ins)
-                    # Skip GRUPs themselves, only process their records
-                    if next_header.recType != b'GRUP':
-                        if fid_cond(next_header.fid):
-                            return True
-                        next_header.skip_blob(ins)
-            except (OSError, struct_error) as e:
-                raise ModError(ins.inName, f"Error scanning {mod_info}, file "
-                    f"read pos: {ins.tell():d}\nCaused by: '{e!r}'")
-        return False
+    def _scan_fids(mod_info, fid_cond, plugin_bytes):
+        # Without a cached directory, stream over the headers instead of
+        # building one - we can usually stop at one of the first records
+        if (rec_dir := RecordDirectory.cached(mod_info)) is not None:
+            short_fids = rec_dir.short_fids
+        else:
+            short_fids = RecordDirectory.iter_short_fids(mod_info,
+                                                         plugin_bytes)
+        return any(map(fid_cond, short_fids))
 
     @staticmethod
-    def formids_in_esl_range(mod_info):
-        """Checks if all FormIDs in the specified mod are in the ESL range."""
+    def formids_in_esl_range(mod_info, plugin_bytes=None):
+        """Checks if all FormIDs in the specified mod are in the ESL range.
+        See RecordDirectory.iter_short_fids for plugin_bytes."""
         num_masters = len(mod_info.masterNames)
         return not ModHeaderReader._scan_fids(mod_info,
-            lambda header_fid: header_fid.mod_dex >= num_masters and
-                               header_fid.object_dex > 0xFFF)
+            lambda short_fid: short_fid >> 24 >= num_masters and
+                              short_fid & 0xFFFFFF > 0xFFF, plugin_bytes)
 
     @staticmethod
-    def has_new_records(mod_info):
-        """Checks if all the specified mod has any new records."""
+    def has_new_records(mod_info, plugin_bytes=None):
+        """Checks if all the specified mod has any new records. See
+        RecordDirectory.iter_short_fids for plugin_bytes."""
         num_masters = len(mod_info.masterNames)
         # Check for NULL to skip the main file header (i.e. TES3/TES4)
         return ModHeaderReader._scan_fids(mod_info,
-            lambda header_fid: not header_fid.is_null() and
-                               header_fid.mod_dex >= num_masters)
+            lambda short_fid: short_fid & 0xFFFFFF and
+                              short_fid >> 24 >= num_masters, plugin_bytes)
+
+    @staticmethod
+    def scan_top_groups(mod_info, load_f: LoadFactory, stop_at_new=False,
+                        plugin_bytes=None):
+        """Scan the headers of the specified mod to find out what loading it
+        with load_f would give, without reading any record data. Returns the
+        labels of the top groups load_f would load and of those it would
+        skip, plus the labels of the loaded top groups that hold new records
+        which are not deleted or ignored, in the order they appear in. If
+        stop_at_new is True, stop at the first such top group. See
+        RecordDirectory.from_info for plugin_bytes."""
+        rec_dir = RecordDirectory.from_info(mod_info, plugin_bytes)
+        top_types = load_f.topTypes
+        loaded_tops, skipped_tops = [], set()
+        for top_label in rec_dir.top_grup_labels:
+            if top_label in top_types:
+                if top_label not in loaded_tops: loaded_tops.append(top_label)
+            else:
+                skipped_tops.add(top_label)
+        num_masters = len(mod_info.masterNames)
+        rec_types = load_f.sig_to_type
+        sig_to_class = RecordType.sig_to_class
+        new_rec_tops = []
+        for rec_sig, short_fid, rec_flags, _pos, _size, top_label, _gt in \
+                rec_dir.iter_records():
+            if (short_fid >> 24 < num_masters or top_label not in top_types
+                    or top_label in new_rec_tops or
+                    rec_types.get(rec_sig) is None):
+                continue
+            # Mirrors MreRecord.should_skip
+            flags1 = sig_to_class[rec_sig].HeaderFlags(rec_flags)
+            if flags1.ignored or flags1.deleted or flags1.partial_form:
+                continue
+            new_rec_tops.append(top_label)
+            if stop_at_new: break
+        return loaded_tops, skipped_tops, new_rec_tops
 
     @staticmethod
     def extract_mod_data(mod_info, progress) -> _ModDataDict:
@@ -444,10 +867,10 @@ def extract_mod_data(mod_info, progress) -> _ModDataDict:
             'loading_plugin': plugin_fn}
         # Where we'll store all the collected record data
         group_records: _ModDataDict = defaultdict(list)
-        # The current top GRUP label - starts out as TES4/TES3
-        tg_label = bush.game.Esp.plugin_header_sig
+        # The current top GRUP label - None for the TES4/TES3 record
+        tg_label = None
         # The list we'll use to store records from the current top GRUP
-        record_list = group_records[tg_label]
+        record_list = None
         ##: Uncomment these variables and the block below that uses them once
         # all of FO4's record classes have been written
         # The record types that can even contain EDIDs
@@ -457,85 +880,77 @@ def extract_mod_data(mod_info, progress) -> _ModDataDict:
         #skip_eids = tg_label not in records_with_eids
         with mod_info.abs_path.open(u'rb') as ins:
             initial_bytes = ins.read()
+        rec_dir = RecordDirectory.from_info(mod_info, initial_bytes)
         with FastModReader(plugin_fn, initial_bytes) as ins:
-            ins_tell = ins.tell
             ins_seek = ins.seek
             ins_read = ins.read
-            ins_size = ins.size
-            while ins_tell() != ins_size:
-                # Unpack the headers - these can be either GRUPs or regular
-                # records
-                next_header = unpack_header(ins)
-                _rsig = next_header.recType
-                if _rsig == b'GRUP':
-                    # Nothing special to do for non-top GRUPs
-                    if not next_header.is_top_group_header: continue
-                    tg_label = next_header.label
-                    progress(ins_tell() / mod_info.fsize,
+            # Only visit the records, the directory knows where they are
+            for _rsig, _fid, _flags, rec_pos, _siz, top_sig, _gt in \
+                    rec_dir.iter_records():
+                if top_sig is None: continue # skip TES4 record
+                if top_sig != tg_label:
+                    tg_label = top_sig
+                    progress(rec_pos / mod_info.fsize,
                              f'{main_progress_msg}\n{sig_to_str(tg_label)}')
                     record_list = group_records[tg_label]
                 #     skip_eids = tg_label not in records_with_eids
-                # elif skip_eids:
+                # if skip_eids:
                 #     # This record type has no EDIDs, skip directly to the next
-                #     # record (can't use skip_blob because that passes
-                #     # debug_strs to seek()...)
+                #     # record
                 #     record_list.append((next_header, ''))
-                #     ins_seek(ins_tell() + next_header.blob_size)
+                #     continue
+                ins_seek(rec_pos)
+                next_header = unpack_header(ins)
+                # This is a regular record, look for the EDID subrecord
+                eid = ''
+                blob_siz = next_header.blob_size
+                if next_header.flags1 & 0x00040000: # 'compressed' flag
+                    size_check = unpack_int(ins)
+                    try:
+                        new_rec_data = zlib_decompress(ins_read(
+                            blob_siz - 4))
+                    except zlib_error:
+                        if plugin_fn == 'FalloutNV.esm':
+                            # Yep, FalloutNV.esm has a record with broken
+                            # zlib data. Just skip it.
+                            continue
+                        raise
+                    if len(new_rec_data) != size_check:
+                        raise ModError(ins.inName,
+                            f'Mis-sized compressed data. Expected '
+                            f'{size_check}, got {len(new_rec_data)}.')
                 else:
-                    # This is a regular record, look for the EDID subrecord
-                    eid = ''
-                    blob_siz = next_header.blob_size
-                    next_record = ins_tell() + blob_siz
-                    if next_header.flags1 & 0x00040000: # 'compressed' flag
-                        size_check = unpack_int(ins)
-                        try:
-                            new_rec_data = zlib_decompress(ins_read(
-                                blob_siz - 4))
-                        except zlib_error:
-                            if plugin_fn == 'FalloutNV.esm':
-                                # Yep, FalloutNV.esm has a record with broken
-                                # zlib data. Just skip it.
-                                ins_seek(next_record)
-                                continue
-                            raise
-                        if len(new_rec_data) != size_check:
-                            raise ModError(ins.inName,
-                                f'Mis-sized compressed data. Expected '
-                                f'{size_check}, got {len(new_rec_data)}.')
+                    new_rec_data = ins_read(blob_siz)
+                fmr = FastModReader(plugin_fn, new_rec_data)
+                fmr_seek = fmr.seek
+                fmr_read = fmr.read
+                fmr_tell = fmr.tell
+                fmr_size = fmr.size
+                while fmr_tell() != fmr_size:
+                    # Inlined from unpackSubHeader & FastModReader.unpack
+                    read_data = fmr_read(sh_size)
+                    if len(read_data) != sh_size:
+                        raise ModReadError(
+                            plugin_fn, [_rsig, 'SUB_HEAD'],
+                            fmr_tell() - len(read_data), fmr_size)
+                    mel_sig, mel_size = sh_unpack(read_data)
+                    # Extended storage - very rare, so don't optimize
+                    # inlines etc. for it
+                    if mel_sig == b'XXXX':
+                        # Throw away size here (always == 0)
+                        mel_size = fmr.unpack(int_unpacker, 4, _rsig,
+                                              'XXXX.SIZE')[0]
+                        mel_sig = fmr.unpack(sh_unpack, sh_size, _rsig,
+                                             'XXXX.TYPE')[0]
+                    if mel_sig == b'EDID':
+                        # No need to worry about newlines, these are Editor
+                        # IDs and so won't contain any
+                        eid = decoder(fmr_read(mel_size).rstrip(null1),
+                                      wanted_encoding, avoided_encodings)
+                        break
                     else:
-                        new_rec_data = ins_read(blob_siz)
-                    fmr = FastModReader(plugin_fn, new_rec_data)
-                    fmr_seek = fmr.seek
-                    fmr_read = fmr.read
-                    fmr_tell = fmr.tell
-                    fmr_size = fmr.size
-                    while fmr_tell() != fmr_size:
-                        # Inlined from unpackSubHeader & FastModReader.unpack
-                        read_data = fmr_read(sh_size)
-                        if len(read_data) != sh_size:
-                            raise ModReadError(
-                                plugin_fn, [_rsig, 'SUB_HEAD'],
-                                fmr_tell() - len(read_data), fmr_size)
-                        mel_sig, mel_size = sh_unpack(read_data)
-                        # Extended storage - very rare, so don't optimize
-                        # inlines etc. for it
-                        if mel_sig == b'XXXX':
-                            # Throw away size here (always == 0)
-                            mel_size = fmr.unpack(int_unpacker, 4, _rsig,
-                                                  'XXXX.SIZE')[0]
-                            mel_sig = fmr.unpack(sh_unpack, sh_size, _rsig,
-                                                 'XXXX.TYPE')[0]
-                        if mel_sig == b'EDID':
-                            # No need to worry about newlines, these are Editor
-                            # IDs and so won't contain any
-                            eid = decoder(fmr_read(mel_size).rstrip(null1),
-                                          wanted_encoding, avoided_encodings)
-                            break
-                        else:
-                            fmr_seek(mel_size, 1)
-                    record_list.append((next_header, eid))
-                    ins_seek(next_record) # we may have break'd at EDID
-        del group_records[bush.game.Esp.plugin_header_sig] # skip TES4 record
+                        fmr_seek(mel_size, 1)
+                record_list.append((next_header, eid))
         return group_records
 
     ##: The methods above have to be very fast, but this one can afford to be
@@ -544,39 +959,21 @@ def extract_mod_data(mod_info, progress) -> _ModDataDict:
     def read_temp_child_headers(mod_info) -> list[RecHeader]:
         """Reads the headers of all temporary CELL chilren in the specified mod
         and returns them as a list. Used for determining FO3/FNV/TES5 ONAM."""
-        ret_headers = []
         # We want to read only the children of these, so skip their tops
         interested_sigs = {b'CELL', b'WRLD'}
         tops_to_skip = interested_sigs | {bush.game.Esp.plugin_header_sig}
-        with FormIdReadContext.from_info(mod_info) as ins:
-            ins_at_end = ins.atEnd
-            try:
-                while not ins_at_end():
-                    next_header = unpack_header(ins)
-                    header_rec_sig = next_header.recType
-                    if header_rec_sig == b'GRUP':
-                        header_group_type = next_header.groupType
-                        # Skip all top-level GRUPs we're not interested in
-                        # (group type == 0) and all persistent children and
-                        # dialog topics (group type == 7 or 8, respectively).
-                        if ((next_header.is_top_group_header and
-                             next_header.label not in interested_sigs)
-                                or header_group_type in (7, 8)):
-                            # Note that GRUP sizes include their own header
-                            # size, so we need to subtract that
-                            next_header.skip_blob(ins)
-                    elif header_rec_sig in tops_to_skip:
-                        # Skip TES4, CELL and WRLD to get to their contents
-                        next_header.skip_blob(ins)
-                    else:
-                        # We must be in a temp CELL children group, store the
-                        # header and skip the record body
-                        ret_headers.append(next_header)
-                        next_header.skip_blob(ins)
-            except (OSError, struct_error) as e:
-                msg = f'Error scanning {mod_info}, file read pos: {ins.tell()}'
-                raise ModError(ins.inName, msg) from e
-        return ret_headers
+        # Skip all persistent children and dialog topics (group type == 7 or
+        # 8, respectively) - what remains are temp CELL children
+        temp_positions = [rec_pos for rec_sig, _fid, _flags, rec_pos, _siz,
+            top_sig, group_type in RecordDirectory.from_info(
+                mod_info).iter_records() if top_sig in interested_sigs and
+            group_type not in (7, 8) and rec_sig not in tops_to_skip]
+        try:
+            return list(RecordDirectory.read_headers(mod_info,
+                                                     temp_positions))
+        except (OSError, struct_error) as e:
+            raise ModError(mod_info.fn_key,
+                           f'Error scanning {mod_info}') from e
 
     @staticmethod
     def read_all_subrecords(mod_info) -> \
@@ -585,6 +982,8 @@ def read_all_subrecords(mod_info) -> \
         tuples of record headers and the subrecords those headers contain."""
         ret_records = defaultdict(list)
         curr_sig = None
+        # We read every record anyway, so walk the plugin from start to end
+        # instead of building its RecordDirectory and seeking to each record
         with FormIdReadContext.from_info(mod_info) as ins:
             try:
                 while not ins.atEnd():
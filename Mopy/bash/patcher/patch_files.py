@@ -22,6 +22,7 @@
 # =============================================================================
 from __future__ import annotations
 
+import os
 import re
 import time
 from collections import Counter, defaultdict, deque
@@ -35,7 +36,23 @@
 from ..bolt import Progress, SubProgress, deprint, dict_sort, readme_url, FName
 from ..exception import BoltError, CancelError, ModError
 from ..localize import format_date
-from ..mod_files import LoadFactory, ModFile
+from ..mod_files import LoadFactory, ModFile, ParsedPluginCache, \
+    iter_plugin_bytes
+
+def _canonical(val):
+    """Convert a value stored in the mod table into plain, deterministically
+    ordered builtins - FNames come back from the table as Paths, which
+    refuse to be compared to FNames, and set order varies between runs."""
+    if isinstance(val, (str, os.PathLike)):
+        return str(val) # FName and Path
+    if isinstance(val, dict):
+        return sorted(([_canonical(k), _canonical(v)] for k, v in
+                       val.items()), key=repr)
+    if isinstance(val, (set, frozenset)):
+        return sorted(map(_canonical, val), key=repr)
+    if isinstance(val, (list, tuple)):
+        return [*map(_canonical, val)]
+    return val
 
 class PatchFile(ModFile):
     """Base class of patch files. Wraps an executing bashed Patch."""
@@ -120,6 +137,14 @@ def _link(link_id):
                 'link_decomp_all': f"[[{_link('modsDecompileAll')}"
                                    f"|{_('Decompile All')}]]"})
             for mod in self.compiledAllMods: log(f'* {mod}')
+        if self.changed_since_build or self.removed_since_build:
+            log.setHeader('=== ' + _('Changed Since Last Build'))
+            log(_('The following plugins were added, edited, (de)activated '
+                  'or retagged since this patch was last built:'))
+            for mod in self.changed_since_build: log(f'* {mod}')
+            for mod in self.removed_since_build:
+                log('* ' + _('%(removed_plugin)s (removed)') % {
+                    'removed_plugin': mod})
         log.setHeader('=== ' + _('Active Plugins'), True)
         for mname, modinfo in self.merged_or_loaded_ord.items():
             version = modinfo.get_version()
@@ -166,6 +191,9 @@ def __init__(self, modInfo, pfile_minfos):
         self.worldOrphanMods = []
         self.compiledAllMods = []
         self.patcher_mod_skipcount = defaultdict(Counter)
+        # Plugins that changed since the last build - see is_up_to_date
+        self.changed_since_build = []
+        self.removed_since_build = []
         #--Mods
         # Load order is not supposed to change during patch execution
         self.all_plugins = load_order.cached_lower_loading(modInfo.fn_key)
@@ -186,6 +214,70 @@ def __init__(self, modInfo, pfile_minfos):
         self._loaded_mods = {}
         # read signatures we need to load per plugin - updated by the patchers
         self._read_signatures = defaultdict(set)
+        # cache of parsed plugins persisted between builds, if enabled
+        self._plugin_cache = None
+        if bass.inisettings['CacheParsedPlugins']:
+            from .. import bosh # strings are decoded in the ini language
+            self._plugin_cache = ParsedPluginCache(
+                bass.dirs['modsBash'].join('Plugin Cache'), key_extra=(
+                    bass.AppVersion, bush.game.unique_display_name,
+                    bosh.oblivionIni.get_ini_language()))
+
+    # Build inputs ------------------------------------------------------------
+    def build_inputs(self, patch_config, progress):
+        """Return a snapshot of everything a build of this patch depends on:
+        the plugins loading before it (with their stats, CRCs, active state
+        and Bash Tags), the patch configuration and the files in the Bash
+        Patches folders. If this equals the snapshot stored by the last build
+        of this patch, rebuilding would produce the same patch again."""
+        plugins = {}
+        progress.setFull(len(self.all_plugins) or 1)
+        for dex, (p_name, p_info) in enumerate(self.all_plugins.items()):
+            # Only edited plugins need their CRC recalculated, but that may
+            # still take a while
+            progress(dex, _('Calculating crc:') + f'\n{p_name}')
+            plugins[p_name] = (p_info.fsize, p_info.ftime,
+                p_info.calculate_crc()[0], p_name in self.load_dict,
+                sorted(self.all_tags[p_name]))
+        patch_srcs = {}
+        for patches_dir in (bass.dirs['patches'], bass.dirs['defaultPatches']):
+            if not patches_dir: continue
+            for src_name in patches_dir.ilist():
+                try:
+                    src_path = patches_dir.join(src_name)
+                    patch_srcs[src_path.s] = src_path.size_mtime()
+                except OSError:
+                    pass
+        return {'version': bass.AppVersion,
+                'config': _canonical(patch_config),
+                'load_order': [*map(str, plugins)],
+                'plugins': {str(k): v for k, v in plugins.items()},
+                'patch_sources': patch_srcs}
+
+    def is_up_to_date(self, build_inputs):
+        """Check build_inputs against the snapshot stored by the last build
+        of this patch (see store_build_inputs) and remember the plugins that
+        changed since, for the log. Returns True if nothing changed and the
+        patch itself was not modified since it was built."""
+        prev_inputs, prev_crc = self.fileInfo.get_table_prop(
+            'bash.patch.inputs') or ({}, None)
+        if prev_inputs:
+            prev_plugins = prev_inputs['plugins']
+            cur_plugins = build_inputs['plugins']
+            self.changed_since_build = [p for p in cur_plugins if
+                cur_plugins[p] != prev_plugins.get(p)]
+            self.removed_since_build = [p for p in prev_plugins if
+                                        p not in cur_plugins]
+        return (prev_inputs == build_inputs and
+                self.fileInfo.calculate_crc()[0] == prev_crc)
+
+    @staticmethod
+    def store_build_inputs(build_inputs, saved_info):
+        """Store the snapshot of build_inputs along with the CRC of the
+        freshly saved patch - saved_info must be the info of the patch as
+        refreshed after saving it."""
+        saved_info.set_table_prop('bash.patch.inputs', (
+            build_inputs, saved_info.calculate_crc()[0]))
 
     def set_active_arrays(self, pfile_minfos):
         """Populate PatchFile data structures with info on active mods - must
@@ -283,7 +375,8 @@ def initFactories(self,progress):
         progress(0, _('Processing.'))
         read_sigs = set(bush.game.readClasses) | set(chain.from_iterable(
             p.active_read_sigs for p in self._patcher_instances))
-        self.readFactory = LoadFactory(False, by_sig=read_sigs)
+        self.readFactory = LoadFactory(False, by_sig=read_sigs,
+            lazy_unpack=bass.inisettings['LazyRecordUnpacking'])
         write_sigs = set(bush.game.writeClasses) | set(chain.from_iterable(
             p.active_write_sigs for p in self._patcher_instances))
         self.loadFactory = LoadFactory(True, by_sig=write_sigs)
@@ -307,7 +400,8 @@ def get_loaded_mod(self, mod_name):
                 return loaded_mod
         elif mod_name not in self.all_plugins:
             return None # (Filter tagged) mods with missing masters
-        lf = LoadFactory(False, by_sig=load_sigs)
+        lf = LoadFactory(False, by_sig=load_sigs,
+                         lazy_unpack=bass.inisettings['LazyRecordUnpacking'])
         mod_info = self.all_plugins[mod_name]
         mod_file = ModFile(mod_info, lf)
         mod_file.load_plugin()
@@ -328,9 +422,16 @@ def scanLoadMods(self,progress):
         load_set = set(self.load_dict)
         patchers_ord = sorted(self._patcher_instances,
                               key=attrgetter('patcher_order'))
-        for index, (modName, modInfo) in enumerate(self.all_plugins.items()):
-            if modName in self.needs_filter_mods:
-                continue
+        to_scan = [(index, modName, modInfo) for index, (modName, modInfo) in
+                   enumerate(self.all_plugins.items())
+                   if modName not in self.needs_filter_mods]
+        # Only read ahead the plugins we can't load from the cache
+        to_read = {modName: modInfo for _i, modName, modInfo in to_scan if
+                   not (self._plugin_cache and
+                        self._plugin_cache.has_entry(modInfo))}
+        read_plugins = self._iter_plugin_bytes(to_read.values())
+        for index, modName, modInfo in to_scan:
+            plugin_bytes = next(read_plugins) if modName in to_read else None
             # Check some commonly needed properties of the current plugin
             is_merged = modName in self.mergeSet
             is_filter = 'Filter' in self.all_tags[modName]
@@ -340,8 +441,9 @@ def scanLoadMods(self,progress):
             try:
                 scan_factory = (self.readFactory, self.mergeFactory)[is_merged]
                 progress(index, f'{modName}\n' + _('Loading…'))
-                modFile = ModFile(modInfo, scan_factory)
-                modFile.load_plugin(SubProgress(progress, index, index + 0.5))
+                modFile = self._load_scanned_mod(modInfo, scan_factory,
+                    SubProgress(progress, index, index + 0.5), plugin_bytes)
+                del plugin_bytes # don't hold on to it while scanning
             except ModError as e:
                 deprint('load error:', traceback=True)
                 self.loadErrorMods.append((modName,e))
@@ -375,8 +477,36 @@ def scanLoadMods(self,progress):
             except:
                 bolt.deprint(f'MERGE/SCAN ERROR: {modName}', traceback=True)
                 raise
+        if self._plugin_cache:
+            self._plugin_cache.prune(self.p_file_minfos)
         progress(progress.full, _('Load plugins scanned.'))
 
+    def _load_scanned_mod(self, mod_info, scan_factory, progress,
+                          plugin_bytes):
+        """Load the specified plugin for scanLoadMods - from the parsed
+        plugin cache if possible."""
+        if self._plugin_cache and (mod_file := self._plugin_cache.load(
+                mod_info, scan_factory, progress)):
+            return mod_file
+        mod_file = ModFile(mod_info, scan_factory)
+        mod_file.load_plugin(progress, plugin_bytes=plugin_bytes)
+        if self._plugin_cache:
+            self._plugin_cache.store(mod_file, plugin_bytes)
+        return mod_file
+
+    @staticmethod
+    def _iter_plugin_bytes(mod_infos):
+        """Yield the contents of each of the specified plugins, in order. If
+        the PrefetchPlugins ini setting is enabled, a thread pool reads the
+        next few plugins from disk while the current one is being parsed,
+        merged and scanned on the main thread - otherwise (or if reading a
+        plugin fails) yield None, letting load_plugin read the file itself.
+        Parsing always happens in load order, so the patch is unaffected."""
+        if not bass.inisettings['PrefetchPlugins']:
+            yield from (None for _m in mod_infos)
+            return
+        yield from iter_plugin_bytes(mod_infos)
+
     def mergeModFile(self, modFile, loaded_mods, iiMode):
         """Copies contents of modFile into self."""
         for top_grup_sig,block in modFile.tops.items():
@@ -23,8 +23,9 @@
 """Test archives.py"""
 import os
 import tempfile
+import zipfile
 
-from ..archives import compress7z, extract7z
+from ..archives import _list_with_7z, _list_zip, compress7z, extract7z
 from ..bolt import GPath
 
 _utils_dir = GPath(os.path.join(os.path.dirname(__file__), 'utils'))
@@ -55,3 +56,57 @@ def test_compress_extract_with_spaces(capsys):
                 out.write('__init__.py\n')
             extract7z(full_out, dirname, filelist_to_extract=templist)
             assert '__init__.py' in os.listdir(dirname)
+
+def _listed_entries(listing):
+    """Return the (path, size, CRC, is directory) of each entry in the
+    specified listing, split up at each 'Method' key like BAIN does (see
+    InstallerArchive._fs_refresh)."""
+    entries = []
+    entry = {}
+    for key, value in listing:
+        entry[key] = value
+        if key == 'Method':
+            entries.append((entry['Path'], entry['Size'], entry.get('CRC'),
+                            'D' in entry.get('Attributes', '')))
+            entry = {}
+    return entries
+
+def test_list_zip_matches_7z():
+    """Test that listing a zip from its central directory gives the same
+    entries as listing it with 7z."""
+    with tempfile.TemporaryDirectory() as dirname:
+        zip_path = GPath(os.path.join(dirname, 'test archive.zip'))
+        with zipfile.ZipFile(zip_path, 'w') as zip_arch:
+            zip_arch.writestr('meshes/', '')
+            zip_arch.writestr('meshes/clutter/bowl.nif', b'bowl' * 100,
+                              compress_type=zipfile.ZIP_DEFLATED)
+            zip_arch.writestr('textures/bowl.dds', bytes(1000))
+            zip_arch.writestr('empty.txt', b'')
+            # Non-ASCII names are stored as UTF-8 (and flagged as such)
+            zip_arch.writestr('Docs/Read Me \u00fc.txt', '\u00fc'.encode())
+        zip_listing = _list_zip(zip_path)
+        assert zip_listing is not None
+        assert _listed_entries(zip_listing) == _listed_entries(
+            _list_with_7z(zip_path))
+
+def test_list_zip_leaves_unsure_archives_to_7z():
+    """Test that archives 7z might list differently are left to 7z."""
+    with tempfile.TemporaryDirectory() as dirname:
+        # Only zips are listed without 7z
+        not_zip_path = GPath(os.path.join(dirname, 'test.7z'))
+        with zipfile.ZipFile(not_zip_path, 'w') as zip_arch:
+            zip_arch.writestr('bowl.nif', b'bowl')
+        assert _list_zip(not_zip_path) is None
+        # Names not flagged as UTF-8 are decoded by 7z per the system locale
+        zip_path = GPath(os.path.join(dirname, 'test.zip'))
+        with zipfile.ZipFile(zip_path, 'w') as zip_arch:
+            zip_arch.writestr('caf_.txt', b'coffee')
+        with open(zip_path, 'rb') as ins:
+            zip_bytes = ins.read()
+        with open(zip_path, 'wb') as out:
+            out.write(zip_bytes.replace(b'caf_.txt', b'caf\xe9.txt'))
+        assert _list_zip(zip_path) is None
+        # Broken zips are reported by 7z
+        with open(zip_path, 'wb') as out:
+            out.write(b'PK not really a zip')
+        assert _list_zip(zip_path) is None
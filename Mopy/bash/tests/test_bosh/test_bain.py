@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+#
+# GPL License and Copyright Notice ============================================
+#  This file is part of Wrye Bash.
+#
+#  Wrye Bash is free software: you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  Wrye Bash is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with Wrye Bash.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  Wrye Bash copyright (C) 2005-2009 Wrye, 2010-2024 Wrye Bash Team
+#  https://github.com/wrye-bash
+#
+# =============================================================================
+"""Tests for the BAIN data stores - the installers and their bookkeeping, run
+against packages in a temporary installers folder."""
+import itertools
+import os
+import pickle
+import re
+import zipfile
+from collections import defaultdict
+
+import pytest
+
+from ... import bass, bolt, bush
+from ...bolt import CIstr, FName, GPath
+from ...bosh import ModInfos
+from ...bosh.bain import Installer, InstallerArchive, InstallersData, \
+    _file_lists_path
+
+_PKG_FILES = {'Plugin.esp': b'plugin', 'Textures/a.dds': b'tex',
+              'Docs/Readme.txt': b'readme'}
+
+@pytest.fixture
+def bain_dirs(tmp_path, monkeypatch):
+    """Point the folders BAIN uses to subfolders of a temporary folder."""
+    for dir_key in ('installers', 'bainData', 'converters', 'dupeBCFs',
+                    'corruptBCFs', 'mods', 'modsBash'):
+        (dir_path := tmp_path / dir_key).mkdir()
+        monkeypatch.setitem(bass.dirs, dir_key, GPath(os.fspath(dir_path)))
+    # all skips and renames off
+    monkeypatch.setattr(bass, 'settings', defaultdict(bool, {
+        'bash.installers.goodDlls': {}, 'bash.installers.badDlls': {}}))
+    # set by ModInfos.__init__, used to tell plugins apart in refreshStatus
+    exts = '|'.join([f'\\{e}' for e in bush.game.espm_extensions])
+    monkeypatch.setattr(ModInfos, 'file_pattern', re.compile(
+        fr'({exts})(\.ghost)?$', re.I))
+    # set by Installer.init_bain_dirs
+    monkeypatch.setattr(Installer, 'dataDirsPlus',
+                        Installer.dataDirsPlus | bush.game.Bain.data_dirs)
+    return tmp_path
+
+def _new_archive(archive_name, pkg_files=_PKG_FILES):
+    """Write a zip with the specified files to the installers folder and
+    return a freshly scanned InstallerArchive for it."""
+    with zipfile.ZipFile(bass.dirs['installers'].join(archive_name).s,
+                         'w') as out_zip:
+        for file_path, file_data in pkg_files.items():
+            out_zip.writestr(file_path, file_data)
+    _file_lists_path(archive_name).head.makedirs()
+    return InstallerArchive(FName(archive_name), load_cache=True)
+
+def _forbid_rescan(monkeypatch):
+    def _reset_cache(self, *args, **kwargs):
+        raise AssertionError(f'{self} was rescanned')
+    monkeypatch.setattr(InstallerArchive, '_reset_cache', _reset_cache)
+
+class TestFileLists(object):
+    """The file lists of the packages are stored in a file per package rather
+    than in Installers.dat (version 3) - see _InstallerPackage._file_lists."""
+    def test_round_trip(self, bain_dirs, monkeypatch):
+        inst = _new_archive('Package.zip')
+        assert len(inst.fileSizeCrcs) == len(_PKG_FILES)
+        inst.store_file_lists()
+        assert _file_lists_path(inst.fn_key).is_file()
+        state = pickle.dumps(inst)
+        # the lists are not pickled along with the rest of the installer
+        assert all(inst._persistent_state()[
+            inst.persistent.index(a) + 1] is None for a in inst._file_lists)
+        _forbid_rescan(monkeypatch)
+        loaded = pickle.loads(state)
+        assert loaded.fn_key == inst.fn_key
+        assert loaded.fileSizeCrcs == inst.fileSizeCrcs
+        assert loaded.src_sizeCrcDate == inst.src_sizeCrcDate
+        assert loaded.ci_dest_sizeCrc == inst.ci_dest_sizeCrc
+        # unchanged lists are not rewritten
+        lists_path = _file_lists_path(inst.fn_key)
+        lists_path.remove()
+        loaded.store_file_lists()
+        assert not lists_path.exists()
+
+    def test_load_version_2(self, bain_dirs, monkeypatch):
+        """Installers.dat version 2 holds the lists inline."""
+        inst = _new_archive('Package.zip')
+        v2_state = Installer._persistent_state(inst)
+        _forbid_rescan(monkeypatch)
+        loaded = InstallerArchive(inst.fn_key)
+        loaded.__setstate__(v2_state)
+        assert loaded.fn_key == inst.fn_key
+        assert loaded.fileSizeCrcs == inst.fileSizeCrcs
+        assert loaded.src_sizeCrcDate == inst.src_sizeCrcDate
+        # the next save moves them to their own file
+        lists_path = _file_lists_path(inst.fn_key)
+        assert not lists_path.exists()
+        loaded.store_file_lists()
+        assert lists_path.is_file()
+        assert pickle.loads(pickle.dumps(
+            loaded)).fileSizeCrcs == inst.fileSizeCrcs
+
+    def test_missing_lists_file(self, bain_dirs):
+        inst = _new_archive('Package.zip')
+        inst.store_file_lists()
+        state = pickle.dumps(inst)
+        _file_lists_path(inst.fn_key).remove()
+        # the archive did not change but we must rescan it to get the lists
+        loaded = pickle.loads(state)
+        assert loaded.fn_key == inst.fn_key
+        assert sorted(loaded.fileSizeCrcs) == sorted(inst.fileSizeCrcs)
+        assert loaded.ci_dest_sizeCrc == inst.ci_dest_sizeCrc
+
+    def test_rename_and_delete(self, bain_dirs, monkeypatch):
+        idata = InstallersData()
+        for archive_name in ('A.zip', 'B.zip', 'C.zip'):
+            idata[FName(archive_name)] = _new_archive(archive_name)
+        idata._store_file_lists()
+        lists_dir = _file_lists_path('A.zip').head
+        assert sorted(lists_dir.ilist()) == ['A.zip.dat', 'B.zip.dat',
+                                             'C.zip.dat']
+        # rename A.zip to D.zip and delete B.zip
+        inst_a = idata.pop(FName('A.zip'))
+        inst_a.abs_path.moveTo(idata.store_dir.join('D.zip'))
+        inst_a.fn_key = FName('D.zip')
+        inst_a.abs_path = idata.store_dir.join('D.zip')
+        idata[inst_a.fn_key] = inst_a
+        del idata[FName('B.zip')]
+        idata._store_file_lists()
+        assert sorted(lists_dir.ilist()) == ['C.zip.dat', 'D.zip.dat']
+        _forbid_rescan(monkeypatch)
+        assert pickle.loads(pickle.dumps(inst_a)).fileSizeCrcs == \
+               inst_a.fileSizeCrcs
+
+# Packages that install some of the same files
+_OVERLAPPING_PKGS = {
+    'A.zip': _PKG_FILES,
+    'B.zip': {'Textures/a.dds': b'texture B', 'Meshes/b.nif': b'mesh'},
+    'C.zip': {'Plugin.esp': b'plugin C', 'Textures/c.dds': b'tex C',
+              'Meshes/b.nif': b'mesh C'},
+}
+
+def _install(idata, inst_key):
+    """Mark the installer active and write its files to Data."""
+    (inst := idata[FName(inst_key)]).is_active = True
+    for dest, (dest_size, dest_crc) in inst.ci_dest_sizeCrc.items():
+        idata.data_sizeCrcDate[dest] = (dest_size, dest_crc, 1)
+    idata._mark_data_dirty(inst.ci_dest_sizeCrc)
+
+def _uninstall(idata, inst_key):
+    """Mark the installer inactive and remove the files from Data that no
+    other active installer installs - leave the others alone."""
+    (inst := idata[FName(inst_key)]).is_active = False
+    still_installed = {d.lower() for v in idata.values() if v.is_active
+                       for d in v.ci_dest_sizeCrc}
+    removed = [d for d in inst.ci_dest_sizeCrc if
+               d.lower() not in still_installed]
+    for dest in removed:
+        idata.data_sizeCrcDate.pop(dest, None)
+    idata._mark_data_dirty(removed)
+
+def _installed(*inst_keys):
+    """Return an InstallersData with freshly scanned archives for
+    _OVERLAPPING_PKGS, in this install order, with the specified ones
+    installed."""
+    idata = InstallersData()
+    for archive_name, pkg_files in _OVERLAPPING_PKGS.items():
+        idata[FName(archive_name)] = _new_archive(archive_name, pkg_files)
+    idata.refreshOrder()
+    for inst_key in inst_keys:
+        _install(idata, inst_key)
+    idata._refresh_underrides() # full refresh on boot
+    for inst in idata.values():
+        inst.refreshStatus(idata)
+    return idata
+
+class TestUnderrides(object):
+    """The underrides and the status of the installers are updated only for
+    the Data files that changed and the files of the installers that changed
+    since the last refresh - this must match recalculating them all."""
+    @staticmethod
+    def _check_delta(idata):
+        """Refresh the underrides and statuses incrementally, the way irefresh
+        does, and check a full refresh would change nothing."""
+        old_underrides = idata.ci_underrides_sizeCrc.copy()
+        changed, status_keys = idata._refresh_underrides_delta()
+        for inst_key in status_keys:
+            idata[inst_key].refreshStatus(idata)
+        delta_underrides = idata.ci_underrides_sizeCrc.copy()
+        assert changed == (delta_underrides != old_underrides)
+        assert not idata._refresh_underrides()
+        assert idata.ci_underrides_sizeCrc == delta_underrides
+        assert not [k for k, v in idata.items() if v.refreshStatus(idata)]
+        return delta_underrides
+
+    def test_install(self, bain_dirs):
+        idata = _installed('B.zip')
+        _install(idata, 'A.zip') # lower than B, overwrites a.dds
+        assert set(self._check_delta(idata)) == {CIstr('Textures/a.dds')}
+        assert idata[FName('B.zip')].status == 20
+        _install(idata, 'C.zip') # overwrites A's plugin and b.nif
+        assert set(self._check_delta(idata)) == {CIstr('Textures/a.dds')}
+        assert idata[FName('A.zip')].status == 10
+        assert idata[FName('B.zip')].status == 20
+        assert idata[FName('C.zip')].status == 30
+
+    def test_uninstall(self, bain_dirs):
+        idata = _installed('A.zip', 'B.zip', 'C.zip')
+        _uninstall(idata, 'C.zip') # leaves its plugin and b.nif
+        assert set(self._check_delta(idata)) == {CIstr('Plugin.esp'),
+                                                 CIstr('Meshes/b.nif')}
+        assert idata[FName('C.zip')].status == -10
+        _uninstall(idata, 'B.zip') # leaves a.dds
+        assert set(self._check_delta(idata)) == {CIstr('Plugin.esp'),
+                                                 CIstr('Textures/a.dds')}
+        assert idata[FName('A.zip')].status == 10
+
+    def test_reorder(self, bain_dirs):
+        idata = _installed('A.zip', 'B.zip', 'C.zip')
+        for inst_key, new_pos in (('A.zip', 2), ('C.zip', 0), ('B.zip', 1)):
+            idata.moveArchives([FName(inst_key)], new_pos)
+            self._check_delta(idata)
+
+    def test_external_edits(self, bain_dirs):
+        idata = _installed('A.zip', 'B.zip', 'C.zip')
+        # edit a file only C installs and delete one B and C install
+        idata.data_sizeCrcDate['textures/c.dds'] = (1, 0xDEADBEEF, 2)
+        idata.data_sizeCrcDate.pop('Meshes/b.nif')
+        idata._mark_data_dirty(['textures/c.dds', 'Meshes/b.nif'])
+        self._check_delta(idata)
+        assert idata[FName('B.zip')].status == -10
+        # rescanning a package replaces its files
+        _new_archive('A.zip', {**_PKG_FILES, 'Plugin.esp': b'plugin A2',
+                               'Meshes/b.nif': b'mesh A'})
+        idata[FName('A.zip')]._reset_cache()
+        self._check_delta(idata)
+        # and removing one drops them
+        del idata[FName('C.zip')]
+        self._check_delta(idata)
+
+class TestConflicts(object):
+    """Loose file conflicts are found via the index of the files each
+    installer installs - this must match scanning all the installers."""
+    @staticmethod
+    def _scan_conflicts(idata, src_installer, list_overrides,
+                        include_inactive, include_lower):
+        """The lower and higher loose conflicts find_conflicts returns,
+        calculated by checking the files of every installer."""
+        srcOrder = src_installer.order
+        showInactive = list_overrides and include_inactive
+        showLower = list_overrides and include_lower
+        if list_overrides:
+            mismatched = set(src_installer.ci_dest_sizeCrc)
+        else:
+            mismatched = src_installer.underrides
+        if not mismatched: return [], []
+        src_sizeCrc = src_installer.ci_dest_sizeCrc
+        lower_loose, higher_loose = [], []
+        for package, installer in idata.sorted_pairs():
+            if installer.order == srcOrder or not (
+                    showInactive or installer.is_active): continue
+            if not showLower and installer.order < srcOrder: continue
+            curConflicts = bolt.sortFiles(
+                [x for x, y in installer.ci_dest_sizeCrc.items() if
+                 x in mismatched and y != src_sizeCrc[x]])
+            if curConflicts:
+                (lower_loose if installer.order < srcOrder else
+                 higher_loose).append((installer, package, curConflicts))
+        return lower_loose, higher_loose
+
+    def _check_conflicts(self, idata):
+        for src_installer in idata.values():
+            for list_overrides, include_inactive, include_lower in \
+                    itertools.product((True, False), repeat=3):
+                expected = self._scan_conflicts(idata, src_installer,
+                    list_overrides, include_inactive, include_lower)
+                assert idata.find_conflicts(src_installer,
+                    list_overrides=list_overrides,
+                    include_inactive=include_inactive,
+                    include_lower=include_lower,
+                    include_bsas=False) == (*expected, [], [])
+
+    def test_find_conflicts(self, bain_dirs):
+        idata = _installed('A.zip', 'C.zip')
+        self._check_conflicts(idata)
+        idata.moveArchives([FName('A.zip')], 2)
+        _install(idata, 'B.zip')
+        _uninstall(idata, 'C.zip')
+        self._check_conflicts(idata)
+
+    def test_refreshed_installer(self, bain_dirs):
+        idata = _installed('A.zip', 'B.zip', 'C.zip')
+        self._check_conflicts(idata)
+        # rescanning a package replaces its files - index them again
+        _new_archive('B.zip', {'Plugin.esp': b'plugin B',
+                               'Textures/c.dds': b'tex B'})
+        idata[FName('B.zip')]._reset_cache()
+        self._check_conflicts(idata)
+        assert idata.find_conflicts(idata[FName('A.zip')],
+                                    include_bsas=False)[1][0][2] == [
+            'Plugin.esp']
+
+    def test_removed_installer(self, bain_dirs):
+        idata = _installed('A.zip', 'B.zip', 'C.zip')
+        self._check_conflicts(idata)
+        del idata[FName('C.zip')]
+        self._check_conflicts(idata)
+        # the removed installer is no longer reported
+        assert FName('C.zip') not in {c[1] for i in idata.values() for c in
+            itertools.chain(*idata.find_conflicts(i, include_bsas=False))}
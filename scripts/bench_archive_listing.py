@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GPL License and Copyright Notice ============================================
+#  This file is part of Wrye Bash.
+#
+#  Wrye Bash is free software: you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  Wrye Bash is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with Wrye Bash.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  Wrye Bash copyright (C) 2005-2009 Wrye, 2010-2024 Wrye Bash Team
+#  https://github.com/wrye-bash
+#
+# =============================================================================
+
+"""This script benchmarks listing a directory of zip archives by running 7z
+on one archive after the other, like BAIN used to when scanning new packages,
+against listing them in process from their central directory (see
+archives.read_archive_listing), one after the other and in a bounded pool of
+threads (see bosh.bain._ArchiveLister). The archives are generated in a
+temporary folder and 7z must be on the PATH."""
+
+import logging
+import os
+import random
+import tempfile
+import zipfile
+from pathlib import Path
+
+from helpers.bench_utils import best_time, init_game, setup_bench_game
+from helpers.utils import mk_logfile, run_script, setup_log
+
+_LOGGER = logging.getLogger(__name__)
+_LOGFILE = mk_logfile(__file__)
+
+def _setup_parser(argparser):
+    setup_bench_game(argparser)
+    argparser.add_argument(
+        '-n',
+        '--num-archives',
+        type=int,
+        default=100,
+        help='How many archives to generate [default: 100].',
+    )
+    argparser.add_argument(
+        '-f',
+        '--files',
+        type=int,
+        default=500,
+        help='How many files each archive holds [default: 500].',
+    )
+
+def _make_archives(archives_dir, num_archives, num_files):
+    """Write num_archives zip archives laid out like simple BAIN packages,
+    each holding num_files small meshes and textures."""
+    rng = random.Random(0)
+    archive_paths = {}
+    for i in range(num_archives):
+        arch_path = archives_dir / f'BenchPackage{i:04d}.zip'
+        with zipfile.ZipFile(arch_path, 'w', zipfile.ZIP_DEFLATED) as arch:
+            for j in range(num_files):
+                folder = 'meshes' if j % 2 else 'textures'
+                arch.writestr(f'{folder}/bench{i:04d}/file{j:05d}.bin',
+                              rng.randbytes(rng.randrange(16, 512)))
+        archive_paths[arch_path.name] = arch_path
+    return archive_paths
+
+def _list_all(archive_paths, list_mode):
+    # noinspection PyProtectedMember
+    from bash.archives import _list_with_7z, list_archive
+    from bash.bolt import FName, GPath
+    # noinspection PyProtectedMember
+    from bash.bosh.bain import _ArchiveLister
+    listings = {}
+    arch_paths = {FName(k): GPath(os.fspath(v)) for k, v in
+                  archive_paths.items()}
+    lister = _ArchiveLister(arch_paths if list_mode == 'pool' else {})
+    try:
+        for fn_arch, arch_path in arch_paths.items():
+            if list_mode == '7z':
+                listings[fn_arch] = _list_with_7z(arch_path)
+                continue
+            listed = listings[fn_arch] = []
+            list_archive(arch_path, lambda k, v: listed.append((k, v)),
+                         listing_future=lister.listing_future(fn_arch))
+    finally:
+        lister.shutdown()
+    # Keep what BAIN uses - the (path, size, crc) of each file
+    return {k: _files_size_crc(v, arch_paths[k]) for k, v in
+            listings.items()}
+
+def _files_size_crc(listing, arch_path):
+    files = []
+    entry = {}
+    for key, value in listing:
+        entry[key] = value
+        if key == 'Method':
+            # Skip folders and the archive itself, like BAIN does
+            if 'D' not in entry.get('Attributes', '') and entry.get(
+                    'Path') != f'{arch_path}':
+                files.append((entry['Path'], int(entry['Size']),
+                              int(entry.get('CRC') or '0', 16)))
+            entry = {}
+    return files
+
+def main(args):
+    setup_log(_LOGGER, args)
+    init_game(args.game)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        _LOGGER.info(f'Generating {args.num_archives} archives with '
+                     f'{args.files} files each...')
+        archive_paths = _make_archives(Path(temp_dir), args.num_archives,
+                                       args.files)
+        total_size = sum(p.stat().st_size for p in archive_paths.values())
+        _LOGGER.info(f'Generated {total_size:,} bytes.')
+        times_listings = {list_mode: best_time(
+            lambda: _list_all(archive_paths, list_mode), args.repeat) for
+            list_mode in ('7z', 'native', 'pool')}
+    # Make sure all modes produce the same listings
+    listings_7z = times_listings['7z'][1]
+    if any(l != listings_7z for _t, l in times_listings.values()):
+        _LOGGER.error('Archive listings differ!')
+    time_7z = times_listings['7z'][0]
+    _LOGGER.info(f'7z, one archive at a time:     {time_7z:.3f}s')
+    for list_mode, mode_label in (('native', 'In process, one at a time:'),
+                                  ('pool', 'In process, bounded pool:')):
+        mode_time = times_listings[list_mode][0]
+        _LOGGER.info(f'{mode_label:<31}{mode_time:.3f}s '
+                     f'({time_7z / mode_time:.2f}x)')
+
+if __name__ == '__main__':
+    run_script(main, __doc__, _LOGFILE, custom_setup=_setup_parser)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GPL License and Copyright Notice ============================================
+#  This file is part of Wrye Bash.
+#
+#  Wrye Bash is free software: you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  Wrye Bash is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with Wrye Bash.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  Wrye Bash copyright (C) 2005-2009 Wrye, 2010-2024 Wrye Bash Team
+#  https://github.com/wrye-bash
+#
+# =============================================================================
+
+"""This script benchmarks loading a plugin made of compressed records with
+the compressed records decompressed inline, one after the other, against
+decompressing them ahead in a thread pool (see ModReader.decompress_ahead).
+The plugin is generated in a temporary folder."""
+
+import logging
+import tempfile
+from pathlib import Path
+
+from helpers.bench_utils import BenchInfo, best_time, init_game, \
+    setup_bench_game
+from helpers.utils import mk_logfile, run_script, setup_log
+
+_LOGGER = logging.getLogger(__name__)
+_LOGFILE = mk_logfile(__file__)
+
+def _setup_parser(argparser):
+    setup_bench_game(argparser)
+    argparser.add_argument(
+        '-n',
+        '--num-records',
+        type=int,
+        default=5_000,
+        help='How many compressed records to generate [default: 5000].',
+    )
+    argparser.add_argument(
+        '-k',
+        '--keywords',
+        type=int,
+        default=64,
+        help='How many keywords each record holds, i.e. how big it is '
+             '[default: 64].',
+    )
+
+def _make_plugin(plugin_path, num_records, num_keywords):
+    """Write a plugin with num_keywords KYWD records and num_records
+    compressed MISC records, each of which lists all the keywords."""
+    from bash.mod_files import LoadFactory, ModFile
+    bench_info = BenchInfo(plugin_path)
+    plugin = ModFile(bench_info, LoadFactory(True, by_sig=[b'KYWD', b'MISC']))
+    kw_fids = []
+    for i in range(num_keywords):
+        kw_rec = plugin.create_record(b'KYWD')
+        kw_rec.eid = f'BenchKeyword{i:04d}'
+        kw_fids.append(kw_rec.fid)
+    for i in range(num_records):
+        misc_rec = plugin.create_record(b'MISC')
+        misc_rec.eid = f'BenchMisc{i:06d}'
+        misc_rec.full = f'Benchmark Item {i}'
+        misc_rec.keywords = kw_fids
+        misc_rec.value = i
+        misc_rec.flags1.compressed = True
+    plugin.save()
+    return bench_info
+
+def _load(bench_info, ahead):
+    from bash.mod_files import LoadFactory, ModFile
+    plugin = ModFile(bench_info, LoadFactory(False, by_sig=[b'MISC']))
+    plugin.load_plugin(decompress_ahead=ahead)
+    return plugin
+
+def main(args):
+    setup_log(_LOGGER, args)
+    init_game(args.game)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        plugin_path = Path(temp_dir) / 'BenchDecompression.esp'
+        _LOGGER.info(f'Generating {args.num_records} compressed records with '
+                     f'{args.keywords} keywords each...')
+        bench_info = _make_plugin(plugin_path, args.num_records,
+                                  args.keywords)
+        _LOGGER.info(f'Generated {plugin_path.stat().st_size:,} bytes.')
+        inline_time, inline_plugin = best_time(
+            lambda: _load(bench_info, False), args.repeat)
+        ahead_time, ahead_plugin = best_time(
+            lambda: _load(bench_info, True), args.repeat)
+    # Make sure both paths produce the same records
+    inline_recs = list(inline_plugin.tops[b'MISC'].iter_records())
+    ahead_recs = list(ahead_plugin.tops[b'MISC'].iter_records())
+    if [(r.eid, r.keywords) for r in inline_recs] != [
+            (r.eid, r.keywords) for r in ahead_recs]:
+        _LOGGER.error('Loaded records differ!')
+    _LOGGER.info(f'Inline decompression: {inline_time:.3f}s')
+    _LOGGER.info(f'Decompressed ahead:   {ahead_time:.3f}s '
+                 f'({inline_time / ahead_time:.2f}x)')
+
+if __name__ == '__main__':
+    run_script(main, __doc__, _LOGFILE, custom_setup=_setup_parser)
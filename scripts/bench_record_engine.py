@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GPL License and Copyright Notice ============================================
+#  This file is part of Wrye Bash.
+#
+#  Wrye Bash is free software: you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  Wrye Bash is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with Wrye Bash.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  Wrye Bash copyright (C) 2005-2009 Wrye, 2010-2024 Wrye Bash Team
+#  https://github.com/wrye-bash
+#
+# =============================================================================
+
+"""This script benchmarks the record engine (brec, ModFile and the merging
+done by PatchFile) over a synthetic load order: a master holding MISC records
+and, optionally, interior cells and worldspaces with references, plus a number
+of plugins overriding some of the master's records and adding their own. A
+part of the generated records can be compressed. The load order is generated
+in a temporary folder, then these phases are timed separately:
+
+ - load:  parsing all the plugins
+ - merge: merging them into a patch, the way the Bashed Patch does
+ - tweak: changing the patch's records the way tweakers do, then trimming it
+          to the changed records
+ - save:  writing the patch
+
+The results are written as JSON. With --all-games the benchmark is run for
+one edition of each supported game, each in its own process."""
+
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from helpers.bench_utils import BenchInfo, init_game, setup_bench_game, \
+    supported_game_names
+from helpers.utils import OUT_PATH, mk_logfile, run_script, setup_log
+
+_LOGGER = logging.getLogger(__name__)
+_LOGFILE = mk_logfile(__file__)
+_DEFAULT_OUTPUT = OUT_PATH / 'bench_record_engine.json'
+_PHASES = ('load', 'merge', 'tweak', 'save')
+
+def _setup_parser(argparser):
+    setup_bench_game(argparser)
+    argparser.add_argument(
+        '--all-games',
+        action='store_true',
+        help='Benchmark one edition of every supported game instead of just '
+             'the one passed to --game.',
+    )
+    argparser.add_argument(
+        '-p',
+        '--plugins',
+        type=int,
+        default=4,
+        help='How many plugins to generate on top of the master '
+             '[default: 4].',
+    )
+    argparser.add_argument(
+        '-n',
+        '--records',
+        type=int,
+        default=2_000,
+        help='How many new MISC records the master and each plugin hold '
+             '[default: 2000].',
+    )
+    argparser.add_argument(
+        '--override-every',
+        type=int,
+        default=4,
+        help='Each plugin overrides every Nth record of the master '
+             '[default: 4].',
+    )
+    argparser.add_argument(
+        '-c',
+        '--compressed',
+        type=float,
+        default=0.1,
+        help='The fraction (0 to 1) of generated records to compress '
+             '[default: 0.1].',
+    )
+    argparser.add_argument(
+        '--cells',
+        type=int,
+        default=20,
+        help='How many interior cells the master holds - each plugin '
+             'overrides some of them, adding references [default: 20].',
+    )
+    argparser.add_argument(
+        '--worlds',
+        type=int,
+        default=1,
+        help='How many worldspaces the master holds [default: 1].',
+    )
+    argparser.add_argument(
+        '--exterior-cells',
+        type=int,
+        default=32,
+        help='How many exterior cells each worldspace holds [default: 32].',
+    )
+    argparser.add_argument(
+        '--refs',
+        type=int,
+        default=10,
+        help='How many references each generated cell holds [default: 10].',
+    )
+    argparser.add_argument(
+        '-o',
+        '--output',
+        type=Path,
+        default=_DEFAULT_OUTPUT,
+        help=f'Where to write the results as JSON '
+             f'[default: {_DEFAULT_OUTPUT}].',
+    )
+
+# Generation ------------------------------------------------------------------
+class _PluginGenerator:
+    """Creates the records of one synthetic plugin, compressing the requested
+    fraction of them."""
+    def __init__(self, bench_info, bench_sigs, compressed_ratio):
+        from bash.mod_files import LoadFactory, ModFile
+        self.plugin = ModFile(bench_info, LoadFactory(True, by_sig=bench_sigs))
+        self.plugin.tes4.masters = list(bench_info.masterNames)
+        # Stay out of the range some games reserve for engine records
+        self.plugin.tes4.nextObject = max(self.plugin.tes4.nextObject, 0x800)
+        self._compressed_ratio = compressed_ratio
+        self._num_generated = 0
+
+    def _finish(self, record, eid):
+        record.eid = eid
+        # Spread the compressed records evenly over the plugin
+        prev_compressed = int(self._num_generated * self._compressed_ratio)
+        self._num_generated += 1
+        if int(self._num_generated * self._compressed_ratio) > prev_compressed:
+            record.flags1.compressed = True
+        return record
+
+    def add_misc(self, eid, misc_val, misc_fid=None):
+        misc_rec = self.plugin.create_record(b'MISC', misc_fid)
+        for att, att_val in (('full', eid), ('value', misc_val),
+                             ('weight', misc_val / 8)):
+            if hasattr(misc_rec, att):
+                setattr(misc_rec, att, att_val)
+        return self._finish(misc_rec, eid)
+
+    def add_cell(self, eid, cell_fid=None):
+        """Add an interior cell - returns its block."""
+        cell_rec = self.plugin.create_record(b'CELL', cell_fid)
+        # Don't mutate the default flags, they are shared between records
+        cell_rec.flags = type(cell_rec.flags)(1) # isInterior
+        self._finish(cell_rec, eid)
+        return self.plugin.tops[b'CELL'].id_records[cell_rec.fid]
+
+    def add_world(self, eid, num_cells):
+        """Add a worldspace with num_cells exterior cells - returns their
+        blocks."""
+        wrld_rec = self._finish(self.plugin.create_record(b'WRLD'), eid)
+        wrld_block = self.plugin.tops[b'WRLD'].id_records[wrld_rec.fid]
+        cell_blocks = []
+        for c in range(num_cells):
+            ext_cell = self._new_child(b'CELL', f'{eid}Cell{c:04d}')
+            ext_cell.flags = type(ext_cell.flags)(0)
+            # Spread them over a few blocks and subblocks
+            ext_cell.posX = (c * 7) % 96 - 48
+            ext_cell.posY = (c * 13) % 96 - 48
+            wrld_block.set_cell(ext_cell)
+            cell_blocks.append(wrld_block.ext_cells.id_records[ext_cell.fid])
+        return cell_blocks
+
+    def add_refs(self, cell_block, eid_prefix, num_refs, base_fid):
+        for r in range(num_refs):
+            ref_rec = self._new_child(b'REFR', f'{eid_prefix}Ref{r:04d}')
+            if hasattr(ref_rec, 'base'):
+                ref_rec.base = base_fid
+            if r % 3 == 0 and cell_block.master_record.flags.isInterior:
+                ref_rec.flags1[10] = True # persistent
+                cell_block.persistent_refs.setRecord(ref_rec, do_copy=False)
+            else:
+                cell_block.temp_refs.setRecord(ref_rec, do_copy=False)
+
+    def _new_child(self, rec_sig, eid):
+        """Create a record that has to be placed in its group by hand."""
+        from bash.brec import FormId, RecHeader, RecordType
+        child_fid = FormId.from_tuple((self.plugin.fileInfo.fn_key,
+                                       self.plugin.tes4.getNextObject()))
+        child_rec = RecordType.sig_to_class[rec_sig](RecHeader(rec_sig,
+            arg2=child_fid, _entering_context=True))
+        child_rec.setChanged()
+        return self._finish(child_rec, eid)
+
+    def save(self):
+        self.plugin.save()
+        return self.plugin.fileInfo
+
+def _generate_load_order(temp_dir, args, bench_sigs):
+    """Generate the master and plugins - returns their BenchInfos in load
+    order."""
+    with_cells = b'CELL' in bench_sigs
+    master_gen = _PluginGenerator(BenchInfo(temp_dir / 'BenchMaster.esm'),
+                                  bench_sigs, args.compressed)
+    master_name = master_gen.plugin.fileInfo.fn_key
+    master_miscs = [master_gen.add_misc(f'BenchMisc{i:06d}', i).fid
+                    for i in range(args.records)]
+    master_cells = []
+    if with_cells:
+        for c in range(args.cells):
+            cell_block = master_gen.add_cell(f'BenchCell{c:04d}')
+            master_gen.add_refs(cell_block, f'BenchCell{c:04d}', args.refs,
+                                master_miscs[0])
+            master_cells.append(cell_block.master_record.fid)
+        for w in range(args.worlds):
+            for cell_block in master_gen.add_world(f'BenchWorld{w:02d}',
+                                                   args.exterior_cells):
+                master_gen.add_refs(cell_block, 'BenchExt', args.refs,
+                                    master_miscs[0])
+    bench_infos = [master_gen.save()]
+    for p in range(args.plugins):
+        plugin_gen = _PluginGenerator(BenchInfo(
+            temp_dir / f'BenchPlugin{p:02d}.esp', masters=[master_name]),
+            bench_sigs, args.compressed)
+        for i, misc_fid in enumerate(master_miscs):
+            if (i + p) % args.override_every == 0:
+                plugin_gen.add_misc(f'BenchMisc{i:06d}', i + p + 1, misc_fid)
+        plugin_miscs = [plugin_gen.add_misc(f'BenchPlugin{p:02d}Misc{i:06d}',
+                                            i).fid
+                        for i in range(args.records)]
+        # Each plugin overrides its share of the master's cells, adding refs
+        for c, cell_fid in enumerate(master_cells):
+            if c % args.plugins == p:
+                cell_block = plugin_gen.add_cell(f'BenchCell{c:04d}', cell_fid)
+                plugin_gen.add_refs(cell_block, f'BenchPlugin{p:02d}',
+                                    args.refs, plugin_miscs[0])
+        bench_infos.append(plugin_gen.save())
+    return bench_infos
+
+# Benchmark -------------------------------------------------------------------
+def _bench_patch_type():
+    from bash.mod_files import LoadFactory, ModFile
+    from bash.patcher.patch_files import PatchFile
+    class _BenchPatch(ModFile):
+        """Stands in for a PatchFile, reusing its merging code but skipping
+        the patchers and everything that needs a real load order."""
+        mergeModFile = PatchFile.mergeModFile
+        update_patch_records_from_mod = PatchFile.update_patch_records_from_mod
+        getKeeper = PatchFile.getKeeper
+
+        def __init__(self, patch_info, bench_sigs):
+            super().__init__(patch_info, LoadFactory(True, by_sig=bench_sigs))
+            self.readFactory = LoadFactory(False, by_sig=bench_sigs)
+            self.tes4.author = 'BASHED PATCH'
+            self.keepIds = set()
+            self.mergeIds = set()
+    return _BenchPatch
+
+def _load(bench_infos, bench_sigs):
+    from bash.mod_files import LoadFactory, ModFile
+    loaded_plugins = []
+    for bench_info in bench_infos:
+        mod_file = ModFile(bench_info, LoadFactory(False, by_sig=bench_sigs))
+        mod_file.load_plugin()
+        loaded_plugins.append(mod_file)
+    return loaded_plugins
+
+def _merge(bench_patch, loaded_plugins):
+    """The master is scanned like an active plugin, the rest are merged."""
+    master_file, *merged_plugins = loaded_plugins
+    bench_patch.update_patch_records_from_mod(master_file)
+    for mod_file in merged_plugins:
+        bench_patch.mergeModFile(mod_file, None, False)
+
+def _tweak(bench_patch):
+    """Change every MISC and CELL record, then trim the patch like
+    PatchFile.buildPatch does."""
+    keep = bench_patch.getKeeper()
+    num_tweaked = 0
+    if b'MISC' in bench_patch.tops:
+        for misc_fid, misc_rec in bench_patch.tops[
+                b'MISC'].iter_present_records():
+            if hasattr(misc_rec, 'value'):
+                misc_rec.value = (misc_rec.value or 0) + 1
+            num_tweaked += keep(misc_fid, misc_rec)
+    if b'CELL' in bench_patch.tops:
+        for cell_fid, cell_rec in bench_patch.tops[
+                b'CELL'].iter_present_records(b'CELL'):
+            cell_rec.eid = f'{cell_rec.eid}Tweaked'
+            num_tweaked += keep(cell_fid, cell_rec)
+    bench_patch.keepIds |= bench_patch.mergeIds
+    for block in bench_patch.tops.values():
+        block.keepRecords(bench_patch.keepIds)
+    return num_tweaked
+
+def _save(bench_patch, bench_infos):
+    used_masters = bench_patch.used_masters()
+    bench_patch.tes4.masters = [i.fn_key for i in bench_infos
+                                if i.fn_key in used_masters]
+    bench_patch.save()
+
+def _run_once(bench_infos, bench_sigs, patch_path):
+    """Run all the phases once - returns their timings and some counts."""
+    timings = {}
+    def _timed(phase, phase_func, *phase_args):
+        start = time.perf_counter()
+        phase_result = phase_func(*phase_args)
+        timings[phase] = time.perf_counter() - start
+        return phase_result
+    loaded_plugins = _timed('load', _load, bench_infos, bench_sigs)
+    bench_patch = _bench_patch_type()(BenchInfo(patch_path), bench_sigs)
+    _timed('merge', _merge, bench_patch, loaded_plugins)
+    num_tweaked = _timed('tweak', _tweak, bench_patch)
+    _timed('save', _save, bench_patch, bench_infos)
+    counts = {
+        'loaded_records': sum(len(list(b.iter_records())) for m in
+                              loaded_plugins for b in m.tops.values()),
+        'merged_records': len(bench_patch.mergeIds),
+        'tweaked_records': num_tweaked,
+        'patch_bytes': os.path.getsize(patch_path),
+    }
+    return timings, counts
+
+def _bench_game(args):
+    from bash.brec import RecordType
+    # Only generate cells and worldspaces if the game has them implemented
+    bench_sigs = [s for s in (b'MISC', b'CELL', b'WRLD', b'REFR') if getattr(
+        RecordType.sig_to_class.get(s), 'melSet', None) is not None]
+    if b'MISC' not in bench_sigs:
+        raise NotImplementedError(f'{args.game} has no MISC records '
+                                  f'implemented')
+    if not {b'CELL', b'WRLD', b'REFR'}.issubset(bench_sigs):
+        bench_sigs = [b'MISC']
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        gen_start = time.perf_counter()
+        bench_infos = _generate_load_order(temp_dir, args, bench_sigs)
+        gen_time = time.perf_counter() - gen_start
+        lo_bytes = sum(os.path.getsize(i.abs_path) for i in bench_infos)
+        _LOGGER.info(f'{args.game}: generated {len(bench_infos)} plugins '
+                     f'({lo_bytes:,} bytes) in {gen_time:.3f}s')
+        all_runs = []
+        for _i in range(args.repeat):
+            timings, counts = _run_once(bench_infos, bench_sigs,
+                                        temp_dir / 'Bashed Patch, 0.esp')
+            all_runs.append(timings)
+    phases = {p: {'best': min(r[p] for r in all_runs),
+                  'runs': [r[p] for r in all_runs]} for p in _PHASES}
+    for p, p_times in phases.items():
+        _LOGGER.info(f'  {p:<6} {p_times["best"]:.3f}s')
+    return {
+        'game': args.game,
+        'record_types': [s.decode('ascii') for s in bench_sigs],
+        'generated_plugins': len(bench_infos),
+        'generated_bytes': lo_bytes,
+        'generation_seconds': gen_time,
+        'phases': phases,
+        **counts,
+    }
+
+def _bench_all_games(args):
+    """Run the benchmark for each game in its own process, since the record
+    definitions of only one game can be loaded at a time."""
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for gm_name in supported_game_names():
+            gm_output = Path(temp_dir) / 'game.json'
+            gm_cmd = [sys.executable, __file__, '--quiet',
+                      '--logfile', Path(temp_dir) / 'game.log',
+                      '--game', gm_name, '--output', gm_output,
+                      '--repeat', args.repeat, '--plugins', args.plugins,
+                      '--records', args.records,
+                      '--override-every', args.override_every,
+                      '--compressed', args.compressed, '--cells', args.cells,
+                      '--worlds', args.worlds,
+                      '--exterior-cells', args.exterior_cells,
+                      '--refs', args.refs]
+            _LOGGER.info(f'Benchmarking {gm_name}...')
+            gm_proc = subprocess.run(list(map(str, gm_cmd)),
+                capture_output=True, text=True)
+            if gm_proc.returncode == 0:
+                results.extend(json.loads(gm_output.read_text('utf-8'))[
+                    'results'])
+            else:
+                gm_error = (gm_proc.stderr or gm_proc.stdout).strip()
+                _LOGGER.warning(f'{gm_name} failed:\n{gm_error}')
+                results.append({'game': gm_name, 'error': gm_error})
+    return results
+
+def main(args):
+    setup_log(_LOGGER, args)
+    if args.all_games:
+        results = _bench_all_games(args)
+    else:
+        init_game(args.game)
+        results = [_bench_game(args)]
+    bench_output = {
+        'benchmark': 'record_engine',
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'parameters': {k: (str(v) if isinstance(v, Path) else v) for k, v in
+                       vars(args).items() if k not in ('verbosity', 'logfile',
+                                                       'output')},
+        'results': results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(bench_output, indent=2), 'utf-8')
+    _LOGGER.info(f'Results written to {args.output}')
+
+if __name__ == '__main__':
+    run_script(main, __doc__, _LOGFILE, custom_setup=_setup_parser)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# GPL License and Copyright Notice ============================================
+#  This file is part of Wrye Bash.
+#
+#  Wrye Bash is free software: you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  Wrye Bash is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with Wrye Bash.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  Wrye Bash copyright (C) 2005-2009 Wrye, 2010-2024 Wrye Bash Team
+#  https://github.com/wrye-bash
+#
+# =============================================================================
+"""Provides utilities for the benchmark scripts: setting up Wrye Bash's record
+engine for a game without starting the GUI, stand-ins for the file infos it
+expects and timing."""
+
+from __future__ import annotations
+
+import contextlib
+import gettext
+import io
+import os
+import sys
+import time
+
+from .utils import MOPY_PATH
+
+DEFAULT_GAME = 'Skyrim Special Edition (Steam)'
+
+def setup_bench_game(argparser):
+    argparser.add_argument(
+        '-g',
+        '--game',
+        default=DEFAULT_GAME,
+        help=f'The unique display name of the game to benchmark '
+             f'[default: {DEFAULT_GAME}].',
+    )
+    argparser.add_argument(
+        '-r',
+        '--repeat',
+        type=int,
+        default=3,
+        help='How many times to run each benchmark - the best time is '
+             'reported [default: 3].',
+    )
+
+def _import_bush():
+    if str(MOPY_PATH) not in sys.path:
+        sys.path.insert(0, str(MOPY_PATH))
+    # bush needs _() to be available, so need to do it like this
+    gettext.NullTranslations().install()
+    # Don't spam the benchmark output with import warnings and the game
+    # detection results
+    with contextlib.redirect_stdout(io.StringIO()):
+        from bash import bush
+        # noinspection PyProtectedMember
+        bush._supportedGames()
+    return bush
+
+def supported_game_names():
+    """Return the unique display name of one edition of each game Wrye Bash
+    supports - editions of the same game share their record definitions."""
+    # noinspection PyProtectedMember
+    all_games = _import_bush()._allGames
+    seen_games = {}
+    for gm_name, gm_class in sorted(all_games.items()):
+        seen_games.setdefault(gm_class.fsName, gm_name)
+    return list(seen_games.values())
+
+def init_game(gm_unique_display_name):
+    """Import Wrye Bash and initialize the specified game, much like the
+    tests do - returns the bush module."""
+    bush = _import_bush()
+    from bash import bolt
+    # noinspection PyProtectedMember
+    bush.game = bush._allGames[gm_unique_display_name]('')
+    with contextlib.redirect_stdout(io.StringIO()):
+        bush.game.init()
+    # Normally set from the language on boot - if unset, every string read
+    # from the plugins goes through chardet
+    bolt.pluginEncoding = 'cp1252'
+    return bush
+
+class BenchInfo:
+    """Stands in for the ModInfo of a plugin on disk."""
+    def __init__(self, plugin_path, masters=()):
+        from bash.bolt import FName, GPath
+        self.abs_path = GPath(os.fspath(plugin_path))
+        self.fn_key = FName(os.path.basename(plugin_path))
+        self.masterNames = tuple(map(FName, masters))
+        self.ftime = None
+
+    def getStringsPaths(self, lang):
+        return []
+
+    def __repr__(self):
+        return f'BenchInfo({self.fn_key})'
+
+def best_time(bench_func, repeat):
+    """Run bench_func repeat times, returning the fastest time in seconds
+    along with the result of the last run."""
+    best = float('inf')
+    result = None
+    for _i in range(repeat):
+        start = time.perf_counter()
+        result = bench_func()
+        best = min(best, time.perf_counter() - start)
+    return best, result